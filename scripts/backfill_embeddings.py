@@ -0,0 +1,73 @@
+"""Backfill keyword embeddings that were never stored.
+
+Finds keywords with a NULL ``embedding`` from runs that used a Hugging Face
+embedding model, embeds them with that run's model (through the embedding
+cache, so already-known keywords are not re-encoded) and writes the vectors
+with binary COPY, one batch per transaction. Models whose vectors do not fit
+``EMBEDDING_DIM`` are skipped.
+
+Usage:
+    PYTHONPATH=src python scripts/backfill_embeddings.py [--batch-size N] [--website-id ID]
+"""
+
+import argparse
+
+import numpy as np
+
+from db.manager import get_db_manager
+from db.models import EMBEDDING_DIM, AnalysisRun, Keyword
+from db.vectors import write_vectors
+from seo_agent.tools.hf.clustering import Embedder
+from seo_agent.tools.hf.embedding_cache import close_embedding_cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--website-id", type=int, default=None)
+    args = parser.parse_args()
+
+    db_manager = get_db_manager()
+    with db_manager.session_scope() as session:
+        query = session.query(AnalysisRun.embedding_model).filter(AnalysisRun.embedding_provider == "hf")
+        if args.website_id is not None:
+            query = query.filter(AnalysisRun.website_id == args.website_id)
+        models = sorted({model for (model,) in query.distinct() if model})
+
+    total = 0
+    for model_name in models:
+        embedder = Embedder(model_name=model_name)
+        if embedder.dimension != EMBEDDING_DIM:
+            print(f"{model_name}: skipped, {embedder.dimension}-dimensional embeddings do not fit EMBEDDING_DIM")
+            continue
+        last_id = 0
+        while True:
+            with db_manager.session_scope() as session:
+                query = (
+                    session.query(Keyword.id, Keyword.keyword)
+                    .join(AnalysisRun, Keyword.analysis_run_id == AnalysisRun.id)
+                    .filter(
+                        Keyword.embedding.is_(None),
+                        Keyword.id > last_id,
+                        AnalysisRun.embedding_provider == "hf",
+                        AnalysisRun.embedding_model == model_name,
+                    )
+                )
+                if args.website_id is not None:
+                    query = query.filter(AnalysisRun.website_id == args.website_id)
+                rows = query.order_by(Keyword.id.asc()).limit(args.batch_size).all()
+                if not rows:
+                    break
+                ids = [row_id for row_id, _ in rows]
+                vectors = np.array(embedder.embed([keyword for _, keyword in rows]), dtype=np.float32)
+                written = write_vectors(session, "keywords", ids, vectors)
+                last_id = ids[-1]
+            total += written
+            print(f"{model_name}: wrote {written} embeddings (up to keyword id {last_id})")
+
+    close_embedding_cache()
+    print(f"Backfilled {total} keyword embeddings")
+
+
+if __name__ == "__main__":
+    main()
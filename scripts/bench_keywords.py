@@ -0,0 +1,73 @@
+"""Benchmark sharded keyword extraction across worker counts.
+
+Builds a synthetic crawl (Zipf-distributed words, so n-gram statistics look
+like real pages), extracts keywords serially and with 2, 4, ... counting
+workers, and checks that every run returns exactly the serial result.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_keywords.py [--docs N] [--words N] [--max-workers N]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from seo_agent.models import ParsedDocument
+from seo_agent.tools.hf.keyword_pool import KeywordPool
+from seo_agent.tools.hf.keywords import KeywordExtractor
+
+
+def synthetic_documents(n_docs: int, words_per_doc: int, seed: int = 0) -> list[ParsedDocument]:
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    return [
+        ParsedDocument(
+            url=f"https://example.com/page/{i}",
+            main_text=" ".join(rng.choices(vocabulary, weights=weights, k=words_per_doc)),
+        )
+        for i in range(n_docs)
+    ]
+
+
+def time_extract(extractor: KeywordExtractor, documents: list[ParsedDocument], rounds: int) -> tuple[float, list]:
+    """Median wall time of one extraction in seconds, and its result."""
+    result = extractor.extract(documents)  # warm-up (also starts the workers)
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        extractor.extract(documents)
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples), [keyword.model_dump() for keyword in result]
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("--docs", type=int, default=3000)
+    arg_parser.add_argument("--words", type=int, default=600)
+    arg_parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument("--rounds", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    documents = synthetic_documents(args.docs, args.words)
+    print(f"{args.docs} documents x {args.words} words, {os.cpu_count()} CPUs")
+
+    serial_time, serial_result = time_extract(KeywordExtractor(), documents, args.rounds)
+    print(f"{'workers':>7} {'seconds':>9} {'speedup':>8} {'identical':>10}")
+    print(f"{'serial':>7} {serial_time:>9.2f} {1:>7.2f}x {'-':>10}")
+
+    workers = 2
+    while workers <= args.max_workers:
+        pool = KeywordPool(workers=workers, min_docs=0)
+        try:
+            elapsed, result = time_extract(KeywordExtractor(keyword_pool=pool), documents, args.rounds)
+        finally:
+            pool.close()
+        print(f"{workers:>7} {elapsed:>9.2f} {serial_time / elapsed:>7.2f}x {str(result == serial_result):>10}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
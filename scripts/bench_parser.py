@@ -0,0 +1,85 @@
+"""Benchmark per-page parse time of Parser against the previous two-pass parser.
+
+The previous implementation let trafilatura build its own tree and then
+re-parsed the whole document with BeautifulSoup for title, meta and headings.
+
+Usage:
+    PYTHONPATH=src python scripts/bench_parser.py [--rounds N] [files...]
+
+Without files, the HTML fixtures in tests/fixtures/html are used.
+"""
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+from urllib.parse import urljoin
+
+import trafilatura
+from bs4 import BeautifulSoup
+
+from seo_agent.models import FetchResult
+from seo_agent.tools.hf.fetcher import Parser
+
+FIXTURES_DIR = Path(__file__).resolve().parent.parent / "tests" / "fixtures" / "html"
+
+
+def two_pass_parse(fetch_result: FetchResult) -> dict:
+    """Reference copy of the trafilatura + BeautifulSoup parser."""
+    main_text = trafilatura.extract(fetch_result.content) or ""
+    soup = BeautifulSoup(fetch_result.content, "lxml")
+    meta_desc = soup.find("meta", attrs={"name": "description"})
+    return {
+        "title": soup.title.string if soup.title else None,
+        "description": meta_desc["content"] if meta_desc and meta_desc.get("content") else None,
+        "headings": [h.get_text(strip=True) for h in soup.find_all(["h1", "h2", "h3"])],
+        "links": [
+            urljoin(fetch_result.url, a["href"].strip())
+            for a in soup.find_all("a", href=True)
+            if a["href"].strip()
+        ],
+        "main_text": main_text,
+    }
+
+
+def time_per_page(parse, fetch_result: FetchResult, rounds: int) -> float:
+    """Median wall time of one parse in milliseconds."""
+    parse(fetch_result)  # warm-up
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        parse(fetch_result)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument("files", nargs="*", type=Path)
+    arg_parser.add_argument("--rounds", type=int, default=50)
+    args = arg_parser.parse_args()
+
+    files = args.files or sorted(FIXTURES_DIR.glob("*.html"))
+    parser = Parser()
+
+    print(f"{'page':<28} {'two-pass ms':>12} {'single-pass ms':>15} {'speedup':>8}")
+    totals = [0.0, 0.0]
+    for path in files:
+        fetch_result = FetchResult(
+            url=f"https://example.com/{path.name}",
+            status_code=200,
+            content=path.read_text(encoding="utf-8"),
+        )
+        before = time_per_page(two_pass_parse, fetch_result, args.rounds)
+        after = time_per_page(parser.parse, fetch_result, args.rounds)
+        totals[0] += before
+        totals[1] += after
+        print(f"{path.name:<28} {before:>12.2f} {after:>15.2f} {before / after:>7.2f}x")
+
+    if files:
+        print(f"{'mean per page':<28} {totals[0] / len(files):>12.2f} "
+              f"{totals[1] / len(files):>15.2f} {totals[0] / totals[1]:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
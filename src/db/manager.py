@@ -65,6 +65,8 @@ class DatabaseManager:
     
     def create_tables(self) -> None:
         """Create all tables in the database."""
+        with self.engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         Base.metadata.create_all(bind=self.engine)
     
     def drop_tables(self) -> None:
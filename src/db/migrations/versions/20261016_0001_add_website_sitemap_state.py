@@ -0,0 +1,25 @@
+"""Add last processed sitemap to websites
+
+Revision ID: b7e4c2a91d3f
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 00:01:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "b7e4c2a91d3f"
+down_revision = "a1b2c3d4e5f6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("websites", sa.Column("last_sitemap_url", sa.String(length=1000), nullable=True))
+    op.add_column("websites", sa.Column("last_sitemap_at", sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("websites", "last_sitemap_at")
+    op.drop_column("websites", "last_sitemap_url")
@@ -0,0 +1,76 @@
+"""Store keyword and centroid embeddings as pgvector columns with HNSW indexes
+
+Revision ID: c5d8e1f07a42
+Revises: b7e4c2a91d3f
+Create Date: 2026-10-16 00:02:00.000000
+
+"""
+import logging
+import os
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "c5d8e1f07a42"
+down_revision = "b7e4c2a91d3f"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+# Must match db.models.EMBEDDING_DIM at the time the migration runs
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+# table -> (vector column, HNSW index)
+VECTOR_COLUMNS = {
+    "keywords": ("embedding", "ix_keywords_embedding_hnsw"),
+    "keyword_clusters": ("centroid_embedding", "ix_keyword_clusters_centroid_hnsw"),
+}
+
+
+def _mismatched(column: str) -> str:
+    return f"{column} IS NOT NULL AND coalesce(array_length({column}, 1), 0) <> {EMBEDDING_DIM}"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    op.execute("CREATE EXTENSION IF NOT EXISTS vector")
+    for table, (column, index) in VECTOR_COLUMNS.items():
+        # Arrays of another dimension cannot be cast; keep them in <column>_legacy
+        n_mismatched = bind.execute(sa.text(f"SELECT count(*) FROM {table} WHERE {_mismatched(column)}")).scalar()
+        if n_mismatched:
+            logger.warning(
+                "Moving %s %s.%s values that are not %s-dimensional to %s.%s_legacy",
+                n_mismatched, table, column, EMBEDDING_DIM, table, column,
+            )
+            op.add_column(table, sa.Column(f"{column}_legacy", postgresql.ARRAY(sa.Float()), nullable=True))
+            op.execute(
+                f"UPDATE {table} SET {column}_legacy = {column}, {column} = NULL WHERE {_mismatched(column)}"
+            )
+        # Existing double precision[] values are converted in place
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE vector({EMBEDDING_DIM}) "
+            f"USING {column}::vector({EMBEDDING_DIM})"
+        )
+        op.execute(
+            f"CREATE INDEX {index} ON {table} USING hnsw ({column} vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, (column, index) in VECTOR_COLUMNS.items():
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE double precision[] "
+            f"USING {column}::real[]::double precision[]"
+        )
+        if any(col["name"] == f"{column}_legacy" for col in inspector.get_columns(table)):
+            op.execute(
+                f"UPDATE {table} SET {column} = {column}_legacy WHERE {column}_legacy IS NOT NULL"
+            )
+            op.drop_column(table, f"{column}_legacy")
+    # Do NOT drop the vector extension — it is installed by the docker init scripts.
@@ -1,5 +1,6 @@
 """Database models for SEO MCP Agent."""
 
+import os
 from datetime import datetime
 from typing import Optional, List
 from sqlalchemy import (
@@ -17,9 +18,51 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.types import UserDefinedType
 import enum
 
 
+# Dimension of stored keyword and centroid embeddings (all-MiniLM-L6-v2 by default)
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
+
+
+class Vector(UserDefinedType):
+    """pgvector ``vector(dim)`` column holding a list of floats."""
+    
+    cache_ok = True
+    
+    def __init__(self, dim: int):
+        self.dim = dim
+    
+    def get_col_spec(self, **kw) -> str:
+        return f"VECTOR({self.dim})"
+    
+    def bind_processor(self, dialect):
+        def process(value):
+            if value is None:
+                return None
+            return "[" + ",".join(repr(float(x)) for x in value) + "]"
+        return process
+    
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            if value is None:
+                return None
+            return [float(x) for x in value.strip("[]").split(",")] if value != "[]" else []
+        return process
+
+
+def _hnsw_index(name: str, column: str) -> Index:
+    """HNSW index for cosine-distance search over a vector column."""
+    return Index(
+        name,
+        column,
+        postgresql_using="hnsw",
+        postgresql_with={"m": 16, "ef_construction": 64},
+        postgresql_ops={column: "vector_cosine_ops"},
+    )
+
+
 class Base(DeclarativeBase):
     """Base class for all models."""
     pass
@@ -76,6 +119,10 @@ class Website(Base):
     country: Mapped[Optional[str]] = mapped_column(String(10))
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     
+    # Sitemap ingestion state
+    last_sitemap_url: Mapped[Optional[str]] = mapped_column(String(1000))
+    last_sitemap_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -159,7 +206,7 @@ class Keyword(Base):
     frequency: Mapped[int] = mapped_column(Integer, default=1)
     
     # Embedding (for vector search)
-    embedding: Mapped[Optional[List[float]]] = mapped_column(ARRAY(Float))
+    embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(EMBEDDING_DIM))
     
     # Source URLs
     source_urls: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String))
@@ -174,6 +221,7 @@ class Keyword(Base):
     __table_args__ = (
         Index('ix_keywords_analysis_intent', 'analysis_run_id', 'intent'),
         Index('ix_keywords_analysis_tfidf', 'analysis_run_id', 'tf_idf_score'),
+        _hnsw_index('ix_keywords_embedding_hnsw', 'embedding'),
     )
     
     def __repr__(self) -> str:
@@ -204,7 +252,7 @@ class KeywordCluster(Base):
     intent_distribution: Mapped[Optional[dict]] = mapped_column(JSONB)
     
     # Centroid embedding
-    centroid_embedding: Mapped[Optional[List[float]]] = mapped_column(ARRAY(Float))
+    centroid_embedding: Mapped[Optional[List[float]]] = mapped_column(Vector(EMBEDDING_DIM))
     
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -215,6 +263,7 @@ class KeywordCluster(Base):
     
     __table_args__ = (
         Index('ix_clusters_analysis_label', 'analysis_run_id', 'cluster_label'),
+        _hnsw_index('ix_keyword_clusters_centroid_hnsw', 'centroid_embedding'),
     )
     
     def __repr__(self) -> str:
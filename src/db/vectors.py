@@ -0,0 +1,321 @@
+"""Bulk writes of pgvector columns through binary COPY, and keyword similarity search."""
+
+import io
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import Float, cast, func, literal, text
+from sqlalchemy.orm import Session
+
+from .models import EMBEDDING_DIM, AnalysisRun, IntentType, Keyword, KeywordCluster, Vector
+
+logger = logging.getLogger(__name__)
+
+# PGCOPY signature, flags and header extension length
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + b"\x00\x00\x00\x00" + b"\x00\x00\x00\x00"
+_COPY_TRAILER = b"\xff\xff"
+
+# Candidate list size of an HNSW scan; raised to k when k is larger
+KEYWORD_SEARCH_EF = int(os.getenv("KEYWORD_SEARCH_EF", "100"))
+# Websites whose keyword matrices are kept in memory for exact search
+KEYWORD_SEARCH_CACHE_SITES = int(os.getenv("KEYWORD_SEARCH_CACHE_SITES", "4"))
+
+# Columns that may be bulk-written: table -> vector column
+VECTOR_COLUMNS = {
+    "keywords": "embedding",
+    "keyword_clusters": "centroid_embedding",
+}
+
+
+def encode_copy_binary(ids: Sequence[int], vectors: np.ndarray) -> bytes:
+    """Binary COPY stream of ``(id integer, embedding vector)`` rows.
+
+    Each tuple is the field count, then every field as a length-prefixed
+    big-endian value; a vector is its dimension, a reserved zero and
+    float4 values (pgvector's ``vector_recv`` layout).
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    n_rows, dim = vectors.shape
+    tuples = np.empty(n_rows, dtype=np.dtype([
+        ("n_fields", ">i2"),
+        ("id_len", ">i4"),
+        ("id", ">i4"),
+        ("vector_len", ">i4"),
+        ("dim", ">i2"),
+        ("unused", ">i2"),
+        ("values", ">f4", (dim,)),
+    ]))
+    tuples["n_fields"] = 2
+    tuples["id_len"] = 4
+    tuples["id"] = ids
+    tuples["vector_len"] = 4 + 4 * dim
+    tuples["dim"] = dim
+    tuples["unused"] = 0
+    tuples["values"] = vectors
+    return _COPY_HEADER + tuples.tobytes() + _COPY_TRAILER
+
+
+def write_vectors(session: Session, table: str, ids: Sequence[int], vectors: np.ndarray) -> int:
+    """Set the vector column of ``table`` for rows ``ids`` in one binary COPY.
+
+    Rows are copied into a temporary table and applied with a single
+    ``UPDATE ... FROM``, inside the session's transaction.
+
+    Returns:
+        Number of rows written.
+
+    Raises:
+        ValueError: If the vectors do not have ``EMBEDDING_DIM`` dimensions.
+    """
+    column = VECTOR_COLUMNS[table]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if not len(ids):
+        return 0
+    if vectors.ndim != 2 or vectors.shape[1] != EMBEDDING_DIM:
+        raise ValueError(
+            f"Cannot store {table}.{column}: vectors have dimension {vectors.shape[-1]}, "
+            f"column has {EMBEDDING_DIM}"
+        )
+
+    connection = session.connection().connection.dbapi_connection
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS _vector_copy (id integer, embedding vector({EMBEDDING_DIM})) "
+            "ON COMMIT DELETE ROWS"
+        )
+        cursor.execute("TRUNCATE _vector_copy")
+        cursor.copy_expert(
+            "COPY _vector_copy (id, embedding) FROM STDIN WITH (FORMAT BINARY)",
+            io.BytesIO(encode_copy_binary(ids, vectors)),
+        )
+        cursor.execute(
+            f"UPDATE {table} SET {column} = _vector_copy.embedding "
+            f"FROM _vector_copy WHERE {table}.id = _vector_copy.id"
+        )
+        return cursor.rowcount
+
+
+def has_index(session: Session, name: str) -> bool:
+    """Whether an index called ``name`` exists in the current schema."""
+    return session.execute(
+        text("SELECT 1 FROM pg_indexes WHERE schemaname = current_schema() AND indexname = :name"),
+        {"name": name},
+    ).first() is not None
+
+
+def exact_top_k(matrix: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Rows of unit-length ``matrix`` most cosine-similar to ``query``, best first.
+
+    Returns:
+        Row indices and their similarities.
+    """
+    if not len(matrix) or k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    norm = np.linalg.norm(query)
+    scores = matrix @ (query / norm if norm else query)
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top, scores[top]
+
+
+@dataclass
+class KeywordMatch:
+    keyword_id: int
+    keyword: str
+    intent: IntentType
+    analysis_run_id: int
+    cluster_id: Optional[int]
+    similarity: float
+
+
+@dataclass
+class _SiteMatrix:
+    """Every stored keyword vector of one website, normalized, for exact search."""
+
+    signature: tuple
+    matches: List[KeywordMatch]
+    run_ids: np.ndarray
+    intents: np.ndarray
+    matrix: np.ndarray
+
+
+class KeywordSearch:
+    """Top-k keywords of a website by cosine similarity to a query vector.
+
+    With the HNSW index in place the search runs in Postgres (with an
+    iterative scan where pgvector supports it, so intent and run filters
+    still return ``k`` rows). Without the index, the website's vectors are
+    loaded once into a NumPy matrix and searched exactly; the matrix is
+    reloaded when the website's stored keywords or clusters change.
+    """
+
+    index_name = "ix_keywords_embedding_hnsw"
+
+    def __init__(self, ef_search: int = KEYWORD_SEARCH_EF, max_sites: int = KEYWORD_SEARCH_CACHE_SITES):
+        self.ef_search = ef_search
+        self.max_sites = max_sites
+        # (website id, embedding model) -> matrix
+        self._sites: "OrderedDict[Tuple[int, str], _SiteMatrix]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def search(
+        self,
+        session: Session,
+        website_id: int,
+        model_name: str,
+        query: Sequence[float],
+        k: int = 10,
+        intent: Optional[IntentType] = None,
+        run_id: Optional[int] = None,
+    ) -> Tuple[List[KeywordMatch], bool]:
+        """Nearest stored keywords to ``query``.
+
+        Only keywords of runs embedded with ``model_name``, the model that
+        produced ``query``, are compared.
+
+        Returns:
+            Matches, best first, and whether they came from the exact search.
+        """
+        query = np.asarray(query, dtype=np.float32)
+        if query.shape != (EMBEDDING_DIM,):
+            raise ValueError(f"Query vector has dimension {query.shape[-1]}, stored vectors have {EMBEDDING_DIM}")
+        if has_index(session, self.index_name):
+            return self._search_index(session, website_id, model_name, query, k, intent, run_id), False
+        return self._search_exact(session, website_id, model_name, query, k, intent, run_id), True
+
+    def _search_index(self, session, website_id, model_name, query, k, intent, run_id) -> List[KeywordMatch]:
+        session.execute(text(f"SET LOCAL hnsw.ef_search = {max(self.ef_search, k)}"))
+        try:
+            # pgvector >= 0.8 keeps scanning until filtered rows fill the limit
+            with session.begin_nested():
+                session.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+        except Exception:
+            logger.debug("hnsw.iterative_scan is not supported; filters are applied after the scan")
+
+        query_vector = cast(literal(query.tolist(), Vector(EMBEDDING_DIM)), Vector(EMBEDDING_DIM))
+        distance = Keyword.embedding.op("<=>", return_type=Float)(query_vector)
+        rows = (
+            self._filtered(session.query(
+                Keyword.id, Keyword.keyword, Keyword.intent, Keyword.analysis_run_id, Keyword.cluster_id,
+                distance.label("distance"),
+            ), website_id, model_name, intent, run_id)
+            .filter(Keyword.embedding.isnot(None))
+            .order_by(distance)
+            .limit(k)
+            .all()
+        )
+        matches = [
+            KeywordMatch(row.id, row.keyword, row.intent, row.analysis_run_id, row.cluster_id, 1.0 - row.distance)
+            for row in rows
+        ]
+        # relaxed_order may return rows slightly out of order
+        return sorted(matches, key=lambda match: -match.similarity)
+
+    def _search_exact(self, session, website_id, model_name, query, k, intent, run_id) -> List[KeywordMatch]:
+        site = self._site_matrix(session, website_id, model_name)
+        mask = np.ones(len(site.matches), dtype=bool)
+        if intent is not None:
+            mask &= site.intents == intent.name
+        if run_id is not None:
+            mask &= site.run_ids == run_id
+        rows = np.flatnonzero(mask)
+        top, scores = exact_top_k(site.matrix[rows], query, k)
+        return [
+            KeywordMatch(**{**site.matches[row].__dict__, "similarity": float(score)})
+            for row, score in zip(rows[top], scores)
+        ]
+
+    @staticmethod
+    def _filtered(
+        query,
+        website_id: int,
+        model_name: str,
+        intent: Optional[IntentType] = None,
+        run_id: Optional[int] = None,
+    ):
+        query = query.select_from(Keyword).join(AnalysisRun, Keyword.analysis_run_id == AnalysisRun.id).filter(
+            AnalysisRun.website_id == website_id,
+            AnalysisRun.embedding_model == model_name,
+        )
+        if intent is not None:
+            query = query.filter(Keyword.intent == intent)
+        if run_id is not None:
+            query = query.filter(Keyword.analysis_run_id == run_id)
+        return query
+
+    def _signature(self, session: Session, website_id: int, model_name: str) -> tuple:
+        keywords = self._filtered(
+            session.query(func.count(Keyword.id), func.max(Keyword.id)), website_id, model_name
+        ).filter(Keyword.embedding.isnot(None)).one()
+        # Clusterize recreates clusters whenever it rewrites embeddings
+        last_cluster = (
+            session.query(func.max(KeywordCluster.id))
+            .join(AnalysisRun, KeywordCluster.analysis_run_id == AnalysisRun.id)
+            .filter(AnalysisRun.website_id == website_id)
+            .scalar()
+        )
+        return (*keywords, last_cluster)
+
+    def _site_matrix(self, session: Session, website_id: int, model_name: str) -> _SiteMatrix:
+        key = (website_id, model_name)
+        signature = self._signature(session, website_id, model_name)
+        with self._lock:
+            site = self._sites.get(key)
+            if site is not None and site.signature == signature:
+                self._sites.move_to_end(key)
+                return site
+
+        rows = (
+            self._filtered(session.query(
+                Keyword.id, Keyword.keyword, Keyword.intent, Keyword.analysis_run_id, Keyword.cluster_id,
+                Keyword.embedding,
+            ), website_id, model_name)
+            .filter(Keyword.embedding.isnot(None))
+            .order_by(Keyword.id.asc())
+            .all()
+        )
+        matrix = np.array([row.embedding for row in rows], dtype=np.float32).reshape(len(rows), EMBEDDING_DIM)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        site = _SiteMatrix(
+            signature=signature,
+            matches=[
+                KeywordMatch(row.id, row.keyword, row.intent, row.analysis_run_id, row.cluster_id, 0.0)
+                for row in rows
+            ],
+            run_ids=np.array([row.analysis_run_id for row in rows], dtype=np.int64),
+            intents=np.array([row.intent.name for row in rows], dtype=object),
+            matrix=matrix / np.where(norms == 0, 1, norms),
+        )
+        logger.info(
+            "Loaded %s keyword vectors of website %s (%s) for exact search", len(rows), website_id, model_name
+        )
+        with self._lock:
+            self._sites[key] = site
+            while len(self._sites) > self.max_sites:
+                self._sites.popitem(last=False)
+        return site
+
+
+# Global keyword search instance
+_keyword_search: Optional[KeywordSearch] = None
+
+
+def get_keyword_search() -> KeywordSearch:
+    """
+    Get the process-wide keyword similarity search.
+
+    Returns:
+        Shared KeywordSearch instance.
+    """
+    global _keyword_search
+
+    if _keyword_search is None:
+        _keyword_search = KeywordSearch()
+
+    return _keyword_search
@@ -1,9 +1,22 @@
 """FastAPI application entrypoint."""
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 from seo_agent.api.routers import router
+from seo_agent.api.intent_phrases import start_intent_phrase_listener, stop_intent_phrase_listener
+from seo_agent.tools.hf.fetcher import get_http_client, close_http_client, close_browser_pool
+from seo_agent.tools.hf.boilerplate import close_boilerplate_store
+from seo_agent.tools.hf.embedding_cache import close_embedding_cache
+from seo_agent.tools.hf.fetch_cache import close_fetch_cache
+from seo_agent.tools.hf.idf_store import close_idf_store
+from seo_agent.tools.hf.inference import close_inference_executor
+from seo_agent.tools.hf.model_registry import EMBEDDING_PRELOAD_MODELS, get_model_registry
+from seo_agent.tools.hf.keyword_pool import close_keyword_pool
+from seo_agent.tools.hf.parse_cache import close_parse_cache
+from seo_agent.tools.hf.parse_pool import close_parse_pool
 
 # Configure logging
 logging.basicConfig(
@@ -11,10 +24,32 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown."""
+    get_http_client()
+    start_intent_phrase_listener()
+    await asyncio.to_thread(get_model_registry().preload, EMBEDDING_PRELOAD_MODELS)
+    yield
+    stop_intent_phrase_listener()
+    await close_http_client()
+    await close_browser_pool()
+    close_fetch_cache()
+    close_parse_pool()
+    close_keyword_pool()
+    close_parse_cache()
+    close_idf_store()
+    close_boilerplate_store()
+    close_embedding_cache()
+    close_inference_executor()
+
+
 app = FastAPI(
     title="SEO Agent API",
     description="Autonomous SEO analysis and recommendations",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.include_router(router)
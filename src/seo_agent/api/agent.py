@@ -1,16 +1,30 @@
 """SEO agent orchestrator."""
 
+import asyncio
 import logging
 from collections import Counter
 from datetime import datetime
-from typing import List
+from typing import AsyncIterator, Dict, List
+from urllib.parse import urlparse
+
+import numpy as np
 
 from seo_agent.models import (
-    InputSpec, ParsedDocument, KeywordCandidate, Cluster, Recommendation, RunReport
+    CacheStats, InputSpec, ParsedDocument, KeywordCandidate, Cluster, Recommendation, RunReport
 )
-from seo_agent.tools.hf.fetcher import Fetcher, PlayWrightFetcher, Parser
-from seo_agent.tools.hf.keywords import KeywordExtractor
+from seo_agent.tools.hf.fetcher import Fetcher, PlayWrightFetcher, Parser, HostLimiter
+from seo_agent.tools.hf.boilerplate import BOILERPLATE_ENABLED, BoilerplateFilter, get_boilerplate_store
+from seo_agent.tools.hf.crawler import SiteCrawler, site_key
+from seo_agent.tools.hf.dedup import DEDUP_ENABLED, KeywordDeduplicator
+from seo_agent.tools.hf.fetch_cache import FETCH_CACHE_ENABLED, CachedFetcher, get_fetch_cache
+from seo_agent.tools.hf.parse_cache import PARSE_CACHE_ENABLED, get_parse_cache
+from seo_agent.tools.hf.parse_pool import get_parse_pool
+from seo_agent.tools.hf.sitemap import SitemapReader
+from seo_agent.tools.hf.idf_store import IDF_STORE_ENABLED, get_idf_store
+from seo_agent.tools.hf.keyword_pool import get_keyword_pool
+from seo_agent.tools.hf.keywords import STREAMING_MIN_PAGES, DocumentQueue, KeywordExtractor
 from seo_agent.tools.hf.clustering import Embedder, SemanticClusterer
+from seo_agent.tools.hf.reranker import KeywordReranker
 from seo_agent.tools.openai.embedder import OpenAIEmbedder
 from seo_agent.tools.openai.recommender import OpenAIRecommender
 
@@ -21,13 +35,23 @@ class SeoAgent:
     """Orchestrates SEO analysis pipeline."""
     
     def __init__(self):
-        self.fetcher = None  # Will be initialized per-request
+        self.fetcher = Fetcher()  # Uses the shared pooled httpx client
+        if FETCH_CACHE_ENABLED:
+            self.fetcher = CachedFetcher(self.fetcher, get_fetch_cache())
         self.playwright_fetcher = PlayWrightFetcher()
         self.parser = Parser()
-        self.keyword_extractor = KeywordExtractor()
-        self.embedder = None  # Will be initialized per-request
+        self.keyword_extractor = KeywordExtractor(
+            idf_store=get_idf_store() if IDF_STORE_ENABLED else None,
+            keyword_pool=get_keyword_pool(),
+        )
+        self.embedder = None  # Loaded on first use, kept while the model stays the same
         self.clusterer = SemanticClusterer(n_clusters=5)
+        self.deduplicator = KeywordDeduplicator()
+        self.boilerplate_filter = (
+            BoilerplateFilter(store=get_boilerplate_store()) if BOILERPLATE_ENABLED else None
+        )
         self.openai_recommender = OpenAIRecommender()
+        self.limiter = HostLimiter()
     
     async def analyze(self, input_spec: InputSpec) -> RunReport:
         """Run full SEO analysis."""
@@ -36,7 +60,9 @@ class SeoAgent:
         
         started_at = datetime.now()
         errors: List[str] = []
-        documents: List[ParsedDocument] = []
+        page_timings: dict[str, dict[str, float]] = {}
+        sitemaps: List[str] = []
+        parse_cache_stats = CacheStats()
         
         # Initialize selected fetcher
         if input_spec.fetcher_type == "playwright":
@@ -44,27 +70,13 @@ class SeoAgent:
             fetcher = self.playwright_fetcher
         else:
             logger.info("Using httpx fetcher for standard HTML sites")
-            fetcher = Fetcher()
+            fetcher = self.fetcher
         
-        # Step 1: Fetch and parse URLs
-        for url in input_spec.urls[:input_spec.max_pages]:
-            try:
-                fetch_result = await fetcher.fetch(str(url))
-                if fetch_result.error:
-                    logger.error("Fetch failed for %s: %s", url, fetch_result.error)
-                    errors.append(f"Fetch error for {url}: {fetch_result.error}")
-                    continue
-                
-                parsed = self.parser.parse(fetch_result)
-                if parsed.error:
-                    logger.error("Parse failed for %s: %s", url, parsed.error)
-                    errors.append(f"Parse error for {url}: {parsed.error}")
-                    continue
-                
-                documents.append(parsed)
-            except Exception as e:
-                logger.error("Unhandled processing error for %s: %s", url, str(e), exc_info=True)
-                errors.append(f"Error processing {url}: {str(e)}")
+        # Step 1: Fetch and parse URLs (large crawls extract keywords on the way)
+        streamed = [] if self._streams_keywords(input_spec) else None
+        documents = await self._fetch_and_parse(
+            fetcher, input_spec, errors, page_timings, sitemaps, parse_cache_stats, stream_keywords=streamed
+        )
         
         documents_parsed = len(documents)
         logger.info(f"Fetched and parsed {documents_parsed} documents")
@@ -72,29 +84,17 @@ class SeoAgent:
             logger.debug(f"Document details: {[{'url': d.url, 'word_count': d.word_count, 'error': d.error} for d in documents]}")
         
         # Step 2: Extract keywords
-        keywords: List[KeywordCandidate] = []
-        if documents:
+        keywords: List[KeywordCandidate] = streamed or []
+        if documents and streamed is None:
             try:
-                keywords = self.keyword_extractor.extract(documents)
+                # Counting and reranking are CPU-bound; keep the event loop serving requests
+                keywords = await asyncio.to_thread(self._extract_keywords, documents, input_spec, errors)
                 logger.info(f"Extracted {len(keywords)} keywords")
             except Exception as e:
                 error_msg = f"Keyword extraction error: {str(e)}"
                 logger.error(error_msg, exc_info=True)
                 errors.append(error_msg)
         
-        # Step 2.1: Build intent summary
-        intent_summary: dict[str, int] = {}
-        if keywords:
-            def normalize_intent(intent_value: object) -> str:
-                if intent_value is None:
-                    return "informational"
-                value = getattr(intent_value, "value", intent_value)
-                return str(value)
-
-            intent_summary = dict(
-                Counter(normalize_intent(kw.intent) for kw in keywords[:20])
-            )
-
         # Step 3: Generate embeddings
         clusters: List[Cluster] = []
         if keywords:
@@ -115,10 +115,16 @@ class SeoAgent:
                 else:
                     # HuggingFace embedder
                     logger.info(f"Initializing HF embedder with model: {input_spec.hf_embedding_model}")
-                    self.embedder = Embedder(model_name=input_spec.hf_embedding_model)
-                    embeddings = self.embedder.embed_keywords(keywords)
+                    self.embedder = await asyncio.to_thread(self._hf_embedder, input_spec.hf_embedding_model)
+                    embeddings = await self.embedder.aembed_keywords(keywords)
                     logger.info(f"Generated {len(embeddings)} HF embeddings")
                 
+                if embeddings and DEDUP_ENABLED:
+                    keywords, rows = self.deduplicator.collapse_similar(
+                        keywords, np.array([e.embedding for e in embeddings])
+                    )
+                    embeddings = [embeddings[row] for row in rows]
+                
                 if embeddings:
                     logger.info(f"Clustering {len(embeddings)} embeddings")
                     clusters = self.clusterer.cluster(keywords, embeddings)
@@ -127,6 +133,19 @@ class SeoAgent:
                 error_msg = f"Clustering error: {str(e)}"
                 logger.error(error_msg, exc_info=True)
                 errors.append(error_msg)
+
+        # Step 3.1: Build intent summary of the reported (deduplicated) top keywords
+        intent_summary: dict[str, int] = {}
+        if keywords:
+            def normalize_intent(intent_value: object) -> str:
+                if intent_value is None:
+                    return "informational"
+                value = getattr(intent_value, "value", intent_value)
+                return str(value)
+
+            intent_summary = dict(
+                Counter(normalize_intent(kw.intent) for kw in keywords[:20])
+            )
         
         # Step 4: Generate recommendations
         logger.info("Generating recommendations")
@@ -158,6 +177,9 @@ class SeoAgent:
                 intent_summary=intent_summary,
                 started_at=started_at,
                 errors=errors,
+                page_timings=page_timings,
+                sitemaps=sitemaps,
+                parse_cache=parse_cache_stats,
             )
         except Exception as e:
             logger.error(f"Failed to create RunReport: {str(e)}", exc_info=True)
@@ -172,34 +194,22 @@ class SeoAgent:
         logger.info(f"Starting keyword collection for URLs: {input_spec.urls}")
 
         errors = []
-        documents = []
+        sitemaps: List[str] = []
 
         if input_spec.fetcher_type == "playwright":
             fetcher = self.playwright_fetcher
         else:
-            fetcher = Fetcher()
+            fetcher = self.fetcher
 
-        for url in input_spec.urls[:input_spec.max_pages]:
-            try:
-                fetch_result = await fetcher.fetch(str(url))
-                if fetch_result.error:
-                    logger.error("Fetch failed for %s: %s", url, fetch_result.error)
-                    errors.append(f"Fetch error for {url}: {fetch_result.error}")
-                    continue
-                parsed = self.parser.parse(fetch_result)
-                if parsed.error:
-                    logger.error("Parse failed for %s: %s", url, parsed.error)
-                    errors.append(f"Parse error for {url}: {parsed.error}")
-                    continue
-                documents.append(parsed)
-            except Exception as e:
-                logger.error("Collection error for %s: %s", url, str(e), exc_info=True)
-                errors.append(f"Error processing {url}: {str(e)}")
+        streamed = [] if self._streams_keywords(input_spec) else None
+        documents = await self._fetch_and_parse(
+            fetcher, input_spec, errors, sitemaps=sitemaps, stream_keywords=streamed
+        )
 
-        keywords: List[KeywordCandidate] = []
-        if documents:
+        keywords: List[KeywordCandidate] = streamed or []
+        if documents and streamed is None:
             try:
-                keywords = self.keyword_extractor.extract(documents)
+                keywords = await asyncio.to_thread(self._extract_keywords, documents, input_spec, errors)
                 logger.info(f"Collected {len(keywords)} keywords")
             except Exception as e:
                 logger.error("Keyword extraction error: %s", str(e), exc_info=True)
@@ -209,8 +219,200 @@ class SeoAgent:
             "documents_parsed": len(documents),
             "keywords": keywords,
             "errors": errors,
+            "sitemaps": sitemaps,
         }
 
+    async def _fetch_and_parse(
+        self,
+        fetcher,
+        input_spec: InputSpec,
+        errors: List[str],
+        page_timings: dict[str, dict[str, float]] | None = None,
+        sitemaps: List[str] | None = None,
+        parse_cache_stats: CacheStats | None = None,
+        stream_keywords: List[KeywordCandidate] | None = None,
+    ) -> List[ParsedDocument]:
+        """Crawl from the input URLs and parse pages in worker processes as they arrive.
+
+        Follows same-site links up to ``max_depth`` within the ``max_pages`` and
+        ``crawl_timeout`` budgets, skipping links the sites' robots.txt disallows.
+        With ``use_sitemap`` the seeds are streamed from the sites' sitemaps
+        instead, and the sitemaps read are appended to ``sitemaps``. Documents
+        are returned in BFS discovery order regardless of completion order.
+        Fetch and parse timings are recorded per URL into ``page_timings`` and
+        parse cache hits into ``parse_cache_stats`` if given.
+
+        With ``stream_keywords``, each page goes to streaming keyword
+        extraction in a worker thread as soon as it is parsed, and the
+        keywords are appended to that list. The returned documents then keep
+        neither text nor links, so memory does not grow with page content;
+        the recommendations only read their titles, descriptions, headings
+        and word counts.
+        """
+        readers: Dict[str, SitemapReader] = {}
+        if input_spec.use_sitemap or input_spec.max_depth:
+            readers = await self._robots_readers(input_spec)
+        crawler = SiteCrawler(
+            fetcher,
+            self.parser,
+            limiter=self.limiter,
+            max_depth=input_spec.max_depth,
+            max_pages=input_spec.max_pages,
+            timeout=input_spec.crawl_timeout,
+            parse_pool=get_parse_pool(),
+            parse_cache=get_parse_cache() if PARSE_CACHE_ENABLED else None,
+            robots={site_key(base_url): reader.robots for base_url, reader in readers.items()},
+        )
+        parsed_by_order: dict[int, ParsedDocument] = {}
+        if input_spec.use_sitemap:
+            seeds = self._sitemap_seeds(readers, sitemaps if sitemaps is not None else [])
+        else:
+            seeds = [str(url) for url in input_spec.urls]
+
+        pages = DocumentQueue()
+        extraction = None
+        if stream_keywords is not None:
+            extraction = asyncio.ensure_future(asyncio.to_thread(self._stream_keywords, pages, input_spec))
+        try:
+            async for order, parsed in crawler.crawl(seeds, errors, page_timings):
+                if extraction is not None:
+                    await pages.put(parsed)
+                    parsed = parsed.model_copy(update={"main_text": "", "links": []})
+                parsed_by_order[order] = parsed
+        finally:
+            if extraction is not None:
+                await pages.close()
+
+        if extraction is not None:
+            try:
+                stream_keywords.extend(await extraction)
+                logger.info("Streamed keywords of %s pages: %s keywords", len(parsed_by_order), len(stream_keywords))
+            except Exception as e:
+                logger.error("Keyword extraction error: %s", str(e), exc_info=True)
+                errors.append(f"Keyword extraction error: {str(e)}")
+
+        if parse_cache_stats is not None:
+            parse_cache_stats.hits += crawler.parse_cache_stats.hits
+            parse_cache_stats.misses += crawler.parse_cache_stats.misses
+            logger.info("Parse cache hit rate: %.0f%%", parse_cache_stats.hit_rate * 100)
+
+        return [parsed_by_order[i] for i in sorted(parsed_by_order)]
+
+    def _extract_keywords(
+        self,
+        documents: List[ParsedDocument],
+        input_spec: InputSpec,
+        errors: List[str],
+    ) -> List[KeywordCandidate]:
+        """TF-IDF keywords, reranked with the HF embedder when requested.
+
+        Template blocks repeated across a site's pages are removed from the
+        text first. Inflections of a phrase and stopword-cut n-grams are
+        collapsed into one keyword.
+        """
+        reranker = None
+        if input_spec.rerank_keywords:
+            try:
+                reranker = KeywordReranker(self._hf_embedder(input_spec.hf_embedding_model))
+            except Exception as e:
+                error_msg = f"Keyword reranking unavailable: {str(e)}"
+                logger.warning(error_msg)
+                errors.append(error_msg)
+        if self.boilerplate_filter is not None:
+            documents = self.boilerplate_filter.filter(documents)
+        keywords = self.keyword_extractor.extract(
+            documents,
+            site=self._corpus_site(documents),
+            language=input_spec.language,
+            reranker=reranker,
+        )
+        if DEDUP_ENABLED:
+            keywords = self.deduplicator.collapse_variants(keywords)
+        return keywords
+
+    def _streams_keywords(self, input_spec: InputSpec) -> bool:
+        """Whether keywords are extracted while the crawl runs.
+
+        Only crawls allowed ``STREAMING_MIN_PAGES`` pages stream, and only
+        without the stages that need every page at once or a per-site
+        corpus: the boilerplate filter, the IDF store and reranking.
+        """
+        if not STREAMING_MIN_PAGES or input_spec.max_pages < STREAMING_MIN_PAGES:
+            return False
+        if self.boilerplate_filter is not None or self.keyword_extractor.idf_store is not None:
+            logger.info("Boilerplate filter or IDF store enabled; extracting keywords after the crawl")
+            return False
+        if input_spec.rerank_keywords:
+            logger.info("Keyword reranking requested; extracting keywords after the crawl")
+            return False
+        return True
+
+    def _stream_keywords(self, pages: DocumentQueue, input_spec: InputSpec) -> List[KeywordCandidate]:
+        """Streaming keyword extraction over the pages of a crawl."""
+        try:
+            keywords = self.keyword_extractor.extract_stream(pages, language=input_spec.language)
+        except BaseException:
+            # Keep consuming so the crawl never blocks on a full queue
+            pages.drain()
+            raise
+        if DEDUP_ENABLED:
+            keywords = self.deduplicator.collapse_variants(keywords)
+        return keywords
+
+    def _hf_embedder(self, model_name: str) -> Embedder:
+        """The loaded HF embedder, reloaded only when the model changes."""
+        if self.embedder is None or self.embedder.model_name != model_name:
+            self.embedder = Embedder(model_name=model_name)
+        return self.embedder
+
+    @staticmethod
+    def _corpus_site(documents: List[ParsedDocument]) -> str | None:
+        """Site whose persistent IDF corpus the documents belong to.
+
+        Only single-site runs are counted into a corpus; mixed runs fall back
+        to per-run IDF.
+        """
+        sites = {site_key(doc.url) for doc in documents}
+        return sites.pop() if len(sites) == 1 else None
+
+    async def _robots_readers(self, input_spec: InputSpec) -> Dict[str, SitemapReader]:
+        """Read robots.txt of every input domain.
+
+        Readers are keyed by the site's base URL, with the scheme and host of
+        its first input URL. Each domain's ``Crawl-delay`` is applied to the
+        shared host limiter.
+        """
+        base_urls: Dict[str, str] = {}
+        for url in input_spec.urls:
+            parsed = urlparse(str(url))
+            base_urls.setdefault(parsed.netloc.lower(), f"{parsed.scheme}://{parsed.netloc}/")
+        readers = {base_url: SitemapReader() for base_url in base_urls.values()}
+        await asyncio.gather(*(reader.load_robots(base_url) for base_url, reader in readers.items()))
+        for domain, base_url in base_urls.items():
+            self.limiter.set_crawl_delay(domain, readers[base_url].crawl_delay)
+        return readers
+
+    async def _sitemap_seeds(self, readers: Dict[str, SitemapReader], sitemaps: List[str]) -> AsyncIterator[str]:
+        """Stream URLs from the sitemaps of every input domain.
+
+        robots.txt disallow rules filter the stream, and its ``Crawl-delay`` is
+        applied once to every host the sitemap entries point at.
+        """
+        delayed_hosts = {urlparse(base_url).netloc.lower() for base_url in readers}
+        for base_url, reader in readers.items():
+            try:
+                # The base URL keeps the input's scheme for the /sitemap.xml fallback
+                async for entry in reader.iter_urls(base_url):
+                    host = urlparse(entry.url).netloc.lower()
+                    if host not in delayed_hosts:
+                        self.limiter.set_crawl_delay(host, reader.crawl_delay)
+                        delayed_hosts.add(host)
+                    yield entry.url
+            finally:
+                # The crawl may stop early on max_pages; record what was read so far.
+                logger.info("Sitemaps read for %s: %s", base_url, reader.processed_sitemaps)
+                sitemaps.extend(reader.processed_sitemaps)
+
     async def _generate_recommendations(
         self,
         documents: List[ParsedDocument],
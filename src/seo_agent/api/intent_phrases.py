@@ -0,0 +1,236 @@
+"""In-process cache of custom intent phrases and their compiled extractors."""
+
+import logging
+import os
+import select
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from seo_agent.tools.hf.keywords import KeywordExtractor
+from seo_agent.tools.hf.settings import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+# Reload a scope after this many seconds even without an invalidation
+# (keeps multiple workers roughly coherent without NOTIFY); 0 disables it.
+INTENT_PHRASE_CACHE_TTL = env_int("INTENT_PHRASE_CACHE_TTL", 300)
+
+# Propagate invalidations across processes with Postgres LISTEN/NOTIFY
+INTENT_PHRASE_NOTIFY = env_bool("INTENT_PHRASE_NOTIFY", False)
+INTENT_PHRASE_CHANNEL = os.getenv("INTENT_PHRASE_CHANNEL", "intent_phrases")
+
+# NOTIFY payload for the global scope (website_id IS NULL)
+GLOBAL_SCOPE = "global"
+
+PhraseLoader = Callable[[Optional[int]], Dict[str, List[str]]]
+
+
+def load_scope_phrases(website_id: Optional[int]) -> Dict[str, List[str]]:
+    """Load active phrases of one scope: global (None) or a single website."""
+    from src.db.manager import get_db_manager
+    from src.db.models import IntentPhrase
+
+    db_manager = get_db_manager()
+    with db_manager.session_scope() as session:
+        query = session.query(IntentPhrase).filter(IntentPhrase.is_active.is_(True))
+        if website_id is None:
+            query = query.filter(IntentPhrase.website_id.is_(None))
+        else:
+            query = query.filter(IntentPhrase.website_id == website_id)
+
+        phrases: Dict[str, List[str]] = {}
+        for row in query.all():
+            intent_val = row.intent.value if hasattr(row.intent, "value") else str(row.intent)
+            phrases.setdefault(intent_val, []).append(row.phrase)
+        return phrases
+
+
+class IntentPhraseCache:
+    """Phrase sets per scope plus compiled extractors per website.
+
+    Each scope (global or one website) has a version counter that is bumped
+    by ``invalidate``. A website's extractor is rebuilt only when the global
+    or its own version changed, so hot paths such as collect and upload do
+    not query the database for phrases.
+    """
+
+    def __init__(self, loader: PhraseLoader = load_scope_phrases, ttl: int = INTENT_PHRASE_CACHE_TTL):
+        self._loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versions: Dict[Optional[int], int] = {}
+        self._scopes: Dict[Optional[int], tuple[float, Dict[str, List[str]]]] = {}
+        self._extractors: Dict[int, tuple[tuple[int, int], Optional[KeywordExtractor]]] = {}
+
+    def version(self, website_id: Optional[int]) -> int:
+        """Current version counter of a scope."""
+        with self._lock:
+            return self._versions.get(website_id, 0)
+
+    def invalidate(self, website_id: Optional[int]) -> None:
+        """Drop cached phrases of a scope; None invalidates the global scope."""
+        with self._lock:
+            self._versions[website_id] = self._versions.get(website_id, 0) + 1
+            self._scopes.pop(website_id, None)
+        logger.info("Intent phrases invalidated for %s", website_id if website_id is not None else GLOBAL_SCOPE)
+
+    def _scope(self, website_id: Optional[int]) -> tuple[int, Dict[str, List[str]]]:
+        """Phrases of one scope with the version they belong to."""
+        with self._lock:
+            version = self._versions.get(website_id, 0)
+            cached = self._scopes.get(website_id)
+            if cached is not None:
+                loaded_at, phrases = cached
+                if not self.ttl or time.monotonic() - loaded_at < self.ttl:
+                    return version, phrases
+                # Expired: reload as a new version so extractors are rebuilt
+                version = self._versions[website_id] = version + 1
+                del self._scopes[website_id]
+
+        phrases = self._loader(website_id)
+
+        with self._lock:
+            # Not stored if invalidated while loading; the next call reloads
+            if self._versions.get(website_id, 0) == version:
+                self._scopes[website_id] = (time.monotonic(), phrases)
+        return version, phrases
+
+    @staticmethod
+    def _merge(global_phrases: Dict[str, List[str]], site_phrases: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        merged: Dict[str, List[str]] = {intent: list(p) for intent, p in global_phrases.items()}
+        for intent, phrases in site_phrases.items():
+            merged.setdefault(intent, []).extend(phrases)
+        return merged
+
+    def extra_phrases(self, website_id: int) -> Dict[str, List[str]]:
+        """Active custom phrases for a website: global plus domain-specific."""
+        return self._merge(self._scope(None)[1], self._scope(website_id)[1])
+
+    def extractor(self, website_id: int) -> Optional[KeywordExtractor]:
+        """Compiled extractor for a website, or None if it has no custom phrases."""
+        global_version, global_phrases = self._scope(None)
+        site_version, site_phrases = self._scope(website_id)
+        versions = (global_version, site_version)
+
+        with self._lock:
+            cached = self._extractors.get(website_id)
+            if cached is not None and cached[0] == versions:
+                return cached[1]
+
+        extra_phrases = self._merge(global_phrases, site_phrases)
+        extractor = KeywordExtractor(extra_phrases=extra_phrases, website_id=website_id) if extra_phrases else None
+        with self._lock:
+            self._extractors[website_id] = (versions, extractor)
+        return extractor
+
+
+# Global intent phrase cache instance
+_intent_phrase_cache: Optional[IntentPhraseCache] = None
+
+
+def get_intent_phrase_cache() -> IntentPhraseCache:
+    """
+    Get the process-wide intent phrase cache.
+
+    Returns:
+        Shared IntentPhraseCache instance.
+    """
+    global _intent_phrase_cache
+
+    if _intent_phrase_cache is None:
+        _intent_phrase_cache = IntentPhraseCache()
+
+    return _intent_phrase_cache
+
+
+def notify_payload(website_id: Optional[int]) -> str:
+    return GLOBAL_SCOPE if website_id is None else str(website_id)
+
+
+def publish_invalidation(session, website_id: Optional[int]) -> None:
+    """Queue a NOTIFY for other workers; delivered when the session commits."""
+    if not INTENT_PHRASE_NOTIFY:
+        return
+    session.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": INTENT_PHRASE_CHANNEL, "payload": notify_payload(website_id)},
+    )
+
+
+class IntentPhraseListener:
+    """Background thread applying NOTIFY invalidations from other workers."""
+
+    def __init__(self, cache: IntentPhraseCache, channel: str = INTENT_PHRASE_CHANNEL, poll_interval: float = 5.0):
+        self.cache = cache
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="intent-phrase-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        from src.db.manager import get_db_manager
+
+        while not self._stop.is_set():
+            try:
+                raw = get_db_manager().engine.raw_connection()
+                try:
+                    self._listen(raw.driver_connection)
+                finally:
+                    raw.close()
+            except Exception as e:
+                logger.warning("Intent phrase listener error: %s", str(e))
+                # Notifications may have been missed while disconnected
+                self.cache.invalidate(None)
+                self._stop.wait(self.poll_interval)
+
+    def _listen(self, connection) -> None:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f'LISTEN "{self.channel}"')
+        logger.info("Listening for intent phrase changes on %s", self.channel)
+
+        while not self._stop.is_set():
+            if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                payload = connection.notifies.pop(0).payload
+                if payload == GLOBAL_SCOPE:
+                    self.cache.invalidate(None)
+                elif payload.isdigit():
+                    self.cache.invalidate(int(payload))
+
+
+_listener: Optional[IntentPhraseListener] = None
+
+
+def start_intent_phrase_listener() -> Optional[IntentPhraseListener]:
+    """Start the NOTIFY listener if ``INTENT_PHRASE_NOTIFY`` is enabled."""
+    global _listener
+
+    if INTENT_PHRASE_NOTIFY and _listener is None:
+        _listener = IntentPhraseListener(get_intent_phrase_cache())
+        _listener.start()
+    return _listener
+
+
+def stop_intent_phrase_listener() -> None:
+    """Stop the NOTIFY listener thread."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -5,7 +5,8 @@ import logging
 from datetime import datetime
 from urllib.parse import urlparse
 from typing import Optional
-from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File
+import numpy as np
+from fastapi import APIRouter, HTTPException, BackgroundTasks, UploadFile, File, Query
 from fastapi.templating import Jinja2Templates
 from starlette.requests import Request
 from pydantic import BaseModel, Field
@@ -17,8 +18,11 @@ from src.seo_agent.models import InputSpec, RunReport
 from seo_agent.models import KeywordCandidate
 from src.seo_agent.api.agent import SeoAgent
 from src.seo_agent.tools.hf.clustering import Embedder, SemanticClusterer
+from seo_agent.tools.hf.dedup import DEDUP_ENABLED
 from src.db.manager import get_db_manager
+from src.db.vectors import get_keyword_search, write_vectors
 from src.db.models import (
+    EMBEDDING_DIM,
     Website,
     AnalysisRun,
     AnalysisStatus,
@@ -28,7 +32,7 @@ from src.db.models import (
     IntentPhrase,
     IntentType,
 )
-from src.seo_agent.tools.hf.keywords import KeywordExtractor
+from seo_agent.api.intent_phrases import get_intent_phrase_cache, publish_invalidation
 
 logger = logging.getLogger(__name__)
 
@@ -125,21 +129,29 @@ def _get_domain_keywords_lower(session, website_id: int) -> set[str]:
     return {row.keyword.strip().lower() for row in rows if row.keyword}
 
 
-def _load_extra_phrases(session, website_id: int) -> dict[str, list[str]]:
-    """Load active custom intent phrases for a website (global + domain-specific)."""
-    rows = (
-        session.query(IntentPhrase)
-        .filter(
-            IntentPhrase.is_active.is_(True),
-            (IntentPhrase.website_id.is_(None)) | (IntentPhrase.website_id == website_id),
-        )
-        .all()
-    )
-    phrases: dict[str, list[str]] = {}
-    for row in rows:
-        intent_val = row.intent.value if hasattr(row.intent, "value") else str(row.intent)
-        phrases.setdefault(intent_val, []).append(row.phrase)
-    return phrases
+def _with_site_language(input_spec: InputSpec) -> InputSpec:
+    """Use the stored Website.language unless the request sets ``language`` explicitly."""
+    if "language" in input_spec.model_fields_set or not input_spec.urls:
+        return input_spec
+    domain = urlparse(str(input_spec.urls[0])).netloc.lower()
+    try:
+        db_manager = get_db_manager()
+        with db_manager.session_scope() as session:
+            language = session.query(Website.language).filter(Website.domain == domain).scalar()
+    except Exception as e:
+        logger.warning("Could not load language for %s: %s", domain, str(e))
+        return input_spec
+    if language and language != input_spec.language:
+        logger.info("Using stored language %s for %s", language, domain)
+        return input_spec.model_copy(update={"language": language})
+    return input_spec
+
+
+def _remember_sitemap(website: Website, sitemaps: list[str]) -> None:
+    """Store the last sitemap read while seeding a run."""
+    if sitemaps:
+        website.last_sitemap_url = sitemaps[-1]
+        website.last_sitemap_at = datetime.utcnow()
 
 
 def _serialize_clusters(session, analysis_run_id: int) -> list[dict]:
@@ -188,7 +200,19 @@ def _serialize_clusters(session, analysis_run_id: int) -> list[dict]:
     return items
 
 
+def _embedding_model(input_spec: InputSpec) -> str:
+    """Model of the run's embedding provider, stored together with the provider."""
+    if input_spec.embedding_provider == "openai":
+        return input_spec.openai_embedding_model
+    return input_spec.hf_embedding_model
+
+
 def _save_report_to_db(input_spec: InputSpec, report: RunReport) -> tuple[int, int]:
+    """Store the website and run summary of an analysis.
+
+    Keywords are not stored here, so semantic search only covers collected
+    or uploaded runs once they are clusterized or backfilled.
+    """
     urls = [str(url) for url in input_spec.urls]
     if not urls:
         raise ValueError("At least one URL is required")
@@ -211,12 +235,7 @@ def _save_report_to_db(input_spec: InputSpec, report: RunReport) -> tuple[int, i
             session.flush()
         else:
             website.updated_at = datetime.utcnow()
-
-        embedding_model = (
-            input_spec.openai_embedding_model
-            if input_spec.embedding_provider == "openai"
-            else input_spec.hf_embedding_model
-        )
+        _remember_sitemap(website, report.sitemaps)
 
         run = AnalysisRun(
             website_id=website.id,
@@ -225,7 +244,7 @@ def _save_report_to_db(input_spec: InputSpec, report: RunReport) -> tuple[int, i
             urls=urls,
             pages_analyzed=report.documents_parsed,
             embedding_provider=input_spec.embedding_provider,
-            embedding_model=embedding_model,
+            embedding_model=_embedding_model(input_spec),
             max_keywords=max(1, len(report.keywords_extracted)),
             num_clusters=max(1, len(report.clusters)),
             total_keywords=len(report.keywords_extracted),
@@ -320,13 +339,16 @@ async def create_intent_phrase(payload: IntentPhraseInput):
             )
             session.add(row)
             session.flush()
-            return {
+            publish_invalidation(session, row.website_id)
+            result = {
                 "id": row.id,
                 "website_id": row.website_id,
                 "intent": row.intent.value,
                 "phrase": row.phrase,
                 "is_active": row.is_active,
             }
+        get_intent_phrase_cache().invalidate(result["website_id"])
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -348,13 +370,16 @@ async def update_intent_phrase(phrase_id: int, payload: IntentPhraseUpdate):
             if payload.is_active is not None:
                 row.is_active = payload.is_active
             session.flush()
-            return {
+            publish_invalidation(session, row.website_id)
+            result = {
                 "id": row.id,
                 "website_id": row.website_id,
                 "intent": row.intent.value,
                 "phrase": row.phrase,
                 "is_active": row.is_active,
             }
+        get_intent_phrase_cache().invalidate(result["website_id"])
+        return result
     except HTTPException:
         raise
     except Exception as e:
@@ -371,7 +396,10 @@ async def delete_intent_phrase(phrase_id: int):
             row = session.query(IntentPhrase).filter(IntentPhrase.id == phrase_id).first()
             if row is None:
                 raise HTTPException(status_code=404, detail="Phrase not found")
+            website_id = row.website_id
             session.delete(row)
+            publish_invalidation(session, website_id)
+        get_intent_phrase_cache().invalidate(website_id)
     except HTTPException:
         raise
     except Exception as e:
@@ -385,6 +413,7 @@ async def analyze(input_spec: InputSpec, background_tasks: BackgroundTasks):
     logger.info(f"Received analyze request for URLs: {input_spec.urls}")
     try:
         logger.info("Starting agent analysis...")
+        input_spec = _with_site_language(input_spec)
         report = await agent.analyze(input_spec)
         logger.info(f"Analysis completed. Report ID: {report.run_id}, Status: {report.status}")
         
@@ -524,6 +553,76 @@ async def list_website_keywords(website_id: int):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/api/websites/{website_id}/keywords/similar")
+async def find_similar_keywords(
+    website_id: int,
+    q: str = Query(..., min_length=1, max_length=500),
+    k: int = Query(default=10, ge=1, le=200),
+    intent: Optional[str] = None,
+    run_id: Optional[int] = None,
+    model_name: Optional[str] = None,
+):
+    """Return the stored keywords of a website closest in meaning to ``q``.
+
+    The query is embedded with ``model_name``, defaulting to the model of
+    the latest run, and compared only with keywords of runs embedded with
+    that model: every such run of the website unless ``run_id`` is given.
+    Runs saved by ``/api/analyze`` store no keywords and are never matched.
+    """
+    try:
+        intent_filter = None
+        if intent:
+            intent_filter = next((item for item in IntentType if item.value == intent.strip().lower()), None)
+            if intent_filter is None:
+                raise HTTPException(status_code=400, detail=f"Unknown intent: {intent}")
+
+        db_manager = get_db_manager()
+        with db_manager.session_scope() as session:
+            website = session.query(Website).filter(Website.id == website_id).first()
+            if website is None:
+                raise HTTPException(status_code=404, detail="Website not found")
+
+            if model_name is None:
+                latest_run = _get_latest_run(session, website.id)
+                model_name = (
+                    latest_run.embedding_model
+                    if latest_run is not None and latest_run.embedding_provider == "hf" and latest_run.embedding_model
+                    else ClusterizeInput().model_name
+                )
+
+            embedder = await Embedder.aload(model_name=model_name)
+            query_vector = (await embedder.aembed([q]))[0]
+            try:
+                matches, exact = get_keyword_search().search(
+                    session, website.id, model_name, query_vector, k=k, intent=intent_filter, run_id=run_id
+                )
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+            return {
+                "website_id": website.id,
+                "query": q,
+                "model_name": model_name,
+                "exact": exact,
+                "items": [
+                    {
+                        "id": match.keyword_id,
+                        "keyword": match.keyword,
+                        "intent": match.intent.value if hasattr(match.intent, "value") else str(match.intent),
+                        "analysis_run_id": match.analysis_run_id,
+                        "cluster_id": match.cluster_id,
+                        "similarity": round(float(match.similarity), 4),
+                    }
+                    for match in matches
+                ],
+            }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed similar keyword search for website_id=%s: %s", website_id, str(e), exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/api/websites/{website_id}/keywords")
 async def add_website_keyword(website_id: int, payload: ManualKeywordInput):
     """Manually add keyword to latest run for selected website."""
@@ -623,8 +722,26 @@ async def clusterize_website_keywords(website_id: int, payload: ClusterizeInput)
                 for kw in keywords_db
             ]
 
-            embedder = Embedder(model_name=payload.model_name)
-            embeddings = embedder.embed_keywords(keyword_candidates)
+            # Variants are embedded and clustered once, via their canonical keyword
+            if DEDUP_ENABLED:
+                keyword_candidates = agent.deduplicator.collapse_variants(keyword_candidates)
+
+            embedder = await Embedder.aload(model_name=payload.model_name)
+            warnings: list[str] = []
+            # Only vectors that fit the pgvector columns are stored; clusters are saved either way
+            store_vectors = embedder.dimension == EMBEDDING_DIM
+            if not store_vectors:
+                warnings.append(
+                    f"Model {payload.model_name} produces {embedder.dimension}-dimensional embeddings, "
+                    f"stored embeddings have {EMBEDDING_DIM} (EMBEDDING_DIM); vectors were not stored"
+                )
+                logger.warning("Clusterize website_id=%s: %s", website_id, warnings[-1])
+            embeddings = await embedder.aembed_keywords(keyword_candidates)
+            if DEDUP_ENABLED and embeddings:
+                keyword_candidates, rows = agent.deduplicator.collapse_similar(
+                    keyword_candidates, np.array([e.embedding for e in embeddings])
+                )
+                embeddings = [embeddings[row] for row in rows]
 
             # Avoid silhouette-score failures when keywords count is too small
             # or requested clusters are >= number of keywords.
@@ -635,8 +752,13 @@ async def clusterize_website_keywords(website_id: int, payload: ClusterizeInput)
 
             clusterer = SemanticClusterer(n_clusters=cluster_target)
             clusters = clusterer.cluster(keyword_candidates, embeddings)
+            embedding_of = {kw.keyword: record.embedding for kw, record in zip(keyword_candidates, embeddings)}
 
-            session.query(Keyword).filter(Keyword.analysis_run_id == latest_run.id).update({Keyword.cluster_id: None})
+            reset = {Keyword.cluster_id: None}
+            if not store_vectors:
+                # Vectors of the previous model would be searched under the new one
+                reset[Keyword.embedding] = None
+            session.query(Keyword).filter(Keyword.analysis_run_id == latest_run.id).update(reset)
             session.query(KeywordCluster).filter(KeywordCluster.analysis_run_id == latest_run.id).delete()
             session.flush()
 
@@ -644,6 +766,8 @@ async def clusterize_website_keywords(website_id: int, payload: ClusterizeInput)
             for kw in keywords_db:
                 keyword_pool.setdefault(kw.keyword.lower(), []).append(kw)
 
+            centroid_rows, centroids = [], []
+            embedded_rows, keyword_vectors = [], []
             for cluster in clusters:
                 cluster_row = KeywordCluster(
                     analysis_run_id=latest_run.id,
@@ -653,19 +777,31 @@ async def clusterize_website_keywords(website_id: int, payload: ClusterizeInput)
                     avg_tfidf_score=cluster.avg_tfidf,
                     top_keywords=cluster.top_keywords,
                     intent_distribution=cluster.intent_distribution,
-                    centroid_embedding=cluster.centroid,
                 )
                 session.add(cluster_row)
                 session.flush()
+                centroid_rows.append(cluster_row.id)
+                centroids.append(cluster.centroid)
 
                 for item in cluster.keywords:
-                    pool = keyword_pool.get(item.keyword.lower(), [])
-                    if pool:
-                        kw_row = pool.pop(0)
-                        kw_row.cluster_id = cluster_row.id
+                    for text in [item.keyword, *item.variants]:
+                        pool = keyword_pool.get(text.lower(), [])
+                        if pool:
+                            kw_row = pool.pop(0)
+                            kw_row.cluster_id = cluster_row.id
+                            # Variants share the vector of the keyword they were clustered by
+                            if item.keyword in embedding_of:
+                                embedded_rows.append(kw_row.id)
+                                keyword_vectors.append(embedding_of[item.keyword])
+
+            session.flush()
+            if store_vectors:
+                write_vectors(session, "keyword_clusters", centroid_rows, np.array(centroids))
+                write_vectors(session, "keywords", embedded_rows, np.array(keyword_vectors))
 
             latest_run.total_clusters = len(clusters)
             latest_run.num_clusters = len(clusters)
+            latest_run.embedding_provider = "hf"
             latest_run.embedding_model = payload.model_name
             latest_run.completed_at = datetime.utcnow()
             session.flush()
@@ -674,6 +810,7 @@ async def clusterize_website_keywords(website_id: int, payload: ClusterizeInput)
                 "website_id": website.id,
                 "analysis_run_id": latest_run.id,
                 "clusters": _serialize_clusters(session, latest_run.id),
+                "warnings": warnings,
             }
     except HTTPException:
         raise
@@ -713,6 +850,7 @@ async def collect_keywords(input_spec: InputSpec):
     """Fetch URL and collect keywords only (no clustering or recommendations)."""
     logger.info(f"Received collect request for URLs: {input_spec.urls}")
     try:
+        input_spec = _with_site_language(input_spec)
         result = await agent.collect(input_spec)
         keywords = result["keywords"]
 
@@ -734,6 +872,7 @@ async def collect_keywords(input_spec: InputSpec):
                 session.flush()
             else:
                 website.updated_at = datetime.utcnow()
+            _remember_sitemap(website, result["sitemaps"])
 
             run = AnalysisRun(
                 website_id=website.id,
@@ -742,7 +881,7 @@ async def collect_keywords(input_spec: InputSpec):
                 urls=urls,
                 pages_analyzed=result["documents_parsed"],
                 embedding_provider=input_spec.embedding_provider,
-                embedding_model=input_spec.hf_embedding_model,
+                embedding_model=_embedding_model(input_spec),
                 max_keywords=max(1, len(keywords)) if keywords else 0,
                 num_clusters=0,
                 total_keywords=len(keywords),
@@ -757,20 +896,22 @@ async def collect_keywords(input_spec: InputSpec):
             existing_lower = _get_domain_keywords_lower(session, website.id)
 
             # Re-detect intent using custom phrases from DB (global + domain-specific).
-            extra_phrases = _load_extra_phrases(session, website.id)
-            intent_extractor = KeywordExtractor(extra_phrases=extra_phrases) if extra_phrases else None
+            intent_extractor = get_intent_phrase_cache().extractor(website.id)
+            detected_intents = (
+                intent_extractor.detect_intents([kw.keyword for kw in keywords]) if intent_extractor else None
+            )
 
             imported_count = 0
             skipped_count = 0
 
-            for kw in keywords:
+            for position, kw in enumerate(keywords):
                 keyword_norm = kw.keyword.strip().lower()
                 if not keyword_norm or keyword_norm in existing_lower:
                     skipped_count += 1
                     continue
 
-                if intent_extractor is not None:
-                    detected = intent_extractor._detect_intent(kw.keyword)
+                if detected_intents is not None:
+                    detected = detected_intents[position]
                     intent_val = detected.value if hasattr(detected, "value") else str(detected)
                 else:
                     intent_val = kw.intent.value if hasattr(kw.intent, "value") else str(kw.intent or "informational")
@@ -886,12 +1027,14 @@ async def upload_keywords_file(website_id: int, file: UploadFile = File(...)):
             latest_run.total_clusters = 0
             latest_run.num_clusters = 0
 
-            extra_phrases = _load_extra_phrases(session, website.id)
-            intent_extractor = KeywordExtractor(extra_phrases=extra_phrases) if extra_phrases else None
+            intent_extractor = get_intent_phrase_cache().extractor(website.id)
+            detected_intents = (
+                intent_extractor.detect_intents(keywords_to_import) if intent_extractor else None
+            )
 
-            for kw_text in keywords_to_import:
-                if intent_extractor is not None:
-                    detected = intent_extractor._detect_intent(kw_text)
+            for position, kw_text in enumerate(keywords_to_import):
+                if detected_intents is not None:
+                    detected = detected_intents[position]
                     intent_value = detected.value if hasattr(detected, "value") else str(detected)
                     detected_intent = _to_intent_type(intent_value)
                 else:
@@ -7,6 +7,15 @@ from typing import List
 
 from seo_agent.models import InputSpec
 from seo_agent.api.agent import SeoAgent
+from seo_agent.tools.hf.fetcher import close_http_client, close_browser_pool
+from seo_agent.tools.hf.boilerplate import close_boilerplate_store
+from seo_agent.tools.hf.embedding_cache import close_embedding_cache
+from seo_agent.tools.hf.fetch_cache import close_fetch_cache
+from seo_agent.tools.hf.idf_store import close_idf_store
+from seo_agent.tools.hf.inference import close_inference_executor
+from seo_agent.tools.hf.keyword_pool import close_keyword_pool
+from seo_agent.tools.hf.parse_cache import close_parse_cache
+from seo_agent.tools.hf.parse_pool import close_parse_pool
 
 
 @click.group()
@@ -20,12 +29,14 @@ def cli():
 @click.option("--output", "-o", type=click.Path(), help="Output file (JSON)")
 @click.option("--depth", "-d", type=int, default=0, help="Crawl depth")
 @click.option("--max-pages", "-m", type=int, default=50, help="Max pages to analyze")
+@click.option("--sitemap", is_flag=True, default=False, help="Seed pages from the site's sitemap.xml")
+@click.option("--rerank", is_flag=True, default=False, help="Rerank keywords by embedding similarity to their pages")
 @click.option("--use-openai", is_flag=True, default=False, help="Use OpenAI for recommendations")
 @click.option("--openai-model", type=str, default="gpt-4o-mini", help="OpenAI model name")
 @click.option("--hf-model", type=str, default="all-MiniLM-L6-v2", help="HuggingFace embedding model")
 @click.option("--embedding-provider", type=click.Choice(["hf", "openai"]), default="hf", help="Embedding provider")
 @click.option("--openai-embedding-model", type=str, default="text-embedding-3-small", help="OpenAI embedding model")
-def analyze(url: tuple, output: str, depth: int, max_pages: int, use_openai: bool, openai_model: str, hf_model: str, embedding_provider: str, openai_embedding_model: str):
+def analyze(url: tuple, output: str, depth: int, max_pages: int, sitemap: bool, rerank: bool, use_openai: bool, openai_model: str, hf_model: str, embedding_provider: str, openai_embedding_model: str):
     """Analyze URLs for SEO."""
     if not url:
         click.echo("Error: At least one URL required", err=True)
@@ -43,6 +54,8 @@ def analyze(url: tuple, output: str, depth: int, max_pages: int, use_openai: boo
         urls=list(url),
         max_depth=depth,
         max_pages=max_pages,
+        use_sitemap=sitemap,
+        rerank_keywords=rerank,
         use_openai=use_openai,
         openai_model=openai_model,
         hf_embedding_model=hf_model,
@@ -52,7 +65,23 @@ def analyze(url: tuple, output: str, depth: int, max_pages: int, use_openai: boo
     
     # Run analysis
     agent = SeoAgent()
-    report = asyncio.run(agent.analyze(input_spec))
+
+    async def run():
+        try:
+            return await agent.analyze(input_spec)
+        finally:
+            await close_http_client()
+            await close_browser_pool()
+            close_fetch_cache()
+            close_parse_pool()
+            close_keyword_pool()
+            close_parse_cache()
+            close_idf_store()
+            close_boilerplate_store()
+            close_embedding_cache()
+            close_inference_executor()
+
+    report = asyncio.run(run())
     
     # Display results
     click.echo("\n✅ Analysis complete!")
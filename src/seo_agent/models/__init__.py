@@ -4,7 +4,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional, List, Dict, Any
 
-from pydantic import BaseModel, Field, HttpUrl, ConfigDict
+from pydantic import BaseModel, Field, HttpUrl, ConfigDict, computed_field
 
 
 class IntentType(str, Enum):
@@ -24,6 +24,14 @@ class InputSpec(BaseModel):
     max_depth: int = Field(default=0, description="Crawl depth (0=single URL)")
     max_pages: int = Field(default=50, description="Max pages to crawl")
     crawl_timeout: int = Field(default=300, description="Crawl timeout in seconds")
+    use_sitemap: bool = Field(
+        default=False,
+        description="Seed pages from the site's sitemap.xml (respecting robots.txt)"
+    )
+    rerank_keywords: bool = Field(
+        default=False,
+        description="Rerank TF-IDF keywords by embedding similarity to their pages (HF model)"
+    )
     
     # Fetcher type
     fetcher_type: str = Field(
@@ -68,6 +76,14 @@ class InputSpec(BaseModel):
 
 
 # === FETCH & PARSE ===
+class SitemapEntry(BaseModel):
+    """URL listed in a sitemap."""
+    
+    url: str
+    lastmod: Optional[datetime] = None
+    sitemap: str = Field(..., description="Sitemap file the URL was listed in")
+
+
 class FetchResult(BaseModel):
     """Result of fetching a URL."""
     
@@ -76,6 +92,8 @@ class FetchResult(BaseModel):
     content: str = Field(..., description="Raw HTML content")
     headers: Dict[str, str] = Field(default_factory=dict)
     fetched_at: datetime = Field(default_factory=datetime.utcnow)
+    timings: Dict[str, float] = Field(default_factory=dict, description="Fetch stage timings (ms) and counters")
+    cache_status: Optional[str] = Field(default=None, description="Fetch cache outcome: hit, revalidated, miss")
     error: Optional[str] = None
 
 
@@ -86,8 +104,11 @@ class ParsedDocument(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     headings: List[str] = Field(default_factory=list, description="H1-H3 headings")
+    canonical: Optional[str] = Field(default=None, description="Absolute rel=canonical URL")
+    hreflang: Dict[str, str] = Field(default_factory=dict, description="hreflang code -> absolute alternate URL")
     main_text: str = Field(..., description="Extracted body text")
     word_count: int = 0
+    links: List[str] = Field(default_factory=list, description="Absolute outgoing link URLs")
     parsed_at: datetime = Field(default_factory=datetime.utcnow)
     error: Optional[str] = None
 
@@ -101,6 +122,7 @@ class KeywordCandidate(BaseModel):
     tf_idf_score: float = Field(..., description="TF-IDF score")
     intent: Optional[IntentType] = None
     source_urls: List[str] = Field(default_factory=list, description="Where found")
+    variants: List[str] = Field(default_factory=list, description="Near-duplicates collapsed into this keyword")
 
 
 class EmbeddingRecord(BaseModel):
@@ -145,6 +167,20 @@ class Recommendation(BaseModel):
 
 
 # === OUTPUT ===
+class CacheStats(BaseModel):
+    """Hit/miss counters of a cache over one run."""
+    
+    hits: int = 0
+    misses: int = 0
+    
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 class RunReport(BaseModel):
     """Final SEO analysis report."""
     
@@ -163,6 +199,11 @@ class RunReport(BaseModel):
     started_at: datetime
     completed_at: datetime = Field(default_factory=datetime.utcnow)
     errors: List[str] = Field(default_factory=list)
+    page_timings: Dict[str, Dict[str, float]] = Field(
+        default_factory=dict, description="Per-URL fetch/parse timings in milliseconds"
+    )
+    sitemaps: List[str] = Field(default_factory=list, description="Sitemaps used to seed the crawl")
+    parse_cache: CacheStats = Field(default_factory=CacheStats, description="Parsed-document cache hits and misses")
     
     @property
     def duration_seconds(self) -> float:
@@ -0,0 +1,159 @@
+"""Language-aware n-gram analyzers for keyword extraction."""
+
+import logging
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+from seo_agent.tools.hf.settings import env_int
+from seo_agent.tools.hf.stopwords import RUSSIAN_STOPWORDS
+
+logger = logging.getLogger(__name__)
+
+# Distinct word forms whose lemma is remembered
+LEMMA_CACHE_SIZE = env_int("LEMMA_CACHE_SIZE", 100_000)
+
+# Same tokens as sklearn's default token_pattern
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Content languages served by the Russian analyzer. Belarusian ("be") is not
+# included: pymorphy3's Russian dictionary would mis-lemmatize it, so it gets
+# the default analyzer.
+RUSSIAN_LANGUAGES = ("ru",)
+
+# Russian pages routinely mix in English words, so both lists apply
+RUSSIAN_ANALYZER_STOPWORDS: FrozenSet[str] = frozenset(RUSSIAN_STOPWORDS) | ENGLISH_STOP_WORDS
+
+
+class Lemmatizer:
+    """Russian lemmatizer backed by pymorphy3 with an LRU of word forms.
+
+    pymorphy3 is optional; without it words are returned unchanged.
+    """
+
+    def __init__(self, cache_size: int = LEMMA_CACHE_SIZE):
+        try:
+            import pymorphy3
+            self._morph = pymorphy3.MorphAnalyzer()
+        except ImportError:
+            logger.warning("pymorphy3 is not installed; Russian keywords will not be lemmatized")
+            self._morph = None
+        self.lemma: Callable[[str], str] = lru_cache(maxsize=cache_size)(self._lemma)
+
+    @property
+    def available(self) -> bool:
+        return self._morph is not None
+
+    def _lemma(self, word: str) -> str:
+        if self._morph is None or not _has_cyrillic(word):
+            return word
+        return self._morph.parse(word)[0].normal_form
+
+
+def _has_cyrillic(word: str) -> bool:
+    return any("а" <= char <= "я" or char == "ё" for char in word)
+
+
+# Global lemmatizer instance
+_lemmatizer: Optional[Lemmatizer] = None
+
+
+def get_lemmatizer() -> Lemmatizer:
+    """
+    Get the process-wide lemmatizer.
+
+    Returns:
+        Shared Lemmatizer instance.
+    """
+    global _lemmatizer
+
+    if _lemmatizer is None:
+        _lemmatizer = Lemmatizer()
+
+    return _lemmatizer
+
+
+def is_russian(language: Optional[str]) -> bool:
+    return (language or "").lower().split("-")[0] in RUSSIAN_LANGUAGES
+
+
+class RussianAnalyzer:
+    """Lowercase, tokenize, lemmatize, drop stopwords, then build n-grams.
+
+    Stopwords are removed before n-grams are formed, like sklearn's word
+    analyzer, and are checked on both the surface form and the lemma. The
+    analyzer holds no unpicklable state, so it can be sent to worker
+    processes.
+    """
+
+    def __init__(self, ngram_range: tuple = (1, 3)):
+        self.ngram_range = tuple(ngram_range)
+
+    def __call__(self, text: str) -> List[str]:
+        return self._ngrams([lemma for _, lemma in self._tokens(text)])
+
+    def surface_ngrams(self, text: str) -> List[Tuple[str, str]]:
+        """``(lemma n-gram, n-gram as written)`` pairs, in the order of ``__call__``."""
+        tokens = self._tokens(text)
+        return list(zip(self._ngrams([lemma for _, lemma in tokens]), self._ngrams([word for word, _ in tokens])))
+
+    def _tokens(self, text: str) -> List[Tuple[str, str]]:
+        lemma = get_lemmatizer().lemma
+        tokens = []
+        for word in TOKEN_PATTERN.findall(text.lower()):
+            if word in RUSSIAN_ANALYZER_STOPWORDS:
+                continue
+            base = lemma(word)
+            if base not in RUSSIAN_ANALYZER_STOPWORDS:
+                tokens.append((word, base))
+        return tokens
+
+    def _ngrams(self, tokens: List[str]) -> List[str]:
+        min_n, max_n = self.ngram_range
+        ngrams: List[str] = []
+        for n in range(min_n, min(max_n, len(tokens)) + 1):
+            ngrams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return ngrams
+
+
+def surface_forms(
+    texts: Iterable[str],
+    keys: Iterable[str],
+    language: Optional[str],
+    ngram_range: tuple,
+) -> Dict[str, str]:
+    """Most frequent written form of each n-gram in ``keys`` across ``texts``.
+
+    Russian n-grams are counted by lemma ("доставка груз") and shown as
+    written ("доставка грузов"); ties go to the form seen first. Other
+    languages are counted as written, so there is nothing to map.
+    """
+    if not is_russian(language):
+        return {}
+    wanted = set(keys)
+    analyzer = RussianAnalyzer(ngram_range)
+    forms: Dict[str, Counter] = {}
+    for text in texts:
+        for key, surface in analyzer.surface_ngrams(text):
+            if key in wanted:
+                forms.setdefault(key, Counter())[surface] += 1
+    return {key: counts.most_common(1)[0][0] for key, counts in forms.items()}
+
+
+def vectorizer_options(language: Optional[str], ngram_range: tuple) -> dict:
+    """Analyzer keyword arguments for sklearn text vectorizers."""
+    if is_russian(language):
+        return {"analyzer": RussianAnalyzer(ngram_range)}
+    return {"ngram_range": ngram_range, "stop_words": "english", "lowercase": True}
+
+
+def analyzer_scheme(language: Optional[str], ngram_range: tuple) -> str:
+    """Identity of the analyzer; term statistics are only comparable within one scheme."""
+    ngrams = f"ngram={ngram_range[0]}-{ngram_range[1]}"
+    if is_russian(language):
+        lemmas = "pymorphy3" if get_lemmatizer().available else "none"
+        return f"{ngrams};stop_words=ru+english;lemmas={lemmas}"
+    return f"{ngrams};stop_words=english;lowercase"
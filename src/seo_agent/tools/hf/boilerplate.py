@@ -0,0 +1,146 @@
+"""Site-level removal of template text repeated across pages."""
+
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from seo_agent.models import ParsedDocument
+from seo_agent.tools.hf.crawler import site_key
+from seo_agent.tools.hf.idf_store import IdfStore, content_hash, hash_terms
+from seo_agent.tools.hf.settings import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# Boilerplate filter settings
+BOILERPLATE_ENABLED = env_bool("BOILERPLATE_ENABLED", True)
+BOILERPLATE_MAX_SHARE = env_float("BOILERPLATE_MAX_SHARE", 0.5)
+BOILERPLATE_MIN_PAGES = env_int("BOILERPLATE_MIN_PAGES", 5)
+BOILERPLATE_STORE_DIR = os.getenv(
+    "BOILERPLATE_STORE_DIR", str(Path.home() / ".cache" / "seo-agent" / "boilerplate")
+)
+
+# Block normalization; counts from another scheme are discarded
+BLOCK_SCHEME = "blocks;lowercase;whitespace;digits=0"
+
+_WHITESPACE = re.compile(r"\s+")
+_DIGITS = re.compile(r"\d")
+
+
+def split_blocks(text: str) -> List[str]:
+    """Text blocks (paragraphs, menu lines, banners) of extracted page text."""
+    return [block for block in (line.strip() for line in text.split("\n")) if block]
+
+
+def normalize_block(block: str) -> str:
+    """Lowercase, single-spaced, with digits masked so dates and counters match."""
+    return _DIGITS.sub("0", _WHITESPACE.sub(" ", block.lower()))
+
+
+class BoilerplateFilter:
+    """Drops text blocks that occur on more than ``max_share`` of a site's pages.
+
+    Blocks of every page are hashed into the same space as the IDF store and
+    counted once per page. With a ``store`` the counts accumulate per site
+    across runs (unchanged pages are not recounted), so a later run, even of
+    a single page, filters known boilerplate immediately. Without one, only
+    the pages of the current run are counted. Sites with fewer than
+    ``min_pages`` counted pages are left alone.
+    """
+
+    def __init__(
+        self,
+        store: IdfStore | None = None,
+        max_share: float = BOILERPLATE_MAX_SHARE,
+        min_pages: int = BOILERPLATE_MIN_PAGES,
+    ):
+        self.store = store
+        self.max_share = max_share
+        self.min_pages = min_pages
+
+    def _hash_blocks(self, blocks: List[str]) -> np.ndarray:
+        n_features = self.store.n_features if self.store is not None else 2 ** 30
+        return hash_terms((normalize_block(block) for block in blocks), n_features)
+
+    def filter(self, documents: List[ParsedDocument]) -> List[ParsedDocument]:
+        """Documents with boilerplate blocks removed from ``main_text``, in input order."""
+        by_site: Dict[str, List[int]] = {}
+        for i, doc in enumerate(documents):
+            if doc.main_text:
+                by_site.setdefault(site_key(doc.url), []).append(i)
+
+        filtered = list(documents)
+        for site, rows in by_site.items():
+            for row, document in zip(rows, self._filter_site(site, [documents[row] for row in rows])):
+                filtered[row] = document
+        return filtered
+
+    def _filter_site(self, site: str, documents: List[ParsedDocument]) -> List[ParsedDocument]:
+        blocks = [split_blocks(doc.main_text) for doc in documents]
+        hashes = [self._hash_blocks(page_blocks) for page_blocks in blocks]
+        page_sets = [np.unique(page_hashes) for page_hashes in hashes]
+        run_hashes, run_counts = np.unique(np.concatenate(page_sets), return_counts=True)
+
+        if self.store is not None:
+            self.store.update(
+                site,
+                BLOCK_SCHEME,
+                ((doc.url, content_hash(doc.main_text), page_set) for doc, page_set in zip(documents, page_sets)),
+            )
+            n_pages, counts = self.store.document_frequency(site, run_hashes)
+        else:
+            n_pages, counts = len(documents), run_counts
+
+        if n_pages < self.min_pages:
+            return documents
+        boilerplate = run_hashes[counts > self.max_share * n_pages]
+        if not len(boilerplate):
+            return documents
+
+        result = []
+        removed = 0
+        for doc, page_blocks, page_hashes in zip(documents, blocks, hashes):
+            keep = ~np.isin(page_hashes, boilerplate)
+            if keep.all():
+                result.append(doc)
+                continue
+            removed += int((~keep).sum())
+            main_text = "\n".join(block for block, kept in zip(page_blocks, keep) if kept)
+            result.append(doc.model_copy(update={"main_text": main_text, "word_count": len(main_text.split())}))
+
+        logger.info(
+            f"🧽 Removed {removed} boilerplate blocks ({len(boilerplate)} distinct) "
+            f"from {site} across {len(documents)} pages"
+        )
+        return result
+
+
+# Global boilerplate block store instance
+_boilerplate_store: Optional[IdfStore] = None
+
+
+def get_boilerplate_store() -> IdfStore:
+    """
+    Get the process-wide store of per-site block counts.
+
+    Returns:
+        Shared IdfStore holding block hashes instead of n-grams.
+    """
+    global _boilerplate_store
+
+    if _boilerplate_store is None:
+        _boilerplate_store = IdfStore(BOILERPLATE_STORE_DIR)
+
+    return _boilerplate_store
+
+
+def close_boilerplate_store() -> None:
+    """Close the shared boilerplate block store."""
+    global _boilerplate_store
+
+    if _boilerplate_store is not None:
+        _boilerplate_store.close()
+        _boilerplate_store = None
@@ -1,15 +1,18 @@
 """Clustering and semantic analysis tool."""
 
+import asyncio
 import os
 from pathlib import Path
 from typing import List
 import numpy as np
 from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score
-from sentence_transformers import SentenceTransformer
 from dotenv import load_dotenv
 
 from seo_agent.models import KeywordCandidate, EmbeddingRecord, Cluster
+from seo_agent.tools.hf.embedding_cache import get_embedding_cache
+from seo_agent.tools.hf.inference import get_inference_executor
+from seo_agent.tools.hf.model_registry import get_model_registry, model_key
 
 
 # Load environment variables
@@ -20,32 +23,68 @@ load_dotenv(root_dir / ".env")
 class Embedder:
     """Generate embeddings for keywords."""
     
-    def __init__(self, model_name: str | None = None):
+    def __init__(self, model_name: str | None = None, device: str | None = None, precision: str | None = None):
         # Use provided model, env variable, or default
         if model_name is None:
             model_name = os.getenv("HF_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
         
         self.model_name = model_name
-        hf_token = os.getenv("HF_TOKEN")
+        # Cached vectors are kept apart per device and precision, like the loaded models
+        self.cache_namespace = "|".join(model_key(model_name, device, precision))
         
-        # Load model with optional token
-        self.model = SentenceTransformer(
-            model_name,
-            token=hf_token if hf_token else None
-        )
+        # Loaded once per process and shared with every other Embedder
+        self.model = get_model_registry().get(model_name, device=device, precision=precision)
+    
+    @classmethod
+    async def aload(cls, model_name: str | None = None, device: str | None = None, precision: str | None = None):
+        """Create an embedder without blocking the event loop while its model loads."""
+        return await asyncio.to_thread(cls, model_name, device, precision)
+    
+    @property
+    def dimension(self) -> int:
+        """Length of the vectors the model produces."""
+        return self.model.get_sentence_embedding_dimension()
     
     def embed(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts."""
-        return self.model.encode(texts, convert_to_numpy=True).tolist()
+        """Generate embeddings for texts, encoding only those not cached yet."""
+        cache = get_embedding_cache()
+        if cache is None:
+            return get_inference_executor().encode(self.model, texts).tolist()
+        
+        keys, vectors, missing = cache.lookup(self.cache_namespace, texts)
+        computed = get_inference_executor().encode(self.model, missing) if missing else None
+        return cache.complete(self.cache_namespace, keys, vectors, missing, computed).tolist()
+    
+    async def aembed(self, texts: List[str]) -> List[List[float]]:
+        """Like ``embed``, awaiting the inference thread instead of blocking the event loop."""
+        cache = get_embedding_cache()
+        if cache is None:
+            return (await get_inference_executor().aencode(self.model, texts)).tolist()
+        
+        # The disk tier reads SQLite and memmaps, and writes flush both
+        keys, vectors, missing = await asyncio.to_thread(cache.lookup, self.cache_namespace, texts)
+        computed = await get_inference_executor().aencode(self.model, missing) if missing else None
+        completed = await asyncio.to_thread(cache.complete, self.cache_namespace, keys, vectors, missing, computed)
+        return completed.tolist()
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Unit-length embeddings of texts as one matrix."""
+        return get_inference_executor().encode(self.model, texts, normalize=True)
     
     def embed_keywords(self, keywords: List[KeywordCandidate]) -> List[EmbeddingRecord]:
         """Generate embeddings for keyword candidates."""
         if not keywords:
             return []
-        
-        keyword_texts = [kw.keyword for kw in keywords]
-        embeddings = self.embed(keyword_texts)
-        
+        return self._records(keywords, self.embed([kw.keyword for kw in keywords]))
+    
+    async def aembed_keywords(self, keywords: List[KeywordCandidate]) -> List[EmbeddingRecord]:
+        """Generate embeddings for keyword candidates without blocking the event loop."""
+        if not keywords:
+            return []
+        return self._records(keywords, await self.aembed([kw.keyword for kw in keywords]))
+    
+    @staticmethod
+    def _records(keywords: List[KeywordCandidate], embeddings: List[List[float]]) -> List[EmbeddingRecord]:
         records = []
         for kw, emb in zip(keywords, embeddings):
             # Use first source URL or placeholder
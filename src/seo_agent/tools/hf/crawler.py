@@ -0,0 +1,295 @@
+"""Breadth-first site crawler built on top of the fetchers."""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+from urllib.robotparser import RobotFileParser
+
+from seo_agent.models import CacheStats, ParsedDocument
+from seo_agent.tools.hf.fetcher import ANTI_BOT_HEADERS, HostLimiter, Parser, aiter_urls, fetch_concurrently
+from seo_agent.tools.hf.parse_cache import ParseCache
+from seo_agent.tools.hf.parse_pool import ParsePool
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change page content
+TRACKING_PARAMS = {"gclid", "fbclid", "yclid", "_openstat", "ref", "from"}
+
+# Links to these files are never HTML pages
+NON_HTML_EXTENSIONS = (
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg", ".ico", ".bmp",
+    ".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx",
+    ".zip", ".rar", ".7z", ".gz", ".tar",
+    ".mp3", ".mp4", ".avi", ".mov", ".webm",
+    ".css", ".js", ".json", ".xml", ".txt",
+    ".woff", ".woff2", ".ttf", ".eot",
+)
+
+
+def normalize_url(url: str) -> Optional[str]:
+    """Normalize URL for frontier deduplication.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    query parameters, and sorts the remaining query. Returns None for
+    non-HTTP(S) URLs.
+    """
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+
+    scheme = parsed.scheme.lower()
+    if scheme not in ("http", "https") or not parsed.hostname:
+        return None
+
+    host = parsed.hostname.lower()
+    port = parsed.port if parsed.port not in (None, 80, 443) else None
+    netloc = f"{host}:{port}" if port else host
+
+    path = parsed.path or "/"
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ))
+
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+
+def site_key(url: str) -> str:
+    """Return host without ``www.`` so that www and bare domain count as one site."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_crawlable_link(
+    url: str,
+    robots: Optional[RobotFileParser] = None,
+    user_agent: str = ANTI_BOT_HEADERS["User-Agent"],
+) -> bool:
+    """Return True if URL may point to an HTML page that ``robots`` allows us to fetch."""
+    if urlparse(url).path.lower().endswith(NON_HTML_EXTENSIONS):
+        return False
+    return robots is None or robots.can_fetch(user_agent, url)
+
+
+class SiteCrawler:
+    """Breadth-first crawler bounded by depth, page count and wall-clock time.
+
+    Pages are fetched one depth level at a time through ``fetch_concurrently``;
+    same-site links found while parsing a level form the next level. With a
+    ``parse_pool`` pages are parsed in worker processes while the next pages
+    of the level are still being fetched. Pages whose content is found in
+    ``parse_cache`` are not parsed at all; ``parse_cache_stats`` counts hits
+    and misses. Links disallowed by the site's robots.txt parser in ``robots``
+    (keyed by ``site_key``) are not followed.
+    """
+
+    def __init__(
+        self,
+        fetcher,
+        parser: Parser,
+        limiter: Optional[HostLimiter] = None,
+        max_depth: int = 0,
+        max_pages: int = 50,
+        timeout: float = 300,
+        parse_pool: Optional[ParsePool] = None,
+        parse_cache: Optional[ParseCache] = None,
+        robots: Optional[Dict[str, RobotFileParser]] = None,
+    ):
+        self.fetcher = fetcher
+        self.parser = parser
+        self.parse_pool = parse_pool
+        self.parse_cache = parse_cache
+        self.parse_cache_stats = CacheStats()
+        self.limiter = limiter or HostLimiter()
+        self.max_depth = max(0, max_depth)
+        self.max_pages = max(0, max_pages)
+        self.timeout = timeout
+        self.robots = robots or {}
+
+    async def crawl(
+        self,
+        seeds: Iterable[str] | AsyncIterable[str],
+        errors: List[str],
+        page_timings: dict[str, dict[str, float]] | None = None,
+    ) -> AsyncIterator[tuple[int, ParsedDocument]]:
+        """Crawl from seed URLs and yield ``(order, document)`` as pages are parsed.
+
+        ``seeds`` may be an async iterable (e.g. a sitemap stream); it is consumed
+        lazily, so only the pages admitted within ``max_pages`` are ever pulled.
+        ``order`` is the BFS discovery position of the page, so callers can
+        restore a deterministic order. Per-URL failures are appended to
+        ``errors``; fetch and parse timings go to ``page_timings`` if given.
+        """
+        deadline = time.monotonic() + self.timeout
+        seen: set[str] = set()
+        allowed_sites: set[str] = set()
+        scheduled = 0
+
+        async def admit_seeds() -> AsyncIterator[str]:
+            nonlocal scheduled
+            async for url in aiter_urls(seeds):
+                if scheduled >= self.max_pages:
+                    break
+                normalized = normalize_url(str(url))
+                if not normalized or normalized in seen:
+                    continue
+                seen.add(normalized)
+                allowed_sites.add(site_key(normalized))
+                scheduled += 1
+                yield str(url)
+
+        async def admit_links(links: list[str]) -> AsyncIterator[str]:
+            nonlocal scheduled
+            for url in links:
+                if scheduled >= self.max_pages:
+                    break
+                scheduled += 1
+                yield url
+
+        depth = 0
+        level: AsyncIterator[str] = admit_seeds()
+        while True:
+            next_level: list[str] = []
+            offset = scheduled
+            results = fetch_concurrently(self.fetcher, level, self.limiter)
+            max_parsing = self.parse_pool.max_pending if self.parse_pool else 1
+            fetching: Optional[asyncio.Future] = None
+            parsing: dict[asyncio.Task, int] = {}
+            exhausted = False
+
+            try:
+                while not exhausted or parsing:
+                    # Pull the next fetched page only while parse capacity is free
+                    if fetching is None and not exhausted and len(parsing) < max_parsing:
+                        fetching = asyncio.ensure_future(anext(results))
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    waiting = set(parsing) | ({fetching} if fetching else set())
+                    done, _ = await asyncio.wait(
+                        waiting, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    if not done:
+                        raise asyncio.TimeoutError
+
+                    if fetching in done:
+                        done.discard(fetching)
+                        try:
+                            index, url, fetch_result = fetching.result()
+                        except StopAsyncIteration:
+                            exhausted = True
+                        else:
+                            task = asyncio.create_task(self._parse(url, fetch_result, errors, page_timings))
+                            parsing[task] = index
+                        fetching = None
+
+                    for task in done:
+                        index = parsing.pop(task)
+                        parsed = task.result()
+                        if parsed is None:
+                            continue
+
+                        # Redirect targets count as seen so they are not fetched twice
+                        final_url = normalize_url(parsed.url)
+                        if final_url:
+                            seen.add(final_url)
+
+                        if depth < self.max_depth:
+                            for link in parsed.links:
+                                if scheduled + len(next_level) >= self.max_pages:
+                                    break
+                                normalized = normalize_url(link)
+                                if (
+                                    normalized
+                                    and normalized not in seen
+                                    and site_key(normalized) in allowed_sites
+                                    and is_crawlable_link(normalized, self.robots.get(site_key(normalized)))
+                                ):
+                                    seen.add(normalized)
+                                    next_level.append(normalized)
+
+                        yield offset + index, parsed
+            except asyncio.TimeoutError:
+                logger.warning(
+                    "Crawl timeout after %ss at depth %s (%s pages scheduled)",
+                    self.timeout,
+                    depth,
+                    scheduled,
+                )
+                errors.append(f"Crawl timeout reached after {self.timeout}s at depth {depth}")
+                return
+            finally:
+                pending = [*parsing, *([fetching] if fetching else [])]
+                for task in pending:
+                    task.cancel()
+                # The generator must not be closed while anext() is still running
+                await asyncio.gather(*pending, return_exceptions=True)
+                await results.aclose()
+
+            logger.info(
+                "Crawl depth %s done: %s pages scheduled, %s queued for next level",
+                depth,
+                scheduled,
+                len(next_level),
+            )
+            if not next_level:
+                return
+            level = admit_links(next_level)
+            depth += 1
+
+    async def _parse(
+        self,
+        url: str,
+        fetch_result,
+        errors: List[str],
+        page_timings: dict[str, dict[str, float]] | None,
+    ) -> Optional[ParsedDocument]:
+        try:
+            if isinstance(fetch_result, Exception):
+                raise fetch_result
+            if fetch_result.error:
+                logger.error("Fetch failed for %s: %s", url, fetch_result.error)
+                errors.append(f"Fetch error for {url}: {fetch_result.error}")
+                return None
+
+            parse_started = time.perf_counter()
+            parsed = await self._cached_parse(fetch_result)
+            cache_hit = parsed is not None
+            if parsed is None:
+                if self.parse_pool is not None:
+                    parsed = await self.parse_pool.parse(fetch_result)
+                else:
+                    parsed = self.parser.parse(fetch_result)
+                if self.parse_cache is not None:
+                    await asyncio.to_thread(self.parse_cache.put, fetch_result, parsed)
+            if page_timings is not None:
+                page_timings[url] = {
+                    **fetch_result.timings,
+                    "parse_ms": round((time.perf_counter() - parse_started) * 1000, 1),
+                    "parse_cache_hit": float(cache_hit),
+                }
+            if parsed.error:
+                logger.error("Parse failed for %s: %s", url, parsed.error)
+                errors.append(f"Parse error for {url}: {parsed.error}")
+                return None
+
+            return parsed
+        except Exception as e:
+            logger.error("Unhandled processing error for %s: %s", url, str(e), exc_info=True)
+            errors.append(f"Error processing {url}: {str(e)}")
+            return None
+
+    async def _cached_parse(self, fetch_result) -> Optional[ParsedDocument]:
+        """Look up a successfully fetched page in the parse cache, off the event loop."""
+        if self.parse_cache is None or fetch_result.status_code != 200:
+            return None
+        parsed = await asyncio.to_thread(self.parse_cache.get, fetch_result)
+        if parsed is None:
+            self.parse_cache_stats.misses += 1
+        else:
+            self.parse_cache_stats.hits += 1
+        return parsed
@@ -0,0 +1,236 @@
+"""Collapse near-duplicate keywords before embedding and clustering."""
+
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from seo_agent.models import KeywordCandidate
+from seo_agent.tools.hf.analyzers import RUSSIAN_ANALYZER_STOPWORDS, TOKEN_PATTERN, get_lemmatizer
+from seo_agent.tools.hf.settings import env_bool, env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+DEDUP_ENABLED = env_bool("DEDUP_ENABLED", True)
+
+# Keywords whose embeddings are at least this similar are collapsed
+DEDUP_SIMILARITY = env_float("DEDUP_SIMILARITY", 0.92)
+
+# Up to this many keywords all pairs are compared; above it LSH blocking is used
+DEDUP_EXACT_MAX = env_int("DEDUP_EXACT_MAX", 2048)
+DEDUP_LSH_TABLES = env_int("DEDUP_LSH_TABLES", 16)
+
+# Rows of a similarity block compared at once
+_BLOCK_ROWS = 1024
+
+
+class _UnionFind:
+    def __init__(self, size: int):
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            # The smaller index stays the root, so groups keep input order
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def groups(self) -> List[List[int]]:
+        members: Dict[int, List[int]] = {}
+        for item in range(len(self.parent)):
+            members.setdefault(self.find(item), []).append(item)
+        return list(members.values())
+
+
+def _tokens(keyword: str) -> List[str]:
+    return TOKEN_PATTERN.findall(keyword.lower())
+
+
+def lemma_key(keyword: str) -> Tuple[str, ...]:
+    """Lemmas of the keyword's words, in order.
+
+    "доставка грузов" and "доставки груза" share a key, while
+    "перевозка минск москва" and "перевозка москва минск" do not: word order
+    and prepositions carry meaning in a query.
+    """
+    lemma = get_lemmatizer().lemma
+    words = _tokens(keyword)
+    return tuple(lemma(word) for word in words) or (keyword.lower(),)
+
+
+def _is_fragment(words: Sequence[str]) -> bool:
+    """An n-gram cut at a stopword, such as "грузоперевозки по"."""
+    return len(words) > 1 and (words[0] in RUSSIAN_ANALYZER_STOPWORDS or words[-1] in RUSSIAN_ANALYZER_STOPWORDS)
+
+
+def _similar_pairs_within(
+    vectors: np.ndarray, members: np.ndarray, threshold: float, union: _UnionFind
+) -> None:
+    """Union every pair of ``members`` whose cosine reaches ``threshold``."""
+    for start in range(0, len(members), _BLOCK_ROWS):
+        rows = members[start:start + _BLOCK_ROWS]
+        # Only pairs (i, j) with j after i in ``members``
+        columns = members[start:]
+        similarity = vectors[rows] @ vectors[columns].T
+        row_pos, col_pos = np.nonzero(similarity >= threshold)
+        for r, c in zip(row_pos, col_pos):
+            if c > r:
+                union.union(int(rows[r]), int(columns[c]))
+
+
+def similar_pairs(
+    vectors: np.ndarray,
+    threshold: float,
+    union: _UnionFind,
+    exact_max: int = DEDUP_EXACT_MAX,
+    n_tables: int = DEDUP_LSH_TABLES,
+    seed: int = 0,
+) -> None:
+    """Union rows of unit-length ``vectors`` with cosine >= ``threshold``.
+
+    Small inputs are compared exhaustively in blocks. Larger ones are bucketed
+    by random-hyperplane LSH (``n_tables`` tables, with bucket codes sized for
+    about 32 rows per bucket) and only rows sharing a bucket are compared,
+    which keeps the work near-linear at the cost of occasionally missing a
+    borderline pair.
+    """
+    n_rows = len(vectors)
+    if n_rows < 2:
+        return
+    if n_rows <= exact_max:
+        _similar_pairs_within(vectors, np.arange(n_rows), threshold, union)
+        return
+
+    n_bits = int(np.clip(np.ceil(np.log2(n_rows / 32)), 4, 30))
+    rng = np.random.default_rng(seed)
+    weights = 1 << np.arange(n_bits, dtype=np.int64)
+    for _ in range(n_tables):
+        planes = rng.standard_normal((vectors.shape[1], n_bits)).astype(vectors.dtype)
+        codes = ((vectors @ planes) > 0).astype(np.int64) @ weights
+        order = np.argsort(codes, kind="stable")
+        boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+        for bucket in np.split(order, boundaries):
+            if len(bucket) > 1:
+                _similar_pairs_within(vectors, bucket, threshold, union)
+
+
+class KeywordDeduplicator:
+    """Groups keyword variants and keeps one canonical keyword per group.
+
+    ``collapse_variants`` needs no embeddings. It merges keywords with the
+    same lemma sequence (inflections of the same phrase). It also merges
+    n-grams cut at a stopword ("грузоперевозки по") into a longer keyword
+    that contains them. ``collapse_similar`` then
+    merges keywords whose embeddings are within ``threshold`` cosine.
+
+    The canonical keyword of a group is its best-scoring complete phrase.
+    It carries the union of source URLs, the number of documents in that
+    union as its frequency, and the collapsed texts in ``variants``.
+    """
+
+    def __init__(self, threshold: float = DEDUP_SIMILARITY):
+        self.threshold = threshold
+
+    def collapse_variants(self, keywords: List[KeywordCandidate]) -> List[KeywordCandidate]:
+        union = _UnionFind(len(keywords))
+        words = [_tokens(kw.keyword) for kw in keywords]
+
+        first_with_key: Dict[Tuple[str, ...], int] = {}
+        for i, kw in enumerate(keywords):
+            union.union(first_with_key.setdefault(lemma_key(kw.keyword), i), i)
+
+        # Fragments join the best-scoring keyword that contains them
+        fragments: Dict[Tuple[str, ...], List[int]] = {}
+        for i, kw_words in enumerate(words):
+            if _is_fragment(kw_words):
+                fragments.setdefault(tuple(kw_words), []).append(i)
+        if fragments:
+            lengths = {len(fragment) for fragment in fragments}
+            containers: Dict[Tuple[str, ...], int] = {}
+            for i, kw_words in enumerate(words):
+                # Only strictly longer keywords contain a fragment
+                for n in (n for n in lengths if n < len(kw_words)):
+                    for start in range(len(kw_words) - n + 1):
+                        piece = tuple(kw_words[start:start + n])
+                        if piece in fragments:
+                            best = containers.get(piece)
+                            if best is None or keywords[i].tf_idf_score > keywords[best].tf_idf_score:
+                                containers[piece] = i
+            for piece, container in containers.items():
+                for i in fragments[piece]:
+                    union.union(container, i)
+
+        merged, _ = self._merge(keywords, union.groups(), words)
+        return merged
+
+    def collapse_similar(
+        self,
+        keywords: List[KeywordCandidate],
+        vectors: np.ndarray,
+    ) -> Tuple[List[KeywordCandidate], List[int]]:
+        """Merge keywords with near-identical embeddings.
+
+        Returns the merged keywords and, for each, the row of ``vectors``
+        of its canonical keyword.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if len(keywords) < 2:
+            return list(keywords), list(range(len(keywords)))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        unit = vectors / np.where(norms == 0, 1, norms)
+
+        union = _UnionFind(len(keywords))
+        similar_pairs(unit, self.threshold, union)
+        return self._merge(keywords, union.groups(), [_tokens(kw.keyword) for kw in keywords])
+
+    @staticmethod
+    def _merge(
+        keywords: List[KeywordCandidate],
+        groups: List[List[int]],
+        words: List[List[str]],
+    ) -> Tuple[List[KeywordCandidate], List[int]]:
+        merged: List[KeywordCandidate] = []
+        canonical_rows: List[int] = []
+        for members in groups:
+            canonical = max(
+                members,
+                key=lambda i: (
+                    not _is_fragment(words[i]),
+                    keywords[i].tf_idf_score,
+                    keywords[i].frequency,
+                    -len(keywords[i].keyword),
+                    -i,
+                ),
+            )
+            if len(members) == 1:
+                merged.append(keywords[canonical])
+                canonical_rows.append(canonical)
+                continue
+
+            head = keywords[canonical]
+            variants = list(head.variants)
+            source_urls = list(head.source_urls)
+            for i in members:
+                if i == canonical:
+                    continue
+                variants.extend([keywords[i].keyword, *keywords[i].variants])
+                source_urls.extend(keywords[i].source_urls)
+            source_urls = list(dict.fromkeys(source_urls))
+            merged.append(head.model_copy(update={
+                # Members share documents; source lists may be capped, so never report fewer than a member
+                "frequency": max(len(source_urls), *(keywords[i].frequency for i in members)),
+                "source_urls": source_urls,
+                "variants": list(dict.fromkeys(variants)),
+            }))
+            canonical_rows.append(canonical)
+
+        if len(merged) < len(keywords):
+            logger.info(f"🧹 Collapsed {len(keywords)} keywords into {len(merged)}")
+        return merged, canonical_rows
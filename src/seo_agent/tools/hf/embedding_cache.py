@@ -0,0 +1,267 @@
+"""Two-tier cache of keyword embeddings keyed by (model, normalized text)."""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from seo_agent.tools.hf.settings import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+# Embedding cache settings
+EMBEDDING_CACHE_ENABLED = env_bool("EMBEDDING_CACHE_ENABLED", True)
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR", str(Path.home() / ".cache" / "seo-agent" / "embeddings")
+)
+# Vectors kept in the in-memory tier
+EMBEDDING_CACHE_SIZE = env_int("EMBEDDING_CACHE_SIZE", 100_000)
+
+# Rows reserved at once when a model's vector file grows
+_GROWTH_ROWS = 4096
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    model TEXT PRIMARY KEY,
+    dim INTEGER NOT NULL,
+    n_rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS vectors (
+    model TEXT NOT NULL,
+    key TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    PRIMARY KEY (model, key)
+);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Cache key form of a keyword: NFKC, lowercase, single spaces."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+class VectorCache:
+    """Thread-safe LRU of vectors."""
+
+    def __init__(self, max_entries: int = EMBEDDING_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._vectors: "OrderedDict[Hashable, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+            return vector
+
+    def put(self, key: Hashable, vector: np.ndarray) -> None:
+        with self._lock:
+            self._vectors[key] = vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_entries:
+                self._vectors.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._vectors.clear()
+
+
+class DiskEmbeddingStore:
+    """Embeddings in one memory-mapped float32 file per model.
+
+    Rows are appended to ``<model hash>.f32`` and located through a SQLite
+    index of (model, key) -> row, so lookups read only the rows they need.
+    A model whose stored dimension differs from new vectors is reset.
+    """
+
+    def __init__(self, directory: str | Path = EMBEDDING_CACHE_DIR):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._maps: Dict[str, np.memmap] = {}
+
+    def _path(self, model: str) -> Path:
+        return self.directory / f"{hashlib.sha1(model.encode('utf-8')).hexdigest()}.f32"
+
+    def _map(self, model: str, dim: int, min_rows: int) -> np.memmap:
+        """Memory map holding at least ``min_rows`` rows, growing the file if needed."""
+        mapped = self._maps.get(model)
+        if mapped is not None and mapped.shape[0] >= min_rows and mapped.shape[1] == dim:
+            return mapped
+        path = self._path(model)
+        row_bytes = dim * 4
+        capacity = path.stat().st_size // row_bytes if path.exists() else 0
+        if capacity < min_rows:
+            capacity = max(min_rows, capacity * 2, _GROWTH_ROWS)
+            with open(path, "ab") as handle:
+                handle.truncate(capacity * row_bytes)
+        mapped = np.memmap(path, dtype=np.float32, mode="r+", shape=(capacity, dim))
+        self._maps[model] = mapped
+        return mapped
+
+    def get_many(self, model: str, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            meta = self._db.execute("SELECT dim, n_rows FROM models WHERE model = ?", (model,)).fetchone()
+            if meta is None or not keys:
+                return {}
+            found: Dict[str, int] = {}
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[start:start + _QUERY_CHUNK]
+                found.update(self._db.execute(
+                    f"SELECT key, row FROM vectors WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                    (model, *chunk),
+                ).fetchall())
+            if not found:
+                return {}
+            mapped = self._map(model, meta[0], meta[1])
+            return {key: np.array(mapped[row]) for key, row in found.items()}
+
+    def put_many(self, model: str, keys: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        with self._lock:
+            meta = self._db.execute("SELECT dim, n_rows FROM models WHERE model = ?", (model,)).fetchone()
+            if meta is not None and meta[0] != vectors.shape[1]:
+                logger.warning("Embedding cache for %s has dimension %s, resetting", model, meta[0])
+                self._db.execute("DELETE FROM vectors WHERE model = ?", (model,))
+                self._maps.pop(model, None)
+                self._path(model).unlink(missing_ok=True)
+                meta = None
+            n_rows = meta[1] if meta is not None else 0
+
+            known = set()
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                known.update(key for (key,) in self._db.execute(
+                    f"SELECT key FROM vectors WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                    (model, *chunk),
+                ))
+            # First position of every key not stored yet
+            new = list({key: i for i, key in reversed(list(enumerate(keys))) if key not in known}.values())[::-1]
+            if not new:
+                return
+
+            mapped = self._map(model, vectors.shape[1], n_rows + len(new))
+            mapped[n_rows:n_rows + len(new)] = vectors[new]
+            mapped.flush()
+            self._db.executemany(
+                "INSERT INTO vectors (model, key, row) VALUES (?, ?, ?)",
+                [(model, keys[i], n_rows + offset) for offset, i in enumerate(new)],
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO models (model, dim, n_rows) VALUES (?, ?, ?)",
+                (model, vectors.shape[1], n_rows + len(new)),
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        self._maps.clear()
+        self._db.close()
+
+
+class EmbeddingCache:
+    """In-memory LRU in front of an optional persistent store."""
+
+    def __init__(self, memory: VectorCache | None = None, disk: DiskEmbeddingStore | None = None):
+        self.memory = memory if memory is not None else VectorCache()
+        self.disk = disk
+
+    def get_many(self, model: str, keys: Sequence[str]) -> List[Optional[np.ndarray]]:
+        vectors = [self.memory.get((model, key)) for key in keys]
+        missing = [key for key, vector in zip(keys, vectors) if vector is None]
+        if missing and self.disk is not None:
+            stored = self.disk.get_many(model, missing)
+            for i, key in enumerate(keys):
+                if vectors[i] is None and key in stored:
+                    vectors[i] = stored[key]
+                    self.memory.put((model, key), stored[key])
+        return vectors
+
+    def put_many(self, model: str, keys: Sequence[str], vectors: np.ndarray) -> None:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        for key, vector in zip(keys, vectors):
+            self.memory.put((model, key), vector)
+        if self.disk is not None:
+            self.disk.put_many(model, list(keys), vectors)
+
+    def lookup(
+        self, model: str, texts: Sequence[str]
+    ) -> Tuple[List[str], List[Optional[np.ndarray]], List[str]]:
+        """Normalized keys of ``texts``, their cached vectors and the unique missing keys.
+
+        Embedders encode the missing keys in one batch and hand the result
+        to :meth:`complete`.
+        """
+        keys = [normalize_text(text) for text in texts]
+        vectors = self.get_many(model, keys)
+        missing = list(dict.fromkeys(key for key, vector in zip(keys, vectors) if vector is None))
+        return keys, vectors, missing
+
+    def complete(
+        self,
+        model: str,
+        keys: Sequence[str],
+        vectors: List[Optional[np.ndarray]],
+        missing: Sequence[str],
+        computed: np.ndarray,
+    ) -> np.ndarray:
+        """Store the vectors computed for ``missing`` and return all vectors in order."""
+        if len(missing):
+            computed = np.asarray(computed, dtype=np.float32)
+            self.put_many(model, missing, computed)
+            by_key = dict(zip(missing, computed))
+            vectors = [vector if vector is not None else by_key[key] for key, vector in zip(keys, vectors)]
+        return np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+# Global embedding cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """
+    Get the process-wide embedding cache.
+
+    Returns:
+        Shared EmbeddingCache, or None when caching is disabled.
+    """
+    global _embedding_cache
+
+    if _embedding_cache is None and EMBEDDING_CACHE_ENABLED:
+        _embedding_cache = EmbeddingCache(disk=DiskEmbeddingStore())
+
+    return _embedding_cache
+
+
+def close_embedding_cache() -> None:
+    """Close the shared embedding cache."""
+    global _embedding_cache
+
+    if _embedding_cache is not None:
+        _embedding_cache.close()
+        _embedding_cache = None
@@ -0,0 +1,317 @@
+"""Content-addressed on-disk cache of raw HTML with HTTP revalidation."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from seo_agent.models import FetchResult
+from seo_agent.tools.hf.crawler import normalize_url
+from seo_agent.tools.hf.settings import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+# Fetch cache settings
+FETCH_CACHE_ENABLED = env_bool("FETCH_CACHE_ENABLED", True)
+FETCH_CACHE_DIR = os.getenv("FETCH_CACHE_DIR", str(Path.home() / ".cache" / "seo-agent" / "fetch"))
+FETCH_CACHE_TTL = env_int("FETCH_CACHE_TTL", 3600)
+FETCH_CACHE_MAX_MB = env_int("FETCH_CACHE_MAX_MB", 512)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    final_url TEXT NOT NULL,
+    status_code INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access);
+CREATE INDEX IF NOT EXISTS ix_entries_content_hash ON entries (content_hash);
+"""
+
+
+class CacheEntry:
+    """Cached response metadata for one normalized URL."""
+
+    def __init__(self, row: sqlite3.Row):
+        self.url = row["url"]
+        self.final_url = row["final_url"]
+        self.status_code = row["status_code"]
+        self.headers = json.loads(row["headers"])
+        self.content_hash = row["content_hash"]
+        self.etag = row["etag"]
+        self.last_modified = row["last_modified"]
+        self.fetched_at = row["fetched_at"]
+
+    def is_fresh(self, ttl: int) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Validators for a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class FetchCache:
+    """Raw HTML cache keyed by normalized URL.
+
+    Bodies are zlib-compressed and stored once per content hash, so identical
+    pages under different URLs share a blob. A SQLite index keeps validators
+    (``ETag``/``Last-Modified``), freshness and access times; the least
+    recently used entries are evicted once the blobs exceed ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = FETCH_CACHE_DIR,
+        ttl: int = FETCH_CACHE_TTL,
+        max_bytes: int = FETCH_CACHE_MAX_MB * 1024 * 1024,
+    ):
+        self.directory = Path(directory).expanduser()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._blobs = self.directory / "blobs"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        # Used from worker threads by CachedFetcher; the lock serializes access
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "index.sqlite3", check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+        self._total_bytes = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT content_hash, size FROM entries)"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return normalize_url(url) or url
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self._blobs / content_hash[:2] / f"{content_hash}.z"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return cached metadata for URL, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT * FROM entries WHERE url = ?", (self._key(url),)).fetchone()
+            if row is None:
+                return None
+            if not self._blob_path(row["content_hash"]).exists():
+                self._delete(row["url"], row["content_hash"], row["size"])
+                self._db.commit()
+                return None
+            return CacheEntry(row)
+
+    def load(self, entry: CacheEntry, cache_status: str) -> FetchResult:
+        """Build a ``FetchResult`` from a cached entry and mark it as accessed.
+
+        Raises:
+            FileNotFoundError: If the entry's blob has been evicted meanwhile.
+        """
+        with self._lock:
+            data = self._blob_path(entry.content_hash).read_bytes()
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE url = ?",
+                (time.time(), entry.url),
+            )
+            self._db.commit()
+        content = zlib.decompress(data).decode("utf-8")
+        return FetchResult(
+            url=entry.final_url,
+            status_code=entry.status_code,
+            content=content,
+            headers=entry.headers,
+            cache_status=cache_status,
+        )
+
+    def refresh(self, entry: CacheEntry) -> None:
+        """Mark entry as fresh again after a 304 Not Modified."""
+        entry.fetched_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET fetched_at = ? WHERE url = ?",
+                (entry.fetched_at, entry.url),
+            )
+            self._db.commit()
+
+    def put(self, url: str, result: FetchResult) -> None:
+        """Store a successful response body and its validators."""
+        body = result.content.encode("utf-8")
+        content_hash = hashlib.sha256(body).hexdigest()
+        compressed = zlib.compress(body, 6)
+        headers = {k.lower(): v for k, v in result.headers.items()}
+        key = self._key(url)
+
+        with self._lock:
+            blob_path = self._blob_path(content_hash)
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = blob_path.with_suffix(".tmp")
+                tmp_path.write_bytes(compressed)
+                tmp_path.replace(blob_path)
+            size = blob_path.stat().st_size
+
+            previous = self._db.execute(
+                "SELECT content_hash, size FROM entries WHERE url = ?", (key,)
+            ).fetchone()
+            shared = self._db.execute(
+                "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+            ).fetchone()
+            if shared is None:
+                self._total_bytes += size
+
+            now = time.time()
+            self._db.execute(
+                """
+                INSERT OR REPLACE INTO entries
+                    (url, final_url, status_code, headers, content_hash, size,
+                     etag, last_modified, fetched_at, last_access)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key,
+                    result.url,
+                    result.status_code,
+                    json.dumps(result.headers),
+                    content_hash,
+                    size,
+                    headers.get("etag"),
+                    headers.get("last-modified"),
+                    now,
+                    now,
+                ),
+            )
+            if previous is not None and previous["content_hash"] != content_hash:
+                self._drop_blob_if_unused(previous["content_hash"], previous["size"])
+            self._evict()
+            self._db.commit()
+
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _delete(self, key: str, content_hash: str, size: int) -> None:
+        self._db.execute("DELETE FROM entries WHERE url = ?", (key,))
+        self._drop_blob_if_unused(content_hash, size)
+
+    def _drop_blob_if_unused(self, content_hash: str, size: int) -> None:
+        in_use = self._db.execute(
+            "SELECT 1 FROM entries WHERE content_hash = ? LIMIT 1", (content_hash,)
+        ).fetchone()
+        if in_use is None:
+            self._blob_path(content_hash).unlink(missing_ok=True)
+            self._total_bytes -= size
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until blobs fit into ``max_bytes``."""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = self._db.execute(
+            "SELECT url, content_hash, size FROM entries ORDER BY last_access ASC"
+        ).fetchall()
+        for row in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._delete(row["url"], row["content_hash"], row["size"])
+            evicted += 1
+        logger.info("Fetch cache evicted %s entries, %s bytes in use", evicted, self._total_bytes)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class CachedFetcher:
+    """Wrap a ``Fetcher`` with the on-disk cache.
+
+    Fresh entries are served without touching the network; stale entries are
+    revalidated with a conditional GET and served from disk on 304.
+    """
+
+    def __init__(self, fetcher, cache: FetchCache):
+        self.fetcher = fetcher
+        self.cache = cache
+
+    async def fetch(self, url: str) -> FetchResult:
+        started = time.perf_counter()
+        entry = await asyncio.to_thread(self.cache.get, url)
+
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            cached = await self._from_cache(entry, "hit", started)
+            if cached is not None:
+                return cached
+            entry = None
+
+        extra_headers = entry.conditional_headers() if entry is not None else None
+        result = await self.fetcher.fetch(url, extra_headers=extra_headers)
+
+        if entry is not None and result.status_code == 304:
+            cached = await self._from_cache(entry, "revalidated", started, refresh=True)
+            if cached is not None:
+                return cached
+            result = await self.fetcher.fetch(url)
+
+        if not result.error and result.status_code == 200:
+            try:
+                await asyncio.to_thread(self.cache.put, url, result)
+            except Exception as e:
+                logger.warning("Failed to cache %s: %s", url, str(e))
+            result.cache_status = "miss"
+        return result
+
+    async def _from_cache(
+        self, entry: CacheEntry, cache_status: str, started: float, refresh: bool = False
+    ) -> Optional[FetchResult]:
+        """Serve entry from disk, or None when its blob was evicted after lookup."""
+        try:
+            result = await asyncio.to_thread(self.cache.load, entry, cache_status)
+        except FileNotFoundError:
+            logger.debug("Fetch cache blob of %s was evicted, fetching again", entry.url)
+            return None
+        if refresh:
+            await asyncio.to_thread(self.cache.refresh, entry)
+        result.timings = {"fetch_ms": round((time.perf_counter() - started) * 1000, 1)}
+        logger.debug("Fetch cache %s for %s", cache_status, entry.url)
+        return result
+
+
+# Global fetch cache instance
+_fetch_cache: Optional[FetchCache] = None
+
+
+def get_fetch_cache() -> FetchCache:
+    """
+    Get the process-wide fetch cache.
+
+    Returns:
+        Shared FetchCache instance.
+    """
+    global _fetch_cache
+
+    if _fetch_cache is None:
+        _fetch_cache = FetchCache()
+
+    return _fetch_cache
+
+
+def close_fetch_cache() -> None:
+    """Close the shared fetch cache index."""
+    global _fetch_cache
+
+    if _fetch_cache is not None:
+        _fetch_cache.close()
+        _fetch_cache = None
@@ -4,10 +4,14 @@ import asyncio
 import httpx
 import logging
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
 
 from seo_agent.models import FetchResult, ParsedDocument
+from seo_agent.tools.hf.settings import env_bool, env_float, env_int
 from seo_agent.tools.hf.stealth_config import STEALTH_JS, STEALTH_BROWSER_ARGS
 
 # Anti-bot headers to bypass simple bot detection
@@ -32,11 +36,450 @@ ANTI_BOT_HEADERS = {
 logger = logging.getLogger(__name__)
 
 
-def _env_bool(name: str, default: bool) -> bool:
-    value = os.getenv(name)
-    if value is None:
-        return default
-    return value.strip().lower() in {"1", "true", "yes", "on"}
+# Default fetch parallelism: overall in-flight requests and requests per host.
+FETCH_CONCURRENCY = env_int("FETCH_CONCURRENCY", 10)
+FETCH_PER_HOST_LIMIT = env_int("FETCH_PER_HOST_LIMIT", 4)
+
+
+# Shared httpx connection pool settings
+HTTP_MAX_CONNECTIONS = env_int("HTTP_MAX_CONNECTIONS", 100)
+HTTP_MAX_KEEPALIVE_CONNECTIONS = env_int("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+HTTP_KEEPALIVE_EXPIRY = env_float("HTTP_KEEPALIVE_EXPIRY", 30.0)
+HTTP_HTTP2 = env_bool("HTTP_HTTP2", False)
+
+# Global pooled client instance
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_supported() -> bool:
+    """HTTP/2 in httpx needs the optional ``h2`` package."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide pooled httpx client.
+
+    The client is created lazily and reused by every ``Fetcher`` so that
+    connections to the same host are kept alive between pages.
+
+    Returns:
+        Shared httpx.AsyncClient instance.
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        http2 = HTTP_HTTP2
+        if http2 and not _http2_supported():
+            logger.warning("HTTP_HTTP2 is enabled but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+
+        _http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=http2,
+            follow_redirects=True,
+        )
+        logger.info(
+            "Created shared httpx client: max_connections=%s, keepalive=%s, expiry=%ss, http2=%s",
+            HTTP_MAX_CONNECTIONS,
+            HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            HTTP_KEEPALIVE_EXPIRY,
+            http2,
+        )
+
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared httpx client and release pooled connections."""
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class HostLimiter:
+    """Bound in-flight fetches globally and per host.
+
+    A single limiter can be shared between several fetch stages so that the
+    global budget is respected across all of them. Hosts with a robots.txt
+    ``Crawl-delay`` get their request starts spaced by that delay. A host's
+    semaphore is dropped once no fetch holds or awaits it, so long crawls over
+    many hosts do not accumulate state.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = FETCH_CONCURRENCY,
+        per_host_limit: int = FETCH_PER_HOST_LIMIT,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_limit = max(1, per_host_limit)
+        self._global = asyncio.Semaphore(self.max_concurrency)
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        # Fetches holding or waiting for each host's semaphore
+        self._host_users: dict[str, int] = {}
+        self._crawl_delays: dict[str, float] = {}
+        self._next_start: dict[str, float] = {}
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._hosts.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._hosts[host] = semaphore
+        return semaphore
+
+    def set_crawl_delay(self, host: str, delay: Optional[float]) -> None:
+        """Space request starts to ``host`` by ``delay`` seconds (None or 0 clears it)."""
+        host = host.lower()
+        if delay:
+            self._crawl_delays[host] = float(delay)
+        else:
+            self._crawl_delays.pop(host, None)
+
+    async def _wait_for_crawl_delay(self, host: str) -> None:
+        delay = self._crawl_delays.get(host)
+        if not delay:
+            return
+        # Reserve the next start time before sleeping so concurrent waiters queue up.
+        now = time.monotonic()
+        start = max(now, self._next_start.get(host, 0.0))
+        self._next_start[host] = start + delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one host slot and one global slot for the duration of a fetch."""
+        host = urlparse(url).netloc.lower()
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            # Take the host slot first so that a busy host does not pin global slots.
+            async with self._host_semaphore(host):
+                await self._wait_for_crawl_delay(host)
+                async with self._global:
+                    yield
+        finally:
+            self._release_host(host)
+
+    def _release_host(self, host: str) -> None:
+        users = self._host_users.pop(host) - 1
+        if users:
+            self._host_users[host] = users
+            return
+        self._hosts.pop(host, None)
+        # A reserved start still in the future keeps spacing the next request
+        if self._next_start.get(host, 0.0) <= time.monotonic():
+            self._next_start.pop(host, None)
+
+
+async def aiter_urls(urls: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    """Iterate a regular or async iterable of URLs asynchronously."""
+    if isinstance(urls, AsyncIterable):
+        async for url in urls:
+            yield url
+    else:
+        for url in urls:
+            yield url
+
+
+async def fetch_concurrently(
+    fetcher,
+    urls: Iterable[str] | AsyncIterable[str],
+    limiter: Optional[HostLimiter] = None,
+) -> AsyncIterator[tuple[int, str, FetchResult | Exception]]:
+    """Fetch URLs concurrently and yield results in completion order.
+
+    ``urls`` may be a regular or an async iterable; it is consumed lazily so
+    that only a bounded window of fetches is pending at any time.
+
+    Yields ``(index, url, result)`` tuples where ``index`` is the position of the
+    URL in ``urls`` and ``result`` is either a ``FetchResult`` or the exception
+    raised by ``fetcher.fetch``.
+    """
+    limiter = limiter or HostLimiter()
+    max_pending = limiter.max_concurrency * 2
+
+    async def run(index: int, url: str) -> tuple[int, str, FetchResult | Exception]:
+        try:
+            async with limiter.slot(url):
+                return index, url, await fetcher.fetch(url)
+        except Exception as e:
+            return index, url, e
+
+    source = aiter_urls(urls)
+    pending: set[asyncio.Task] = set()
+    next_index = 0
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    url = await anext(source)
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                pending.add(asyncio.create_task(run(next_index, url)))
+                next_index += 1
+
+            if not pending:
+                break
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await source.aclose()
+
+
+# Playwright request blocking: resource types aborted before download
+PLAYWRIGHT_BLOCK_RESOURCES = [
+    item.strip().lower()
+    for item in os.getenv("PLAYWRIGHT_BLOCK_RESOURCES", "image,media,font").split(",")
+    if item.strip()
+]
+PLAYWRIGHT_BLOCK_TRACKERS = env_bool("PLAYWRIGHT_BLOCK_TRACKERS", True)
+
+# Adaptive settle: page is ready once the DOM has been quiet for QUIET_MS
+PLAYWRIGHT_SETTLE_QUIET_MS = env_int("PLAYWRIGHT_SETTLE_QUIET_MS", 500)
+PLAYWRIGHT_SETTLE_TIMEOUT_MS = env_int("PLAYWRIGHT_SETTLE_TIMEOUT_MS", 10000)
+
+# Analytics/ads hosts that never contribute page content
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "connect.facebook.net",
+    "mc.yandex.ru",
+    "an.yandex.ru",
+    "top-fwz1.mail.ru",
+    "hotjar.com",
+    "clarity.ms",
+    "criteo.com",
+    "adservice.google.com",
+)
+
+# Resolves once no DOM mutation happened for `quietMs` milliseconds.
+DOM_QUIET_JS = """
+(quietMs) => new Promise((resolve) => {
+    const root = document.documentElement || document;
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(timer);
+        timer = setTimeout(done, quietMs);
+    });
+    function done() {
+        observer.disconnect();
+        resolve(document.body ? document.body.innerText.length : 0);
+    }
+    observer.observe(root, {childList: true, subtree: true, characterData: true});
+    timer = setTimeout(done, quietMs);
+})
+"""
+
+
+def is_tracker_url(url: str) -> bool:
+    """Return True if URL belongs to a known analytics/ads host."""
+    host = urlparse(url).netloc.lower()
+    return any(host == t or host.endswith("." + t) for t in TRACKER_HOSTS)
+
+
+# Shared Chromium pool settings
+PLAYWRIGHT_POOL_SIZE = env_int("PLAYWRIGHT_POOL_SIZE", 2)
+PLAYWRIGHT_MAX_CONTEXTS = env_int("PLAYWRIGHT_MAX_CONTEXTS", 4)
+PLAYWRIGHT_RECYCLE_AFTER = env_int("PLAYWRIGHT_RECYCLE_AFTER", 100)
+
+
+class _PooledBrowser:
+    """Chromium instance tracked by ``BrowserPool``."""
+
+    def __init__(self, browser):
+        self.browser = browser
+        self.active_contexts = 0
+        self.pages_served = 0
+        self.retired = False
+
+    @property
+    def is_healthy(self) -> bool:
+        return not self.retired and self.browser.is_connected()
+
+
+class BrowserPool:
+    """Pool of warm Chromium browsers serving isolated contexts.
+
+    Each browser serves up to ``max_contexts`` contexts at once. A browser is
+    recycled after ``recycle_after`` pages or as soon as it disconnects; it is
+    closed once its last active context is released.
+    """
+
+    def __init__(
+        self,
+        size: int = PLAYWRIGHT_POOL_SIZE,
+        max_contexts: int = PLAYWRIGHT_MAX_CONTEXTS,
+        recycle_after: int = PLAYWRIGHT_RECYCLE_AFTER,
+        headless: bool = True,
+        launch_args: Optional[list[str]] = None,
+    ):
+        self.size = max(1, size)
+        self.max_contexts = max(1, max_contexts)
+        self.recycle_after = max(1, recycle_after)
+        self.headless = headless
+        self.launch_args = list(STEALTH_BROWSER_ARGS if launch_args is None else launch_args)
+        self._slots = asyncio.Semaphore(self.size * self.max_contexts)
+        self._lock = asyncio.Lock()
+        self._browsers: list[_PooledBrowser] = []
+        self._playwright = None
+
+    async def _launch(self) -> _PooledBrowser:
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+
+        browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=self.launch_args,
+        )
+        pooled = _PooledBrowser(browser)
+        self._browsers.append(pooled)
+        logger.info(
+            "Launched pooled Chromium: browsers=%s/%s, headless=%s",
+            len(self._browsers),
+            self.size,
+            self.headless,
+        )
+        return pooled
+
+    async def _discard(self, pooled: _PooledBrowser) -> None:
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug("Ignoring error while closing pooled browser: %s", str(e))
+
+    async def _checkout(self) -> _PooledBrowser:
+        async with self._lock:
+            # Health check: drop disconnected browsers and retire them if busy.
+            for pooled in list(self._browsers):
+                if not pooled.browser.is_connected():
+                    pooled.retired = True
+                    if pooled.active_contexts == 0:
+                        await self._discard(pooled)
+
+            available = [
+                b for b in self._browsers
+                if b.is_healthy and b.active_contexts < self.max_contexts
+            ]
+            if available:
+                pooled = min(available, key=lambda b: b.active_contexts)
+            else:
+                # Slot semaphore guarantees a free slot, so a new browser fits the budget.
+                pooled = await self._launch()
+
+            pooled.active_contexts += 1
+            return pooled
+
+    async def _release(self, pooled: _PooledBrowser, crashed: bool) -> None:
+        async with self._lock:
+            pooled.active_contexts -= 1
+            pooled.pages_served += 1
+
+            if crashed or not pooled.browser.is_connected():
+                logger.warning("Pooled Chromium crashed or disconnected; recycling")
+                pooled.retired = True
+            elif pooled.pages_served >= self.recycle_after and not pooled.retired:
+                logger.info("Recycling pooled Chromium after %s pages", pooled.pages_served)
+                pooled.retired = True
+
+            if pooled.retired and pooled.active_contexts == 0:
+                await self._discard(pooled)
+
+    @asynccontextmanager
+    async def context(self, **context_options) -> AsyncIterator:
+        """Yield a fresh browser context from a pooled browser.
+
+        The context is closed on exit; keyword arguments are passed to
+        ``browser.new_context``.
+        """
+        async with self._slots:
+            pooled = await self._checkout()
+            context = None
+            crashed = False
+            try:
+                context = await pooled.browser.new_context(**context_options)
+                yield context
+            except Exception:
+                crashed = not pooled.browser.is_connected()
+                raise
+            finally:
+                if context is not None:
+                    try:
+                        await context.close()
+                    except Exception:
+                        crashed = True
+                await self._release(pooled, crashed)
+
+    def stats(self) -> dict:
+        """Return current pool occupancy for logging and diagnostics."""
+        return {
+            "browsers": len(self._browsers),
+            "active_contexts": sum(b.active_contexts for b in self._browsers),
+            "pages_served": sum(b.pages_served for b in self._browsers),
+        }
+
+    async def close(self) -> None:
+        """Close all browsers and stop Playwright."""
+        async with self._lock:
+            for pooled in list(self._browsers):
+                await self._discard(pooled)
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+
+# Global browser pool instance
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """
+    Get the process-wide Chromium pool.
+
+    Args:
+        headless: Headless mode used when the pool is first created.
+
+    Returns:
+        Shared BrowserPool instance.
+    """
+    global _browser_pool
+
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(headless=headless)
+
+    return _browser_pool
+
+
+async def close_browser_pool() -> None:
+    """Close the shared Chromium pool if it was started."""
+    global _browser_pool
+
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
 
 
 class PlayWrightFetcher:
@@ -46,7 +489,12 @@ class PlayWrightFetcher:
         self, 
         timeout: int = 60000, 
         headless: Optional[bool] = None,
-        stealth_mode: bool = True
+        stealth_mode: bool = True,
+        pool: Optional[BrowserPool] = None,
+        block_resources: Optional[Iterable[str]] = None,
+        block_trackers: Optional[bool] = None,
+        settle_quiet_ms: int = PLAYWRIGHT_SETTLE_QUIET_MS,
+        settle_timeout_ms: int = PLAYWRIGHT_SETTLE_TIMEOUT_MS,
     ):
         """Initialize Playwright fetcher.
         
@@ -54,14 +502,74 @@ class PlayWrightFetcher:
             timeout: Request timeout in milliseconds (default: 60000ms = 60s)
             headless: Run browser in headless mode. If None, auto-detect from env.
             stealth_mode: Enable stealth mode to hide automation (default: True)
+            pool: Browser pool to use. If None, the shared pool is used.
+            block_resources: Resource types to abort (e.g. image, font, media).
+                If None, PLAYWRIGHT_BLOCK_RESOURCES is used. Documents are never blocked.
+            block_trackers: Abort requests to known analytics/ads hosts.
+                If None, PLAYWRIGHT_BLOCK_TRACKERS is used.
+            settle_quiet_ms: DOM must stay unchanged this long to count as settled
+            settle_timeout_ms: Upper bound for the settle wait
         """
         self.timeout = timeout
         # In Docker/server environments there is usually no X server,
         # so headless must be enabled unless explicitly overridden.
         default_headless = os.getenv("DISPLAY") is None
-        self.headless = _env_bool("PLAYWRIGHT_HEADLESS", default_headless) if headless is None else headless
+        self.headless = env_bool("PLAYWRIGHT_HEADLESS", default_headless) if headless is None else headless
         self.stealth_mode = stealth_mode
-        self._browser = None
+        self._pool = pool
+        resources = PLAYWRIGHT_BLOCK_RESOURCES if block_resources is None else block_resources
+        self.block_resources = {r.strip().lower() for r in resources} - {"document"}
+        self.block_trackers = PLAYWRIGHT_BLOCK_TRACKERS if block_trackers is None else block_trackers
+        self.settle_quiet_ms = settle_quiet_ms
+        self.settle_timeout_ms = settle_timeout_ms
+
+    async def _install_blocking(self, context, counters: dict[str, float]) -> None:
+        """Abort requests for blocked resource types and tracker hosts."""
+        if not self.block_resources and not self.block_trackers:
+            return
+
+        async def handle(route) -> None:
+            request = route.request
+            if request.resource_type in self.block_resources or (
+                self.block_trackers and is_tracker_url(request.url)
+            ):
+                counters["blocked_requests"] += 1
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await context.route("**/*", handle)
+
+    async def _wait_for_settle(self, page) -> None:
+        """Wait until the DOM stops mutating, bounded by ``settle_timeout_ms``.
+
+        Anti-bot interstitials navigate away mid-wait; in that case the wait
+        restarts on the new document until the deadline.
+        """
+        deadline = time.perf_counter() + self.settle_timeout_ms / 1000
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                logger.debug("Settle wait hit %sms limit for %s", self.settle_timeout_ms, page.url)
+                return
+            try:
+                await asyncio.wait_for(
+                    page.evaluate(DOM_QUIET_JS, self.settle_quiet_ms),
+                    timeout=remaining,
+                )
+                return
+            except asyncio.TimeoutError:
+                logger.debug("Settle wait hit %sms limit for %s", self.settle_timeout_ms, page.url)
+                return
+            except Exception:
+                # Execution context destroyed by navigation: wait for the next document.
+                try:
+                    await page.wait_for_load_state(
+                        "domcontentloaded",
+                        timeout=max(1, int(remaining * 1000)),
+                    )
+                except Exception:
+                    return
     
     async def fetch(self, url: str) -> FetchResult:
         """Fetch content from URL using Playwright with anti-detection measures.
@@ -69,7 +577,7 @@ class PlayWrightFetcher:
         Handles JavaScript-heavy sites, Cloudflare, Turnstile, and other bot detection.
         """
         try:
-            from playwright.async_api import async_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             return FetchResult(
                 url=url,
@@ -78,98 +586,97 @@ class PlayWrightFetcher:
                 error="Playwright not installed. Install with: pip install playwright"
             )
         
+        pool = self._pool or get_browser_pool(headless=self.headless)
+        counters: dict[str, float] = {"blocked_requests": 0}
+        started = time.perf_counter()
+        
         try:
-            async with async_playwright() as p:
-                logger.info(
-                    "Playwright fetch start: url=%s, headless=%s, stealth_mode=%s, timeout_ms=%s",
+            logger.info(
+                "Playwright fetch start: url=%s, headless=%s, stealth_mode=%s, timeout_ms=%s",
+                url,
+                pool.headless,
+                self.stealth_mode,
+                self.timeout,
+            )
+            # Create context with realistic browser fingerprint on a warm browser
+            async with pool.context(
+                extra_http_headers=ANTI_BOT_HEADERS,
+                user_agent=ANTI_BOT_HEADERS["User-Agent"],
+                viewport={"width": 1920, "height": 1080},
+                locale="en-US",
+                timezone_id="America/New_York",
+                # Simulate real browser permissions
+                permissions=["geolocation"],
+                geolocation={"latitude": 40.7128, "longitude": -74.0060},
+                color_scheme="light",
+            ) as context:
+                # Add comprehensive stealth JS
+                if self.stealth_mode:
+                    await context.add_init_script(STEALTH_JS)
+                
+                await self._install_blocking(context, counters)
+                
+                page = await context.new_page()
+                
+                # Navigate to URL with timeout
+                response = await page.goto(
                     url,
-                    self.headless,
-                    self.stealth_mode,
-                    self.timeout,
-                )
-                # Launch browser with enhanced stealth args
-                browser = await p.chromium.launch(
-                    headless=self.headless,
-                    args=STEALTH_BROWSER_ARGS
+                    wait_until="domcontentloaded",
+                    timeout=self.timeout
                 )
+                navigated = time.perf_counter()
                 
-                try:
-                    # Create context with realistic browser fingerprint
-                    context = await browser.new_context(
-                        extra_http_headers=ANTI_BOT_HEADERS,
-                        user_agent=ANTI_BOT_HEADERS["User-Agent"],
-                        viewport={"width": 1920, "height": 1080},
-                        locale="en-US",
-                        timezone_id="America/New_York",
-                        # Simulate real browser permissions
-                        permissions=["geolocation"],
-                        geolocation={"latitude": 40.7128, "longitude": -74.0060},
-                        color_scheme="light",
-                    )
-                    
-                    # Add comprehensive stealth JS
-                    if self.stealth_mode:
-                        await context.add_init_script(STEALTH_JS)
-                    
-                    page = await context.new_page()
-                    
-                    # Navigate to URL with timeout
-                    response = await page.goto(
-                        url,
-                        wait_until="domcontentloaded",
-                        timeout=self.timeout
-                    )
-                    
-                    if response is None:
-                        return FetchResult(
-                            url=url,
-                            status_code=0,
-                            content="",
-                            error="Failed to load page"
-                        )
-                    
-                    status_code = response.status
-                    
-                    # Wait for content to load (adaptive wait)
-                    try:
-                        await page.wait_for_load_state("networkidle", timeout=10000)
-                    except:
-                        # If networkidle times out, continue anyway
-                        pass
-                    
-                    # Additional wait for dynamic content and anti-bot checks
-                    await page.wait_for_timeout(3000)
-                    
-                    # Simulate human behavior - mouse movement
-                    try:
-                        await page.mouse.move(100, 100)
-                        await page.mouse.move(200, 200)
-                    except:
-                        pass
-                    
-                    # Get page content (after JavaScript execution)
-                    content = await page.content()
-
-                    logger.info(
-                        "Playwright fetch success: url=%s, status=%s, content_len=%s",
-                        str(response.url),
-                        status_code,
-                        len(content),
-                    )
-                    
-                    # Extract response headers
-                    headers = dict(response.headers)
-                    
-                    await context.close()
-                    
+                if response is None:
                     return FetchResult(
-                        url=str(response.url),
-                        status_code=status_code,
-                        content=content,
-                        headers=headers,
+                        url=url,
+                        status_code=0,
+                        content="",
+                        error="Failed to load page"
                     )
-                finally:
-                    await browser.close()
+                
+                status_code = response.status
+                
+                # Wait for dynamic content and anti-bot checks to settle
+                await self._wait_for_settle(page)
+                settled = time.perf_counter()
+                
+                # Simulate human behavior - mouse movement
+                try:
+                    await page.mouse.move(100, 100)
+                    await page.mouse.move(200, 200)
+                except:
+                    pass
+                
+                # Get page content (after JavaScript execution)
+                content = await page.content()
+                finished = time.perf_counter()
+                
+                timings = {
+                    "navigate_ms": round((navigated - started) * 1000, 1),
+                    "settle_ms": round((settled - navigated) * 1000, 1),
+                    "fetch_ms": round((finished - started) * 1000, 1),
+                    **counters,
+                }
+
+                logger.info(
+                    "Playwright fetch success: url=%s, status=%s, content_len=%s, timings=%s, pool=%s",
+                    str(response.url),
+                    status_code,
+                    len(content),
+                    timings,
+                    pool.stats(),
+                )
+                
+                # Extract response headers
+                headers = dict(response.headers)
+                
+                return FetchResult(
+                    url=str(response.url),
+                    status_code=status_code,
+                    content=content,
+                    headers=headers,
+                    timings=timings,
+                )
                     
         except Exception as e:
             logger.error("Playwright fetch failed for %s: %s", url, str(e), exc_info=True)
@@ -184,30 +691,50 @@ class PlayWrightFetcher:
 class Fetcher:
     """Fetch HTML content from URLs using httpx."""
     
-    def __init__(self, timeout: int = 30, user_agent: Optional[str] = None):
+    def __init__(
+        self,
+        timeout: int = 30,
+        user_agent: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ):
+        """Initialize httpx fetcher.
+        
+        Args:
+            timeout: Request timeout in seconds (default: 30)
+            user_agent: Override for the User-Agent header
+            client: httpx client to use. If None, the shared pooled client is used.
+        """
         self.timeout = timeout
         self.user_agent = user_agent or ANTI_BOT_HEADERS["User-Agent"]
         self.headers = {
             k: v for k, v in ANTI_BOT_HEADERS.items() 
             if k != "User-Agent"
         }
+        self._client = client
     
-    async def fetch(self, url: str) -> FetchResult:
-        """Fetch content from URL using httpx."""
+    async def fetch(self, url: str, extra_headers: Optional[dict[str, str]] = None) -> FetchResult:
+        """Fetch content from URL using httpx.
+        
+        ``extra_headers`` are added to the request, e.g. conditional
+        ``If-None-Match``/``If-Modified-Since`` headers from the fetch cache.
+        """
+        started = time.perf_counter()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    url,
-                    headers={**self.headers, "User-Agent": self.user_agent},
-                    follow_redirects=True
-                )
-                
-                return FetchResult(
-                    url=str(response.url),
-                    status_code=response.status_code,
-                    content=response.text,
-                    headers=dict(response.headers),
-                )
+            client = self._client or get_http_client()
+            response = await client.get(
+                url,
+                headers={**self.headers, "User-Agent": self.user_agent, **(extra_headers or {})},
+                timeout=self.timeout,
+                follow_redirects=True
+            )
+            
+            return FetchResult(
+                url=str(response.url),
+                status_code=response.status_code,
+                content=response.text,
+                headers=dict(response.headers),
+                timings={"fetch_ms": round((time.perf_counter() - started) * 1000, 1)},
+            )
         except Exception as e:
             return FetchResult(
                 url=url,
@@ -217,15 +744,26 @@ class Fetcher:
             )
 
 
+# Bump whenever Parser output changes so cached parses are not reused
+PARSER_VERSION = "2"
+
+
 class Parser:
-    """Parse HTML to extract text and structure."""
+    """Parse HTML to extract text and structure.
+    
+    Each document is parsed into a single lxml tree: one pass over it collects
+    title, meta description, H1-H3, canonical, hreflang and links, and the same
+    tree is handed to trafilatura for main-text extraction.
+    """
+    
+    STRUCTURE_TAGS = ("title", "meta", "h1", "h2", "h3", "a", "link")
     
     def __init__(self):
         import trafilatura
         self.trafilatura = trafilatura
     
     def parse(self, fetch_result: FetchResult) -> ParsedDocument:
-        """Parse fetched content using trafilatura."""
+        """Parse fetched content into a ``ParsedDocument``."""
         if fetch_result.error or fetch_result.status_code != 200:
             return ParsedDocument(
                 url=fetch_result.url,
@@ -234,35 +772,17 @@ class Parser:
             )
         
         try:
-            # Extract main content
-            main_text = self.trafilatura.extract(fetch_result.content) or ""
-            
-            # Try to extract title and description
-            from bs4 import BeautifulSoup
-            
-            # Use html.parser as fallback if lxml is not available
-            try:
-                soup = BeautifulSoup(fetch_result.content, "lxml")
-            except:
-                soup = BeautifulSoup(fetch_result.content, "html.parser")
-            
-            title = None
-            if soup.title:
-                title = soup.title.string
+            tree = self.trafilatura.load_html(fetch_result.content)
+            if tree is None:
+                raise ValueError("empty HTML document")
             
-            description = None
-            meta_desc = soup.find("meta", attrs={"name": "description"})
-            if meta_desc and meta_desc.get("content"):
-                description = meta_desc["content"]
+            document = self._extract_structure(tree, fetch_result.url)
             
-            # Extract headings
-            headings = [h.get_text(strip=True) for h in soup.find_all(["h1", "h2", "h3"])]
+            # trafilatura works on its own copy, so the shared tree stays intact
+            main_text = self.trafilatura.extract(tree) or ""
             
             return ParsedDocument(
-                url=fetch_result.url,
-                title=title,
-                description=description,
-                headings=headings,
+                **document,
                 main_text=main_text,
                 word_count=len(main_text.split()),
                 error=None
@@ -273,3 +793,48 @@ class Parser:
                 main_text="",
                 error=f"Parse error: {str(e)}"
             )
+    
+    def _extract_structure(self, tree, base_url: str) -> dict:
+        """Collect SEO structure from the tree in one document-order walk."""
+        title = None
+        description = None
+        canonical = None
+        headings: List[str] = []
+        hreflang: Dict[str, str] = {}
+        links: List[str] = []
+        
+        for element in tree.iter(*self.STRUCTURE_TAGS):
+            tag = element.tag
+            if tag == "a":
+                href = (element.get("href") or "").strip()
+                if href:
+                    # Outgoing links are resolved against the final URL for crawling
+                    links.append(urljoin(base_url, href))
+            elif tag in ("h1", "h2", "h3"):
+                text = " ".join(element.text_content().split())
+                if text:
+                    headings.append(text)
+            elif tag == "meta":
+                if description is None and (element.get("name") or "").lower() == "description":
+                    description = element.get("content") or None
+            elif tag == "link":
+                rel = (element.get("rel") or "").lower().split()
+                href = (element.get("href") or "").strip()
+                if not href:
+                    continue
+                if "canonical" in rel and canonical is None:
+                    canonical = urljoin(base_url, href)
+                elif "alternate" in rel and element.get("hreflang"):
+                    hreflang[element.get("hreflang").strip().lower()] = urljoin(base_url, href)
+            elif tag == "title" and title is None:
+                title = " ".join(element.text_content().split()) or None
+        
+        return {
+            "url": base_url,
+            "title": title,
+            "description": description,
+            "headings": headings,
+            "canonical": canonical,
+            "hreflang": hreflang,
+            "links": links,
+        }
@@ -0,0 +1,195 @@
+"""Persistent per-site document frequencies for incremental TF-IDF."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from sklearn.utils import murmurhash3_32
+
+from seo_agent.tools.hf.settings import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+# IDF store settings
+IDF_STORE_ENABLED = env_bool("IDF_STORE_ENABLED", True)
+IDF_STORE_DIR = os.getenv("IDF_STORE_DIR", str(Path.home() / ".cache" / "seo-agent" / "idf"))
+IDF_HASH_FEATURES = env_int("IDF_HASH_FEATURES", 2 ** 20)
+
+# DF arrays kept in memory, least recently used dropped first (4 MB each at the default feature count)
+MAX_LOADED_SITES = 8
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sites (
+    site TEXT PRIMARY KEY,
+    scheme TEXT NOT NULL,
+    n_documents INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    site TEXT NOT NULL,
+    url TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    features BLOB NOT NULL,
+    PRIMARY KEY (site, url)
+);
+"""
+
+# (url, content hash, unique hashed feature ids of the page)
+PageFeatures = Tuple[str, str, np.ndarray]
+
+
+def hash_terms(terms: Iterable[str], n_features: int = IDF_HASH_FEATURES) -> np.ndarray:
+    """Map terms into the shared hashed feature space."""
+    return np.fromiter(
+        (murmurhash3_32(term, seed=0, positive=True) % n_features for term in terms),
+        dtype=np.int64,
+    )
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class IdfStore:
+    """Document frequencies of hashed n-grams per site, updated page by page.
+
+    Each site keeps a dense DF array (``<site hash>.npy``) plus, in SQLite,
+    the feature set and content hash of every page counted so far. Re-counting
+    a site only touches new or changed pages: a changed page's old features
+    are subtracted before its new ones are added. ``scheme`` identifies the
+    analyzer (n-gram range, stopwords, ...); a site counted with a different
+    scheme is reset.
+    """
+
+    def __init__(self, directory: str | Path = IDF_STORE_DIR, n_features: int = IDF_HASH_FEATURES):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.n_features = n_features
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "pages.sqlite3", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._df: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    def hash_terms(self, terms: Iterable[str]) -> np.ndarray:
+        return hash_terms(terms, self.n_features)
+
+    def _df_path(self, site: str) -> Path:
+        return self.directory / f"{hashlib.sha1(site.encode('utf-8')).hexdigest()}.npy"
+
+    def _load_df(self, site: str) -> np.ndarray:
+        df = self._df.get(site)
+        if df is not None:
+            self._df.move_to_end(site)
+            return df
+        path = self._df_path(site)
+        df = np.load(path) if path.exists() else np.zeros(self.n_features, dtype=np.int32)
+        if df.shape != (self.n_features,):
+            logger.warning("IDF store for %s has %s features, resetting", site, df.shape[0])
+            df = np.zeros(self.n_features, dtype=np.int32)
+        self._keep_df(site, df)
+        return df
+
+    def _keep_df(self, site: str, df: np.ndarray) -> None:
+        self._df[site] = df
+        self._df.move_to_end(site)
+        while len(self._df) > MAX_LOADED_SITES:
+            self._df.popitem(last=False)
+
+    def _reset_site(self, site: str, scheme: str) -> None:
+        self._db.execute("DELETE FROM pages WHERE site = ?", (site,))
+        self._db.execute(
+            "INSERT OR REPLACE INTO sites (site, scheme, n_documents) VALUES (?, ?, 0)",
+            (site, scheme),
+        )
+        self._keep_df(site, np.zeros(self.n_features, dtype=np.int32))
+
+    def update(self, site: str, scheme: str, pages: Iterable[PageFeatures]) -> int:
+        """Count new and changed pages into the site's document frequencies.
+
+        Returns:
+            Number of pages that were added or re-counted.
+        """
+        with self._lock:
+            row = self._db.execute("SELECT scheme, n_documents FROM sites WHERE site = ?", (site,)).fetchone()
+            if row is None or row[0] != scheme:
+                self._reset_site(site, scheme)
+                n_documents = 0
+            else:
+                n_documents = row[1]
+            df = self._load_df(site)
+
+            changed = 0
+            for url, page_hash, features in pages:
+                previous = self._db.execute(
+                    "SELECT content_hash, features FROM pages WHERE site = ? AND url = ?",
+                    (site, url),
+                ).fetchone()
+                if previous is not None and previous[0] == page_hash:
+                    continue
+
+                features = np.unique(features).astype(np.int32)
+                if previous is None:
+                    n_documents += 1
+                else:
+                    df[np.frombuffer(previous[1], dtype=np.int32)] -= 1
+                df[features] += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO pages (site, url, content_hash, features) VALUES (?, ?, ?, ?)",
+                    (site, url, page_hash, features.tobytes()),
+                )
+                changed += 1
+
+            if changed:
+                path = self._df_path(site)
+                tmp_path = path.with_suffix(".tmp.npy")
+                np.save(tmp_path, df)
+                tmp_path.replace(path)
+            self._db.execute("UPDATE sites SET n_documents = ? WHERE site = ?", (n_documents, site))
+            self._db.commit()
+
+        logger.info("IDF store for %s: %s pages counted, %s documents in corpus", site, changed, n_documents)
+        return changed
+
+    def document_frequency(self, site: str, features: np.ndarray) -> Tuple[int, np.ndarray]:
+        """Return the site's document count and DF of the given features."""
+        with self._lock:
+            row = self._db.execute("SELECT n_documents FROM sites WHERE site = ?", (site,)).fetchone()
+            if row is None:
+                return 0, np.zeros(len(features), dtype=np.int32)
+            return row[0], self._load_df(site)[features]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# Global IDF store instance
+_idf_store: Optional[IdfStore] = None
+
+
+def get_idf_store() -> IdfStore:
+    """
+    Get the process-wide IDF store.
+
+    Returns:
+        Shared IdfStore instance.
+    """
+    global _idf_store
+
+    if _idf_store is None:
+        _idf_store = IdfStore()
+
+    return _idf_store
+
+
+def close_idf_store() -> None:
+    """Close the shared IDF store."""
+    global _idf_store
+
+    if _idf_store is not None:
+        _idf_store.close()
+        _idf_store = None
@@ -0,0 +1,184 @@
+"""Dedicated inference thread that micro-batches embedding requests."""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Deque, List, Optional, Sequence
+
+import numpy as np
+
+from seo_agent.tools.hf.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+# Texts merged into one encode call from concurrent requests
+INFERENCE_MAX_BATCH = env_int("INFERENCE_MAX_BATCH", 256)
+# How long the first request of a batch waits for others to join it
+INFERENCE_MAX_WAIT_MS = env_int("INFERENCE_MAX_WAIT_MS", 5)
+# Batch size sentence-transformers uses inside one encode call
+INFERENCE_ENCODE_BATCH_SIZE = env_int("INFERENCE_ENCODE_BATCH_SIZE", 64)
+
+
+@dataclass
+class _Request:
+    model: Any
+    texts: List[str]
+    normalize: bool
+    future: Future = field(default_factory=Future)
+
+    def joins(self, other: "_Request") -> bool:
+        return self.model is other.model and self.normalize == other.normalize
+
+
+class InferenceExecutor:
+    """Runs ``model.encode`` on one background thread fed by a request queue.
+
+    Requests for the same model (and normalization) that arrive within
+    ``max_wait_ms`` of each other are concatenated into one ``encode`` call
+    of up to ``max_batch`` texts, and each caller gets back its own rows.
+    A request larger than ``max_batch`` is encoded on its own. Encoding off
+    the event loop keeps other requests responsive; PyTorch releases the
+    GIL while it computes, so a thread is enough and models loaded in the
+    process-wide registry are shared as they are.
+    """
+
+    def __init__(
+        self,
+        max_batch: int = INFERENCE_MAX_BATCH,
+        max_wait_ms: int = INFERENCE_MAX_WAIT_MS,
+        encode_batch_size: int = INFERENCE_ENCODE_BATCH_SIZE,
+    ):
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.encode_batch_size = encode_batch_size
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        # Requests taken from the queue that belong to a later batch
+        self._deferred: Deque[_Request] = deque()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, model: Any, texts: Sequence[str], normalize: bool = False) -> Future:
+        """Queue ``texts`` for encoding; the future resolves to a float32 matrix."""
+        request = _Request(model, list(texts), normalize)
+        if not request.texts:
+            request.future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return request.future
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="inference", daemon=True)
+                self._thread.start()
+            self._queue.put(request)
+        return request.future
+
+    def encode(self, model: Any, texts: Sequence[str], normalize: bool = False) -> np.ndarray:
+        """Encode ``texts``, blocking the calling thread until done."""
+        return self.submit(model, texts, normalize).result()
+
+    async def aencode(self, model: Any, texts: Sequence[str], normalize: bool = False) -> np.ndarray:
+        """Encode ``texts`` without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(model, texts, normalize))
+
+    def _next(self, timeout: Optional[float] = None) -> Optional[_Request]:
+        if self._deferred:
+            return self._deferred.popleft()
+        return self._queue.get(timeout=timeout)
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        """``first`` plus requests for the same model queued within ``max_wait``."""
+        batch = [first]
+        n_texts = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        skipped: List[_Request] = []
+        while n_texts < self.max_batch:
+            # Requests already queued still join after the wait is over
+            try:
+                request = self._next(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if request is None:
+                # Shut down once the requests already taken are served
+                self._queue.put(None)
+                break
+            if not request.joins(first):
+                skipped.append(request)
+                continue
+            if n_texts + len(request.texts) > self.max_batch:
+                skipped.append(request)
+                break
+            batch.append(request)
+            n_texts += len(request.texts)
+        self._deferred.extendleft(reversed(skipped))
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            first = self._next()
+            if first is None:
+                return
+            batch = self._collect(first)
+            batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            texts = [text for request in batch for text in request.texts]
+            try:
+                vectors = np.asarray(
+                    first.model.encode(
+                        texts,
+                        batch_size=self.encode_batch_size,
+                        convert_to_numpy=True,
+                        normalize_embeddings=first.normalize,
+                    ),
+                    dtype=np.float32,
+                )
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+            if len(batch) > 1:
+                logger.debug("Encoded %s texts from %s requests in one batch", len(texts), len(batch))
+            start = 0
+            for request in batch:
+                request.future.set_result(vectors[start:start + len(request.texts)])
+                start += len(request.texts)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                self._queue.put(None)
+                self._thread.join()
+                self._thread = None
+                self._queue = queue.Queue()
+                self._deferred.clear()
+
+
+# Global inference executor instance
+_inference_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor() -> InferenceExecutor:
+    """
+    Get the process-wide inference executor.
+
+    Returns:
+        Shared InferenceExecutor instance.
+    """
+    global _inference_executor
+
+    if _inference_executor is None:
+        _inference_executor = InferenceExecutor()
+
+    return _inference_executor
+
+
+def close_inference_executor() -> None:
+    """Stop the shared inference thread."""
+    global _inference_executor
+
+    if _inference_executor is not None:
+        _inference_executor.close()
+        _inference_executor = None
@@ -0,0 +1,123 @@
+"""Compiled multi-phrase matcher for keyword intent detection."""
+
+import hashlib
+import logging
+import re
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from seo_agent.models import IntentType
+
+logger = logging.getLogger(__name__)
+
+# Checked in this order; the first intent with a matching phrase wins
+INTENT_PRIORITY = (
+    IntentType.TRANSACTIONAL,
+    IntentType.COMMERCIAL,
+    IntentType.NAVIGATIONAL,
+    IntentType.INFORMATIONAL,
+)
+
+# Compiled matchers kept per website (None = global phrases only)
+MAX_CACHED_MATCHERS = 256
+
+
+def _trie_pattern(phrases: Iterable[str]) -> str:
+    """Build a regex alternation shaped as a character trie.
+
+    Shared prefixes are factored out, so the regex engine walks each
+    keyword position once per trie branch instead of trying every phrase.
+    """
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Phrase may end here or continue into a longer phrase
+            body = ("(?:" + body + ")" if len(branches) == 1 else body) + "?"
+        return body
+
+    return emit(trie)
+
+
+def phrases_fingerprint(phrases: Dict[str, List[str]]) -> str:
+    """Stable digest of an intent -> phrases mapping."""
+    digest = hashlib.sha1()
+    for intent in sorted(phrases):
+        digest.update(intent.encode("utf-8") + b"\0")
+        for phrase in sorted({p.lower().strip() for p in phrases[intent]}):
+            digest.update(phrase.encode("utf-8") + b"\1")
+    return digest.hexdigest()
+
+
+class IntentMatcher:
+    """Detect keyword intent with one compiled pattern per intent.
+
+    A keyword matches an intent when any of its phrases occurs as a whole
+    word sequence, exactly like ``re.search(r"\\b" + re.escape(phrase) + r"\\b")``
+    per phrase, and intents are tried in ``INTENT_PRIORITY`` order.
+    """
+
+    def __init__(self, phrases: Dict[str, List[str]]):
+        self.fingerprint = phrases_fingerprint(phrases)
+        self._patterns: list[tuple[IntentType, re.Pattern]] = []
+        for intent in INTENT_PRIORITY:
+            intent_phrases = {p.lower().strip() for p in phrases.get(intent.value, [])}
+            intent_phrases.discard("")
+            if intent_phrases:
+                pattern = re.compile(r"\b" + _trie_pattern(intent_phrases) + r"\b")
+                self._patterns.append((intent, pattern))
+
+    def detect(self, keyword: str) -> IntentType:
+        """Return the highest-priority matching intent (informational by default)."""
+        keyword_lower = keyword.lower().strip()
+        for intent, pattern in self._patterns:
+            if pattern.search(keyword_lower):
+                return intent
+        return IntentType.INFORMATIONAL
+
+    def detect_many(self, keywords: List[str]) -> List[IntentType]:
+        """Detect intents for a batch of keywords."""
+        return [self.detect(keyword) for keyword in keywords]
+
+
+_matchers: Dict[Optional[int], IntentMatcher] = {}
+_matchers_lock = threading.Lock()
+
+
+def get_intent_matcher(phrases: Dict[str, List[str]], website_id: Optional[int] = None) -> IntentMatcher:
+    """
+    Get the compiled matcher for a website's phrase set.
+
+    The matcher is rebuilt only when the phrases differ from the ones it was
+    compiled from.
+
+    Args:
+        phrases: Intent -> phrases mapping (config defaults plus extras)
+        website_id: Website the phrases belong to; None for global phrases
+
+    Returns:
+        Compiled IntentMatcher.
+    """
+    fingerprint = phrases_fingerprint(phrases)
+    with _matchers_lock:
+        matcher = _matchers.get(website_id)
+        if matcher is not None and matcher.fingerprint == fingerprint:
+            return matcher
+
+    matcher = IntentMatcher(phrases)
+    logger.debug("Compiled intent matcher for website %s", website_id)
+    with _matchers_lock:
+        if website_id not in _matchers and len(_matchers) >= MAX_CACHED_MATCHERS:
+            _matchers.pop(next(iter(_matchers)))
+        _matchers[website_id] = matcher
+    return matcher
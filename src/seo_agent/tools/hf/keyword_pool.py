@@ -0,0 +1,137 @@
+"""Process pool that shards n-gram counting for large crawls."""
+
+import logging
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+
+from seo_agent.tools.hf.analyzers import vectorizer_options
+from seo_agent.tools.hf.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+# Counting worker processes; 0 or 1 counts in-process
+KEYWORD_WORKERS = env_int("KEYWORD_WORKERS", min(4, os.cpu_count() or 1))
+
+# Smaller corpora are counted in-process, where pool overhead would dominate
+KEYWORD_SHARD_MIN_DOCS = env_int("KEYWORD_SHARD_MIN_DOCS", 500)
+
+# (sorted terms, CSR data, indices, indptr) of one shard's term counts
+Shard = Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]
+
+
+def count_shard(texts: Sequence[str], language: Optional[str], ngram_range: tuple) -> Shard:
+    """Term counts of a run of consecutive documents.
+
+    Rows follow ``texts`` and columns the shard's own sorted vocabulary.
+    """
+    vectorizer = CountVectorizer(dtype=np.float64, **vectorizer_options(language, ngram_range))
+    try:
+        counts = vectorizer.fit_transform(texts).tocsr()
+    except ValueError:
+        # Nothing but stopwords in this shard
+        return [], np.zeros(0), np.zeros(0, dtype=np.int32), np.zeros(len(texts) + 1, dtype=np.int32)
+    counts.sort_indices()
+    return vectorizer.get_feature_names_out().tolist(), counts.data, counts.indices, counts.indptr
+
+
+def merge_shards(shards: Sequence[Shard]) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """Stack shard counts in order over the union of their vocabularies.
+
+    The union is sorted like a single vectorizer's vocabulary, and each
+    shard's (sorted) columns map onto it monotonically, so the result is the
+    same matrix one ``CountVectorizer`` would build over all documents.
+    """
+    vocabulary = sorted(set().union(*(terms for terms, *_ in shards)))
+    if not vocabulary:
+        raise ValueError("empty vocabulary; perhaps the documents only contain stop words")
+    position = {term: i for i, term in enumerate(vocabulary)}
+
+    blocks = []
+    for terms, data, indices, indptr in shards:
+        columns = np.fromiter((position[term] for term in terms), dtype=np.int64, count=len(terms))
+        blocks.append(sparse.csr_matrix(
+            (data, columns[indices], indptr), shape=(len(indptr) - 1, len(vocabulary))
+        ))
+    return sparse.vstack(blocks, format="csr"), np.array(vocabulary, dtype=object)
+
+
+class KeywordPool:
+    """Splits term counting of large corpora across worker processes.
+
+    Documents are cut into contiguous shards, one per worker, and counted in
+    parallel; the shard matrices are merged in input order, so the counts do
+    not depend on the number of workers. Workers are spawned rather than
+    forked, like the parser pool.
+    """
+
+    def __init__(self, workers: int = KEYWORD_WORKERS, min_docs: int = KEYWORD_SHARD_MIN_DOCS):
+        self.workers = max(0, workers)
+        self.min_docs = min_docs
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("Started keyword counting pool with %s workers", self.workers)
+        return self._executor
+
+    def count(
+        self,
+        texts: Sequence[str],
+        language: Optional[str],
+        ngram_range: tuple,
+    ) -> Tuple[sparse.csr_matrix, np.ndarray]:
+        """Term counts of ``texts`` and the sorted feature names."""
+        if self.workers <= 1 or len(texts) < max(2, self.min_docs):
+            return merge_shards([count_shard(texts, language, ngram_range)])
+
+        size = math.ceil(len(texts) / self.workers)
+        chunks = [texts[start:start + size] for start in range(0, len(texts), size)]
+        shards = list(self._get_executor().map(
+            count_shard, chunks, repeat(language), repeat(ngram_range)
+        ))
+        return merge_shards(shards)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+# Global keyword pool instance
+_keyword_pool: Optional[KeywordPool] = None
+
+
+def get_keyword_pool() -> KeywordPool:
+    """
+    Get the process-wide keyword counting pool.
+
+    Returns:
+        Shared KeywordPool instance.
+    """
+    global _keyword_pool
+
+    if _keyword_pool is None:
+        _keyword_pool = KeywordPool()
+
+    return _keyword_pool
+
+
+def close_keyword_pool() -> None:
+    """Shut down the shared keyword counting processes."""
+    global _keyword_pool
+
+    if _keyword_pool is not None:
+        _keyword_pool.close()
+        _keyword_pool = None
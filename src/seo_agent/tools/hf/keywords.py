@@ -1,11 +1,29 @@
 """Keyword extraction tool."""
 
+import asyncio
 import logging
-from typing import List
-from sklearn.feature_extraction.text import TfidfVectorizer
-import re
+import queue
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer
+from sklearn.preprocessing import normalize
 
 from seo_agent.models import IntentType, KeywordCandidate, ParsedDocument
+from seo_agent.tools.hf.analyzers import (
+    RussianAnalyzer,
+    analyzer_scheme,
+    is_russian,
+    surface_forms,
+    vectorizer_options,
+)
+from seo_agent.tools.hf.idf_store import IdfStore, content_hash
+from seo_agent.tools.hf.intent_matcher import get_intent_matcher
+from seo_agent.tools.hf.keyword_pool import KeywordPool, count_shard, merge_shards
+from seo_agent.tools.hf.ngram_sketch import STREAM_HEAVY_HITTERS, CountMinSketch, SpaceSaving, text_chunks
+from seo_agent.tools.hf.reranker import KeywordReranker
+from seo_agent.tools.hf.settings import env_int
 from seo_agent.tools.hf.stopwords import is_stopword
 
 logger = logging.getLogger(__name__)
@@ -16,6 +34,47 @@ from seo_agent.tools.hf.config import (
     TRANSACTIONAL_PHRASES,
 )
 
+# Corpora with more text than this (in characters) are extracted in streaming mode
+STREAMING_MIN_CHARS = env_int("KEYWORD_STREAMING_MIN_CHARS", 50_000_000)
+# Crawls allowed this many pages feed streaming extraction as pages are parsed
+STREAMING_MIN_PAGES = env_int("KEYWORD_STREAMING_MIN_PAGES", 10_000)
+# Longest piece of a document handed to the analyzer at once in streaming mode
+STREAM_CHUNK_CHARS = env_int("STREAM_CHUNK_CHARS", 1_000_000)
+
+
+class DocumentQueue:
+    """Bounded hand-off of parsed pages from a crawl to a streaming extraction thread.
+
+    The crawl awaits :meth:`put` for each page and :meth:`close` at the end;
+    the extraction thread iterates the queue. A consumer that fails calls
+    :meth:`drain`, so a crawl blocked on a full queue is released.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.finished = False
+
+    async def put(self, document: Optional[ParsedDocument]) -> None:
+        """Queue a page, waiting off the event loop while the queue is full."""
+        try:
+            self._queue.put_nowait(document)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, document)
+
+    async def close(self) -> None:
+        await self.put(None)
+
+    def __iter__(self) -> Iterator[ParsedDocument]:
+        while (document := self._queue.get()) is not None:
+            yield document
+        self.finished = True
+
+    def drain(self) -> None:
+        """Discard pages until the end of the stream, unless it was already read."""
+        if not self.finished:
+            for _ in self:
+                pass
+
 
 class KeywordExtractor:
     """Extract keywords from parsed documents."""
@@ -25,9 +84,16 @@ class KeywordExtractor:
         max_keywords: int = 50,
         ngram_range: tuple = (1, 3),
         extra_phrases: dict | None = None,
+        website_id: int | None = None,
+        idf_store: IdfStore | None = None,
+        language: str = "en",
+        keyword_pool: KeywordPool | None = None,
     ):
         self.max_keywords = max_keywords
         self.ngram_range = ngram_range
+        self.language = language
+        self.idf_store = idf_store
+        self.keyword_pool = keyword_pool
 
         # Build per-intent phrase lists: config defaults + any domain-specific extras.
         self._phrases: dict[str, list[str]] = {
@@ -44,13 +110,44 @@ class KeywordExtractor:
                 self._phrases[intent_key_norm] = existing + [
                     p for p in phrases if p.lower() not in existing_set
                 ]
+
+        # Compiled once per phrase set and shared across extractor instances
+        self._matcher = get_intent_matcher(self._phrases, website_id)
     
-    def extract(self, documents: List[ParsedDocument]) -> List[KeywordCandidate]:
-        """Extract keywords from multiple documents."""
+    def extract(
+        self,
+        documents: List[ParsedDocument],
+        site: str | None = None,
+        language: str | None = None,
+        reranker: KeywordReranker | None = None,
+    ) -> List[KeywordCandidate]:
+        """Extract keywords from multiple documents.
+        
+        ``language`` (default: the extractor's) picks the analyzer: Russian
+        content is lemmatized and filtered with Russian stopwords inside the
+        vectorizer. With an ``idf_store`` and a ``site``, the documents are
+        counted into the site's persistent corpus and IDF comes from that
+        corpus instead of from this run's documents alone. With a
+        ``keyword_pool``, term counting of large runs is sharded across
+        worker processes; the result is the same as counting serially.
+        With a ``reranker``, all candidates that survive filtering are
+        reranked by embedding relevance to their pages and the best
+        ``max_keywords`` are kept. Corpora larger than ``STREAMING_MIN_CHARS``
+        go through :meth:`extract_stream` and are neither counted into the
+        site corpus nor reranked.
+        """
+        language = language or self.language
         if not documents:
             return []
         
-        texts = [doc.main_text for doc in documents if doc.main_text]
+        total_chars = sum(len(doc.main_text or "") for doc in documents)
+        if STREAMING_MIN_CHARS and total_chars > STREAMING_MIN_CHARS:
+            logger.info(f"Corpus of {total_chars} characters, extracting keywords in streaming mode")
+            return self.extract_stream(documents, language=language)
+        
+        # Matrix rows follow the documents that have text
+        text_documents = [doc for doc in documents if doc.main_text]
+        texts = [doc.main_text for doc in text_documents]
         if not texts:
             return []
         
@@ -60,102 +157,284 @@ class KeywordExtractor:
             num_docs = len(texts)
             max_df = 1.0 if num_docs < 5 else 0.8
             
-            # Create vectorizer with appropriate parameters
-            vectorizer = TfidfVectorizer(
-                ngram_range=self.ngram_range,
-                max_features=self.max_keywords * 2,
-                stop_words="english",
-                lowercase=True,
-                min_df=1,
-                max_df=max_df,
-            )
-            
-            # Compute TF-IDF
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            feature_names = vectorizer.get_feature_names_out()
+            if self.idf_store is not None and site:
+                tfidf_matrix, feature_names = self._site_tfidf(text_documents, texts, site, language)
+            else:
+                counts, feature_names = self._count(texts, language)
+                tfidf_matrix, feature_names = self._run_tfidf(counts, feature_names, max_df)
             
             # Get top keywords across all documents
             scores = tfidf_matrix.sum(axis=0).A1
+            
+            # Column-wise view: the nonzero rows of a column are the documents
+            # containing that n-gram, so frequency and sources need no text scan.
+            postings = tfidf_matrix.tocsc()
+            postings.sort_indices()
+            document_frequency = np.diff(postings.indptr)
             top_indices = scores.argsort()[-self.max_keywords * 3:][::-1]  # Get 3x more for filtering
+            # Lemma n-grams are shown as written in the documents containing them
+            display = surface_forms(
+                (texts[row] for row in np.unique(postings[:, top_indices].indices)),
+                (feature_names[idx] for idx in top_indices),
+                language,
+                self.ngram_range,
+            )
             
-            # Log all keywords before filtering
-            all_keywords_before = [feature_names[idx] for idx in top_indices]
-            logger.info(f"🔍 Found {len(all_keywords_before)} keywords before filtering:")
-            logger.info(f"   Keywords: {', '.join(all_keywords_before[:30])}...")
+            keywords = self._select(
+                (
+                    (
+                        feature_names[idx],
+                        float(scores[idx]),
+                        int(document_frequency[idx]),
+                        # Documents containing the n-gram, in input order
+                        [
+                            text_documents[row].url
+                            for row in postings.indices[postings.indptr[idx]:postings.indptr[idx + 1]]
+                        ],
+                    )
+                    for idx in top_indices
+                ),
+                limit=None if reranker is None else len(top_indices),
+                display=display,
+            )
+        except Exception as e:
+            print(f"Keyword extraction error: {e}")
+            return []
+        
+        if reranker is not None:
+            try:
+                keywords = reranker.rerank(keywords, text_documents, self.max_keywords)
+            except Exception as e:
+                # Embedding problems must not cost the TF-IDF keywords
+                logger.warning(f"Keyword reranking failed, keeping TF-IDF order: {e}")
+                keywords = keywords[:self.max_keywords]
+        return keywords
+
+    def extract_stream(
+        self,
+        documents: Iterable[ParsedDocument],
+        language: str | None = None,
+    ) -> List[KeywordCandidate]:
+        """Extract keywords from a stream of documents with bounded memory.
+
+        Documents are consumed one at a time and never kept. Document
+        frequencies go into a count-min sketch and per-document term weights
+        (term counts, L2-normalized per document) into a space-saving summary
+        of the heaviest n-grams; both have a fixed size, so memory does not
+        grow with the corpus. Scores are the summed weights times the smooth
+        IDF of the sketched document frequencies. They approximate the
+        in-memory TF-IDF scores, which normalize after IDF weighting. At most
+        ``STREAM_MAX_SOURCE_URLS`` source URLs are kept per keyword, and long
+        texts are analyzed in ``STREAM_CHUNK_CHARS`` pieces, so n-grams
+        spanning a chunk boundary are not counted. Russian n-grams are
+        counted by lemma; their written forms go into a second summary of
+        the same size, and the heaviest form of each keyword is shown.
+        """
+        language = language or self.language
+        analyzer = CountVectorizer(**vectorizer_options(language, self.ngram_range)).build_analyzer()
+        sketch = CountMinSketch()
+        heavy_hitters = SpaceSaving(capacity=max(STREAM_HEAVY_HITTERS, self.max_keywords * 3))
+        surface_analyzer = RussianAnalyzer(self.ngram_range) if is_russian(language) else None
+        # "<lemma n-gram>\t<written n-gram>" -> occurrences
+        surfaces = SpaceSaving(capacity=heavy_hitters.capacity) if surface_analyzer else None
+
+        n_documents = 0
+        for doc in documents:
+            if not doc.main_text:
+                continue
+            n_documents += 1
+            counts: Counter = Counter()
+            written: Counter = Counter()
+            for chunk in text_chunks(doc.main_text, STREAM_CHUNK_CHARS):
+                if surface_analyzer is None:
+                    counts.update(analyzer(chunk))
+                    continue
+                pairs = surface_analyzer.surface_ngrams(chunk)
+                counts.update(key for key, _ in pairs)
+                written.update(f"{key}\t{surface}" for key, surface in pairs)
+            if not counts:
+                continue
+            for pair, occurrences in written.items():
+                surfaces.add(pair, float(occurrences))
+
+            terms = list(counts)
+            weights = np.fromiter(counts.values(), dtype=np.float64, count=len(terms))
+            weights /= np.linalg.norm(weights)
+            sketch.add(terms)
+            for term, weight in zip(terms, weights):
+                heavy_hitters.add(term, float(weight), doc.url)
+
+        if not n_documents or not len(heavy_hitters):
+            return []
+
+        terms, weights, _, urls = zip(*heavy_hitters.items())
+        df = sketch.estimate(terms)
+        scores = np.asarray(weights) * (np.log((1 + n_documents) / (1 + df)) + 1)
+        # Same max_df rule as the in-memory vectorizer
+        if n_documents >= 5:
+            scores[df > 0.8 * n_documents] = -np.inf
+        top_indices = [idx for idx in scores.argsort()[-self.max_keywords * 3:][::-1] if np.isfinite(scores[idx])]
+        logger.info(
+            f"🌊 Streamed {n_documents} documents; sketch {sketch.nbytes // 2 ** 20} MB, "
+            f"{len(heavy_hitters)} n-grams monitored"
+        )
+
+        display: dict[str, str] = {}
+        if surfaces is not None:
+            heaviest: dict[str, float] = {}
+            for pair, weight, _, _ in surfaces.items():
+                key, surface = pair.split("\t", 1)
+                if weight > heaviest.get(key, 0.0):
+                    heaviest[key] = weight
+                    display[key] = surface
+
+        return self._select(
+            ((terms[idx], float(scores[idx]), int(df[idx]), list(urls[idx])) for idx in top_indices),
+            display=display,
+        )
+
+    def _select(
+        self,
+        ranked: Iterable[tuple[str, float, int, List[str]]],
+        limit: int | None = None,
+        display: dict[str, str] | None = None,
+    ) -> List[KeywordCandidate]:
+        """Turn ranked ``(keyword, score, frequency, source URLs)`` into candidates.
+
+        Drops stopwords and too-short terms, detects intent and stops at
+        ``limit`` (default: ``max_keywords``). Keywords found in ``display``
+        (lemma n-grams) are emitted in their written form.
+        """
+        display = display or {}
+        limit = limit or self.max_keywords
+        ranked = list(ranked)
+        
+        # Log all keywords before filtering
+        all_keywords_before = [keyword for keyword, *_ in ranked]
+        logger.info(f"🔍 Found {len(all_keywords_before)} keywords before filtering:")
+        logger.info(f"   Keywords: {', '.join(all_keywords_before[:30])}...")
+        
+        keywords = []
+        filtered_out = []
+        
+        for keyword, score, frequency, source_urls in ranked:
+            # Skip stop words (single words only)
+            words = keyword.split()
+            if len(words) == 1 and is_stopword(keyword):
+                filtered_out.append(keyword)
+                continue
             
-            keywords = []
-            filtered_out = []
+            # Skip if too short
+            if len(keyword) < 2:
+                filtered_out.append(keyword)
+                continue
             
-            for idx in top_indices:
-                keyword = feature_names[idx]
-                score = float(scores[idx])
-                
-                # Skip stop words (single words only)
-                words = keyword.split()
-                if len(words) == 1 and is_stopword(keyword):
-                    filtered_out.append(keyword)
-                    continue
-                
-                # Skip if too short
-                if len(keyword) < 2:
-                    filtered_out.append(keyword)
-                    continue
-                
-                # Count frequency
-                freq = sum(1 for doc in documents if keyword.lower() in doc.main_text.lower())
-                
-                # Determine intent (simple heuristic)
-                intent = self._detect_intent(keyword)
-                
-                keywords.append(KeywordCandidate(
-                    keyword=keyword,
-                    frequency=freq,
-                    tf_idf_score=score,
-                    intent=intent,
-                    source_urls=[doc.url for doc in documents if keyword.lower() in doc.main_text.lower()]
-                ))
-                
-                # Stop when we have enough keywords
-                if len(keywords) >= self.max_keywords:
-                    break
+            # Determine intent (simple heuristic)
+            intent = self._detect_intent(keyword)
             
-            # Log filtering results
-            logger.info(f"✅ Kept {len(keywords)} keywords after filtering")
-            logger.info(f"❌ Filtered out {len(filtered_out)} stop words/short words: {', '.join(filtered_out[:20])}...")
+            keywords.append(KeywordCandidate(
+                keyword=display.get(keyword, keyword),
+                frequency=frequency,
+                tf_idf_score=score,
+                intent=intent,
+                source_urls=source_urls
+            ))
             
-            return keywords
-        except Exception as e:
-            print(f"Keyword extraction error: {e}")
-            return []
+            # Stop when we have enough keywords
+            if len(keywords) >= limit:
+                break
+        
+        # Log filtering results
+        logger.info(f"✅ Kept {len(keywords)} keywords after filtering")
+        logger.info(f"❌ Filtered out {len(filtered_out)} stop words/short words: {', '.join(filtered_out[:20])}...")
+        
+        return keywords
     
-    def _detect_intent(self, keyword: str) -> IntentType:
-        """Intent detection heuristic based on configurable rules.
+    def _count(self, texts: List[str], language: str) -> tuple[sparse.csr_matrix, np.ndarray]:
+        """Term counts and sorted feature names, sharded across the pool if there is one."""
+        if self.keyword_pool is not None:
+            return self.keyword_pool.count(texts, language, self.ngram_range)
+        return merge_shards([count_shard(texts, language, self.ngram_range)])
 
-        Supported intents: informational, navigational, commercial, transactional.
-        Merges built-in config phrases with any domain-specific extras passed at init.
+    def _run_tfidf(
+        self,
+        counts: sparse.csr_matrix,
+        feature_names: np.ndarray,
+        max_df: float,
+    ) -> tuple[sparse.csr_matrix, np.ndarray]:
+        """TF-IDF of this run's documents, as ``TfidfVectorizer`` would compute it.
+
+        Applies the vectorizer's ``max_df`` and ``max_features`` pruning to
+        the merged counts (same order of operations, so the same terms win
+        ties) before IDF weighting and L2 row normalization.
         """
-        keyword_lower = keyword.lower().strip()
+        n_documents = counts.shape[0]
+        df = np.bincount(counts.indices, minlength=counts.shape[1])
+        keep = df <= max_df * n_documents
+        limit = self.max_keywords * 2
+        if keep.sum() > limit:
+            term_totals = np.asarray(counts.sum(axis=0)).ravel()
+            top = (-term_totals[keep]).argsort()[:limit]
+            mask = np.zeros(len(keep), dtype=bool)
+            mask[np.flatnonzero(keep)[top]] = True
+            keep = mask
+        columns = np.flatnonzero(keep)
+        if not len(columns):
+            raise ValueError("After pruning, no terms remain. Try a lower min_df or a higher max_df.")
+        return TfidfTransformer().fit_transform(counts[:, columns]), feature_names[columns]
 
-        def matches_any(phrases: List[str]) -> bool:
-            return any(
-                re.search(r"\b" + re.escape(phrase) + r"\b", keyword_lower)
-                for phrase in phrases
-            )
+    def _site_tfidf(
+        self,
+        text_documents: List[ParsedDocument],
+        texts: List[str],
+        site: str,
+        language: str,
+    ) -> tuple[sparse.csr_matrix, np.ndarray]:
+        """TF-IDF of this run's documents weighted by the site's persistent DF.
+
+        Term counts are computed for the current documents only. Their hashed
+        n-gram sets update the site corpus (unchanged pages are skipped) and
+        IDF is then read back for the run's vocabulary, using the same smooth
+        IDF and L2 row normalization as ``TfidfVectorizer``.
+        """
+        counts, feature_names = self._count(texts, language)
+        hashed = self.idf_store.hash_terms(feature_names)
+
+        self.idf_store.update(
+            site,
+            analyzer_scheme(language, self.ngram_range),
+            (
+                (doc.url, content_hash(doc.main_text), hashed[counts.indices[counts.indptr[i]:counts.indptr[i + 1]]])
+                for i, doc in enumerate(text_documents)
+            ),
+        )
+        n_documents, df = self.idf_store.document_frequency(site, hashed)
 
-        # Transactional intent: ready to act
-        if matches_any(self._phrases.get("transactional", [])):
-            return IntentType.TRANSACTIONAL
+        # Same vocabulary limits as the per-run vectorizer, judged on the site corpus
+        keep = np.ones(len(feature_names), dtype=bool)
+        if n_documents >= 5:
+            keep &= df <= 0.8 * n_documents
+        term_totals = np.asarray(counts.sum(axis=0)).ravel()
+        candidates = np.flatnonzero(keep)
+        limit = self.max_keywords * 2
+        if len(candidates) > limit:
+            # Highest corpus term counts; ties broken by term order like sklearn
+            order = np.lexsort((candidates, -term_totals[candidates]))
+            candidates = np.sort(candidates[order[:limit]])
 
-        # Commercial investigation: compare and evaluate
-        if matches_any(self._phrases.get("commercial", [])):
-            return IntentType.COMMERCIAL
+        idf = np.log((1 + n_documents) / (1 + df[candidates])) + 1
+        tfidf = normalize(counts[:, candidates].multiply(idf).tocsr(), norm="l2")
+        return tfidf, feature_names[candidates]
 
-        # Navigational: find a specific site/page
-        if matches_any(self._phrases.get("navigational", [])):
-            return IntentType.NAVIGATIONAL
+    def detect_intents(self, keywords: List[str]) -> List[IntentType]:
+        """Detect intents for a batch of keywords with the compiled matcher."""
+        return self._matcher.detect_many(keywords)
 
-        # Informational: learn or understand
-        if matches_any(self._phrases.get("informational", [])):
-            return IntentType.INFORMATIONAL
+    def _detect_intent(self, keyword: str) -> IntentType:
+        """Intent detection heuristic based on configurable rules.
 
-        return IntentType.INFORMATIONAL
+        Supported intents, by priority: transactional, commercial, navigational,
+        informational (also the default).
+        Merges built-in config phrases with any domain-specific extras passed at init.
+        """
+        return self._matcher.detect(keyword)
@@ -0,0 +1,146 @@
+"""Process-wide registry of loaded SentenceTransformer models."""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from seo_agent.tools.hf.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+# Device for embedding models (cpu, cuda, mps); unset lets sentence-transformers pick
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or None
+# Weight precision: float32, float16 or bfloat16
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "float32")
+# Memory budget for loaded model weights; least recently used models are unloaded
+MODEL_CACHE_MB = env_int("MODEL_CACHE_MB", 2048)
+# Comma-separated models loaded at API startup (default: the default HF model; empty disables)
+EMBEDDING_PRELOAD_MODELS = [
+    name.strip()
+    for name in os.getenv("EMBEDDING_PRELOAD_MODELS", os.getenv("HF_EMBEDDING_MODEL", "all-MiniLM-L6-v2")).split(",")
+    if name.strip()
+]
+
+# (model name, device, precision)
+ModelKey = Tuple[str, str, str]
+
+
+def model_key(model_name: str, device: Optional[str] = None, precision: Optional[str] = None) -> ModelKey:
+    """Registry key of a model, with the configured device and precision filled in."""
+    return (model_name, device or EMBEDDING_DEVICE or "auto", precision or EMBEDDING_PRECISION)
+
+
+def load_sentence_transformer(model_name: str, device: Optional[str], precision: str):
+    """Load a SentenceTransformer with the requested device and weight precision."""
+    from sentence_transformers import SentenceTransformer
+
+    hf_token = os.getenv("HF_TOKEN")
+    model = SentenceTransformer(model_name, device=device, token=hf_token if hf_token else None)
+    if precision == "float16":
+        model = model.half()
+    elif precision == "bfloat16":
+        import torch
+        model = model.to(torch.bfloat16)
+    return model
+
+
+def model_nbytes(model: Any) -> int:
+    """Size of a model's parameters and buffers in bytes (0 if unknown)."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except AttributeError:
+        return 0
+    return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+
+
+class ModelRegistry:
+    """Loaded models keyed by (name, device, precision) under an LRU memory budget.
+
+    Each model is loaded once per process and shared by every caller;
+    concurrent requests for a model that is still loading wait for that load
+    instead of starting another. When the weights of all loaded models
+    exceed ``budget_mb``, the least recently used ones are dropped (the
+    most recent model always stays).
+    """
+
+    def __init__(
+        self,
+        budget_mb: int = MODEL_CACHE_MB,
+        loader: Callable[[str, Optional[str], str], Any] = load_sentence_transformer,
+    ):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self._loader = loader
+        self._models: "OrderedDict[ModelKey, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[ModelKey, threading.Lock] = {}
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(size for _, size in self._models.values())
+
+    def get(self, model_name: str, device: Optional[str] = None, precision: Optional[str] = None) -> Any:
+        key = model_key(model_name, device, precision)
+        device = device or EMBEDDING_DEVICE
+        precision = key[2]
+
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                return entry[0]
+            load_lock = self._loading.setdefault(key, threading.Lock())
+
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    self._models.move_to_end(key)
+                    return entry[0]
+
+            logger.info("Loading embedding model %s (device=%s, precision=%s)", *key)
+            model = self._loader(model_name, device, precision)
+            size = model_nbytes(model)
+
+            with self._lock:
+                self._models[key] = (model, size)
+                self._loading.pop(key, None)
+                while len(self._models) > 1 and self.nbytes > self.budget_bytes:
+                    evicted, _ = self._models.popitem(last=False)
+                    logger.info("Unloaded embedding model %s (device=%s, precision=%s)", *evicted)
+            return model
+
+    def preload(self, model_names: List[str]) -> None:
+        """Load models ahead of the first request; failures are logged, not raised."""
+        for model_name in model_names:
+            try:
+                self.get(model_name)
+            except Exception as e:
+                logger.warning("Failed to preload embedding model %s: %s", model_name, e)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+# Global model registry instance
+_model_registry: Optional[ModelRegistry] = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """
+    Get the process-wide model registry.
+
+    Returns:
+        Shared ModelRegistry instance.
+    """
+    global _model_registry
+
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+
+    return _model_registry
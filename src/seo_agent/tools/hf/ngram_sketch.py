@@ -0,0 +1,131 @@
+"""Bounded-memory n-gram statistics for streaming keyword extraction."""
+
+import heapq
+from typing import Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from seo_agent.tools.hf.settings import env_int
+
+# Count-min sketch of document frequencies (16 MB at the defaults)
+NGRAM_SKETCH_WIDTH = env_int("NGRAM_SKETCH_WIDTH", 2 ** 20)
+NGRAM_SKETCH_DEPTH = env_int("NGRAM_SKETCH_DEPTH", 4)
+
+# n-grams monitored by the space-saving summary and source URLs kept per n-gram
+STREAM_HEAVY_HITTERS = env_int("STREAM_HEAVY_HITTERS", 20_000)
+STREAM_MAX_SOURCE_URLS = env_int("STREAM_MAX_SOURCE_URLS", 50)
+
+# (term, accumulated weight, overestimation bound, source URLs)
+HeavyHitter = Tuple[str, float, float, List[str]]
+
+
+class CountMinSketch:
+    """Approximate counts in a fixed ``depth x width`` table.
+
+    Estimates never undercount; with ``n`` total increments they overcount
+    by at most ``e * n / width`` with probability ``1 - exp(-depth)``.
+    Terms are hashed with Python's ``hash``, so a sketch is only meaningful
+    within the process that filled it.
+    """
+
+    def __init__(self, width: int = NGRAM_SKETCH_WIDTH, depth: int = NGRAM_SKETCH_DEPTH, seed: int = 0):
+        bits = max(1, int(width - 1).bit_length())
+        self.width = 1 << bits
+        self.depth = max(1, depth)
+        self._shift = np.uint64(64 - bits)
+        rng = np.random.default_rng(seed)
+        # Odd multipliers for multiply-shift hashing, one per row
+        self._multipliers = rng.integers(1, 2 ** 63, size=self.depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._table = np.zeros((self.depth, self.width), dtype=np.uint32)
+
+    @property
+    def nbytes(self) -> int:
+        return self._table.nbytes
+
+    def _indexes(self, terms: Sequence[str]) -> np.ndarray:
+        hashes = np.fromiter((hash(term) for term in terms), dtype=np.int64, count=len(terms)).view(np.uint64)
+        return (self._multipliers[:, None] * hashes[None, :]) >> self._shift
+
+    def add(self, terms: Sequence[str]) -> None:
+        """Count each of ``terms`` once."""
+        if not terms:
+            return
+        for row, columns in enumerate(self._indexes(terms)):
+            np.add.at(self._table[row], columns, 1)
+
+    def estimate(self, terms: Sequence[str]) -> np.ndarray:
+        if not terms:
+            return np.zeros(0, dtype=np.int64)
+        columns = self._indexes(terms)
+        rows = np.arange(self.depth)[:, None]
+        return self._table[rows, columns].min(axis=0).astype(np.int64)
+
+
+class _Counter:
+    __slots__ = ("weight", "error", "urls")
+
+    def __init__(self, floor: float):
+        self.weight = floor
+        self.error = floor
+        self.urls: List[str] = []
+
+
+class SpaceSaving:
+    """Weighted space-saving summary of the heaviest terms.
+
+    At most ``capacity`` terms are monitored. A new term replaces the
+    lightest one and inherits its weight as an overestimation bound, so any
+    term heavier than ``total weight / capacity`` is guaranteed to be kept.
+    Up to ``max_sources`` source URLs are remembered per monitored term.
+    """
+
+    def __init__(self, capacity: int = STREAM_HEAVY_HITTERS, max_sources: int = STREAM_MAX_SOURCE_URLS):
+        self.capacity = max(1, capacity)
+        self.max_sources = max_sources
+        self._counters: dict[str, _Counter] = {}
+        # Lazy min-heap of (weight, term); entries whose weight is outdated are skipped
+        self._heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def add(self, term: str, weight: float, url: str | None = None) -> None:
+        counter = self._counters.get(term)
+        if counter is None:
+            floor = 0.0
+            if len(self._counters) >= self.capacity:
+                floor, evicted = self._pop_lightest()
+                del self._counters[evicted]
+            counter = self._counters[term] = _Counter(floor)
+        counter.weight += weight
+        if url is not None and len(counter.urls) < self.max_sources:
+            counter.urls.append(url)
+
+        heapq.heappush(self._heap, (counter.weight, term))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c.weight, t) for t, c in self._counters.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_lightest(self) -> Tuple[float, str]:
+        while True:
+            weight, term = heapq.heappop(self._heap)
+            counter = self._counters.get(term)
+            if counter is not None and counter.weight == weight:
+                return weight, term
+
+    def items(self) -> Iterator[HeavyHitter]:
+        for term, counter in self._counters.items():
+            yield term, counter.weight, counter.error, counter.urls
+
+
+def text_chunks(text: str, size: int) -> Iterator[str]:
+    """Split ``text`` into pieces of at most ``size`` characters at whitespace."""
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end < len(text):
+            cut = text.rfind(" ", start, end)
+            if cut > start:
+                end = cut
+        yield text[start:end]
+        start = end
@@ -0,0 +1,149 @@
+"""On-disk cache of parsed documents keyed by content hash and parser version."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from seo_agent.models import FetchResult, ParsedDocument
+from seo_agent.tools.hf.fetcher import PARSER_VERSION
+from seo_agent.tools.hf.settings import env_bool, env_int
+
+logger = logging.getLogger(__name__)
+
+# Parse cache settings
+PARSE_CACHE_ENABLED = env_bool("PARSE_CACHE_ENABLED", True)
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", str(Path.home() / ".cache" / "seo-agent" / "parse"))
+PARSE_CACHE_MAX_MB = env_int("PARSE_CACHE_MAX_MB", 256)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    key TEXT PRIMARY KEY,
+    data BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_documents_last_access ON documents (last_access);
+"""
+
+
+def content_key(fetch_result: FetchResult, parser_version: str = PARSER_VERSION) -> str:
+    """Cache key of a fetched page.
+
+    The final URL is hashed together with the HTML because links and the
+    canonical URL are resolved against it.
+    """
+    digest = hashlib.sha256()
+    digest.update(fetch_result.url.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(fetch_result.content.encode("utf-8"))
+    return f"{digest.hexdigest()}:{parser_version}"
+
+
+class ParseCache:
+    """Serialized ``ParsedDocument`` objects stored in a local SQLite file.
+
+    Documents are stored as compressed JSON without ``parsed_at``; the least
+    recently used ones are evicted once the cache exceeds ``max_bytes``. The
+    crawler calls it from worker threads, so the connection is shared under
+    a lock.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = PARSE_CACHE_DIR,
+        max_bytes: int = PARSE_CACHE_MAX_MB * 1024 * 1024,
+        parser_version: str = PARSER_VERSION,
+    ):
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.parser_version = parser_version
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.directory / "documents.sqlite3", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._total_bytes = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+
+    def get(self, fetch_result: FetchResult) -> Optional[ParsedDocument]:
+        """Return the cached document for this exact content, or None."""
+        key = content_key(fetch_result, self.parser_version)
+        with self._lock:
+            row = self._db.execute("SELECT data FROM documents WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE documents SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        return ParsedDocument.model_validate_json(zlib.decompress(row[0]))
+
+    def put(self, fetch_result: FetchResult, document: ParsedDocument) -> None:
+        """Store a successfully parsed document."""
+        if document.error:
+            return
+
+        key = content_key(fetch_result, self.parser_version)
+        data = zlib.compress(document.model_dump_json(exclude={"parsed_at"}).encode("utf-8"), 6)
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM documents WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (key, data, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, data, len(data), time.time()),
+            )
+            self._db.commit()
+            self._total_bytes += len(data) - (previous[0] if previous else 0)
+            self._evict()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _evict(self) -> None:
+        """Drop least recently used documents until the cache fits into ``max_bytes``."""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = self._db.execute("SELECT key, size FROM documents ORDER BY last_access ASC").fetchall()
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM documents WHERE key = ?", (key,))
+            self._total_bytes -= size
+            evicted += 1
+        self._db.commit()
+        logger.info("Parse cache evicted %s documents, %s bytes in use", evicted, self._total_bytes)
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# Global parse cache instance
+_parse_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    """
+    Get the process-wide parsed-document cache.
+
+    Returns:
+        Shared ParseCache instance.
+    """
+    global _parse_cache
+
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+
+    return _parse_cache
+
+
+def close_parse_cache() -> None:
+    """Close the shared parse cache."""
+    global _parse_cache
+
+    if _parse_cache is not None:
+        _parse_cache.close()
+        _parse_cache = None
@@ -0,0 +1,138 @@
+"""Process pool that keeps CPU-heavy HTML parsing off the event loop."""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from seo_agent.models import FetchResult, ParsedDocument
+from seo_agent.tools.hf.fetcher import Parser
+from seo_agent.tools.hf.settings import env_int
+
+logger = logging.getLogger(__name__)
+
+# Parser worker processes; 0 parses inline on the event loop
+PARSE_WORKERS = env_int("PARSE_WORKERS", min(4, os.cpu_count() or 1))
+
+# Parser instance of the current worker process
+_worker_parser: Optional[Parser] = None
+
+
+def _init_worker() -> None:
+    global _worker_parser
+    _worker_parser = Parser()
+
+
+def _parse_in_worker(url: str, content: str) -> dict:
+    """Parse one page inside a worker process.
+
+    Only the final URL and HTML cross the process boundary; the document
+    comes back as a plain dict of its fields.
+    """
+    parser = _worker_parser or Parser()
+    document = parser.parse(FetchResult(url=url, status_code=200, content=content))
+    return document.model_dump(exclude={"parsed_at"})
+
+
+class ParsePool:
+    """Bounded pool of parser processes with an awaitable ``parse``.
+
+    Workers are spawned rather than forked, since the API process runs
+    threads (httpx, Playwright) that must not be duplicated. Callers keep at
+    most ``max_pending`` parses in flight, so queued HTML does not pile up
+    in memory while fetching continues. A worker that dies (crash, OOM
+    kill) breaks the whole pool: it is replaced by a fresh one and the parse
+    retried once, then parsed in a thread instead.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS):
+        self.workers = max(0, workers)
+        self.max_pending = max(1, self.workers * 2)
+        self._parser = Parser()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # The pool is process-wide and may be used from several threads
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = self._new_executor()
+                logger.info("Started parser pool with %s workers", self.workers)
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor; concurrent parses that hit it drop it only once."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def parse(self, fetch_result: FetchResult) -> ParsedDocument:
+        """Parse fetched content in a worker process."""
+        # Failed fetches need no parsing, and without workers we parse inline.
+        if self.workers == 0 or fetch_result.error or fetch_result.status_code != 200:
+            return self._parser.parse(fetch_result)
+
+        loop = asyncio.get_running_loop()
+        for _ in range(2):
+            executor = self._get_executor()
+            try:
+                data = await loop.run_in_executor(
+                    executor,
+                    _parse_in_worker,
+                    fetch_result.url,
+                    fetch_result.content,
+                )
+                return ParsedDocument(**data)
+            except BrokenProcessPool:
+                logger.warning("Parser pool broke while parsing %s, restarting it", fetch_result.url)
+                self._discard_executor(executor)
+
+        logger.warning("Parser pool broke twice, parsing %s in a thread", fetch_result.url)
+        data = await asyncio.to_thread(_parse_in_worker, fetch_result.url, fetch_result.content)
+        return ParsedDocument(**data)
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global parse pool instance
+_parse_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """
+    Get the process-wide parse pool.
+
+    Returns:
+        Shared ParsePool instance.
+    """
+    global _parse_pool
+
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+
+    return _parse_pool
+
+
+def close_parse_pool() -> None:
+    """Shut down the shared parser worker processes."""
+    global _parse_pool
+
+    if _parse_pool is not None:
+        _parse_pool.close()
+        _parse_pool = None
@@ -0,0 +1,116 @@
+"""Embedding-based reranking of TF-IDF keyword candidates."""
+
+import logging
+from typing import List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from seo_agent.models import KeywordCandidate, ParsedDocument
+from seo_agent.tools.hf.embedding_cache import VectorCache
+from seo_agent.tools.hf.idf_store import content_hash
+from seo_agent.tools.hf.settings import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+# MMR trade-off: 1.0 ranks by relevance only, lower values favour diversity
+RERANK_DIVERSITY = env_float("RERANK_DIVERSITY", 0.7)
+
+# Leading characters of a page that are embedded as its document vector
+RERANK_DOC_CHARS = env_int("RERANK_DOC_CHARS", 2000)
+
+# Document and keyword vectors kept in memory across runs
+RERANK_CACHE_SIZE = env_int("RERANK_CACHE_SIZE", 50_000)
+
+# Shared by every reranker; keys include the model name
+_vector_cache = VectorCache(RERANK_CACHE_SIZE)
+
+
+def mmr(relevance: np.ndarray, vectors: np.ndarray, k: int, diversity: float = RERANK_DIVERSITY) -> List[int]:
+    """Maximal marginal relevance selection over unit-length ``vectors``.
+
+    Each step picks the item maximizing ``diversity * relevance -
+    (1 - diversity) * max cosine to the items already picked``.
+    """
+    k = min(k, len(relevance))
+    selected: List[int] = []
+    redundancy = np.zeros(len(relevance))
+    available = np.ones(len(relevance), dtype=bool)
+    for _ in range(k):
+        scores = np.where(available, diversity * relevance - (1 - diversity) * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, vectors @ vectors[best], out=redundancy)
+    return selected
+
+
+class KeywordReranker:
+    """Rerank keyword candidates by similarity to the pages they come from.
+
+    Every page is embedded once (its first ``RERANK_DOC_CHARS`` characters)
+    and candidates are embedded in batches with an already-loaded
+    ``Embedder``; both kinds of vectors are cached per model, device and
+    precision. A candidate's relevance is its mean cosine to its source
+    pages (to all pages when it has none), and the final order is chosen
+    with MMR so near-synonyms do not crowd the top of the list.
+    """
+
+    def __init__(self, embedder, diversity: float = RERANK_DIVERSITY, cache: VectorCache | None = None):
+        self.embedder = embedder
+        self.diversity = diversity
+        self.cache = cache if cache is not None else _vector_cache
+
+    def _vectors(self, kind: str, keys: Sequence[str], texts: Sequence[str]) -> np.ndarray:
+        """Cached unit vectors of ``texts``; only cache misses are encoded."""
+        model = self.embedder.cache_namespace
+        vectors: List[Optional[np.ndarray]] = [self.cache.get((model, kind, key)) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            encoded = np.asarray(
+                self.embedder.encode([texts[i] for i in missing]),
+                dtype=np.float32,
+            )
+            for i, vector in zip(missing, encoded):
+                self.cache.put((model, kind, keys[i]), vector)
+                vectors[i] = vector
+        return np.vstack(vectors)
+
+    def rerank(
+        self,
+        candidates: List[KeywordCandidate],
+        documents: List[ParsedDocument],
+        top_k: int,
+    ) -> List[KeywordCandidate]:
+        """Pick ``top_k`` candidates by relevance to their pages, diversified with MMR."""
+        documents = [doc for doc in documents if doc.main_text]
+        if not candidates or not documents:
+            return candidates[:top_k]
+
+        doc_texts = [doc.main_text[:RERANK_DOC_CHARS] for doc in documents]
+        doc_vectors = self._vectors("doc", [content_hash(text) for text in doc_texts], doc_texts)
+        keywords = [candidate.keyword for candidate in candidates]
+        keyword_vectors = self._vectors("keyword", keywords, keywords)
+
+        # Candidate x document incidence from the candidates' source URLs
+        row_of_url = {doc.url: row for row, doc in enumerate(documents)}
+        rows, columns = [], []
+        for i, candidate in enumerate(candidates):
+            for url in candidate.source_urls:
+                if url in row_of_url:
+                    rows.append(i)
+                    columns.append(row_of_url[url])
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(len(candidates), len(documents)),
+        )
+        n_sources = np.asarray(incidence.sum(axis=1)).ravel()
+        source_centroids = incidence @ doc_vectors
+        orphans = n_sources == 0
+        source_centroids[orphans] = doc_vectors.sum(axis=0)
+        n_sources[orphans] = len(documents)
+        relevance = np.einsum("ij,ij->i", keyword_vectors, source_centroids) / n_sources
+
+        order = mmr(relevance, keyword_vectors, top_k, self.diversity)
+        logger.info(f"🎯 Reranked {len(candidates)} candidates to {len(order)} by embedding relevance")
+        return [candidates[i] for i in order]
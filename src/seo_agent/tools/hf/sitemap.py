@@ -0,0 +1,222 @@
+"""Sitemap.xml and robots.txt ingestion for seeding crawls."""
+
+import logging
+import zlib
+from datetime import datetime, timezone
+from typing import AsyncIterator, List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from lxml import etree
+
+from seo_agent.models import SitemapEntry
+from seo_agent.tools.hf.fetcher import ANTI_BOT_HEADERS, get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Nested sitemap indexes deeper than this are ignored
+MAX_SITEMAP_DEPTH = 3
+
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _localname(element) -> str:
+    return etree.QName(element).localname
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if isinstance(child.tag, str) and _localname(child) == name:
+            return (child.text or "").strip() or None
+    return None
+
+
+def parse_lastmod(value: Optional[str]) -> Optional[datetime]:
+    """Parse a W3C datetime ``lastmod`` into naive UTC; None if missing or invalid."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+class SitemapReader:
+    """Stream URLs from a domain's sitemaps while honoring robots.txt.
+
+    Sitemaps listed in robots.txt are read first, falling back to
+    ``/sitemap.xml``. Sitemap indexes are followed, gzipped sitemaps are
+    decompressed on the fly and ``<url>`` elements are released as soon as they
+    are yielded, so memory stays flat on very large sitemaps.
+    """
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        user_agent: Optional[str] = None,
+        timeout: int = 30,
+    ):
+        self._client = client
+        self.user_agent = user_agent or ANTI_BOT_HEADERS["User-Agent"]
+        self.timeout = timeout
+        self.robots: Optional[RobotFileParser] = None
+        self.processed_sitemaps: List[str] = []
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        return self._client or get_http_client()
+
+    @property
+    def crawl_delay(self) -> Optional[float]:
+        """``Crawl-delay`` from robots.txt for our user agent, if any."""
+        if self.robots is None:
+            return None
+        delay = self.robots.crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+    def can_fetch(self, url: str) -> bool:
+        """Check URL against robots.txt disallow rules."""
+        if self.robots is None:
+            return True
+        return self.robots.can_fetch(self.user_agent, url)
+
+    async def load_robots(self, base_url: str) -> RobotFileParser:
+        """Fetch and parse robots.txt; a missing or failing file allows everything."""
+        robots_url = urljoin(base_url, "/robots.txt")
+        robots = RobotFileParser(robots_url)
+        try:
+            response = await self.client.get(
+                robots_url,
+                headers={"User-Agent": self.user_agent},
+                timeout=self.timeout,
+                follow_redirects=True,
+            )
+            lines = response.text.splitlines() if response.status_code == 200 else []
+            if response.status_code != 200:
+                logger.info("robots.txt not available at %s (HTTP %s)", robots_url, response.status_code)
+        except Exception as e:
+            logger.warning("Failed to fetch %s: %s", robots_url, str(e))
+            lines = []
+
+        robots.parse(lines)
+        self.robots = robots
+        return robots
+
+    async def iter_urls(
+        self,
+        domain: str,
+        since: Optional[datetime] = None,
+    ) -> AsyncIterator[SitemapEntry]:
+        """Yield sitemap entries for ``domain`` allowed by robots.txt.
+
+        Args:
+            domain: Bare domain or any URL on the site.
+            since: If set, skip entries whose ``lastmod`` is older than this.
+        """
+        base_url = domain if "://" in domain else f"https://{domain}"
+        parsed = urlparse(base_url)
+        base_url = f"{parsed.scheme}://{parsed.netloc}/"
+
+        # robots.txt already read with load_robots() is reused
+        robots = self.robots if self.robots is not None else await self.load_robots(base_url)
+        sitemap_urls = list(robots.site_maps() or []) or [urljoin(base_url, "/sitemap.xml")]
+
+        # Depth-first over sitemap indexes; visited set guards against cycles.
+        stack: list[tuple[str, int]] = [(url, 0) for url in reversed(sitemap_urls)]
+        visited: set[str] = set()
+        while stack:
+            sitemap_url, depth = stack.pop()
+            if sitemap_url in visited:
+                continue
+            visited.add(sitemap_url)
+            self.processed_sitemaps.append(sitemap_url)
+
+            nested: list[str] = []
+            async for entry in self._read_sitemap(sitemap_url, nested):
+                if since is not None and entry.lastmod is not None and entry.lastmod < since:
+                    continue
+                if not self.can_fetch(entry.url):
+                    continue
+                yield entry
+
+            if depth < MAX_SITEMAP_DEPTH:
+                stack.extend((url, depth + 1) for url in reversed(nested))
+            elif nested:
+                logger.warning("Ignoring %s nested sitemaps below %s", len(nested), sitemap_url)
+
+    async def _read_sitemap(self, sitemap_url: str, nested: List[str]) -> AsyncIterator[SitemapEntry]:
+        """Stream-parse one sitemap; child sitemaps of an index go to ``nested``."""
+        parser = etree.XMLPullParser(
+            events=("end",),
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+        decompressor = None
+        first_chunk = True
+
+        try:
+            async with self.client.stream(
+                "GET",
+                sitemap_url,
+                headers={"User-Agent": self.user_agent},
+                timeout=self.timeout,
+                follow_redirects=True,
+            ) as response:
+                if response.status_code != 200:
+                    logger.warning("Sitemap %s returned HTTP %s", sitemap_url, response.status_code)
+                    return
+
+                async for chunk in response.aiter_bytes():
+                    if first_chunk:
+                        first_chunk = False
+                        # .xml.gz files are served as gzip payloads, not Content-Encoding
+                        if chunk.startswith(GZIP_MAGIC):
+                            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    if decompressor is not None:
+                        chunk = decompressor.decompress(chunk)
+
+                    parser.feed(chunk)
+                    for entry in self._drain(parser, sitemap_url, nested):
+                        yield entry
+
+                if decompressor is not None:
+                    parser.feed(decompressor.flush())
+                parser.close()
+                for entry in self._drain(parser, sitemap_url, nested):
+                    yield entry
+        except (httpx.HTTPError, etree.XMLSyntaxError, zlib.error) as e:
+            logger.warning("Failed to read sitemap %s: %s", sitemap_url, str(e))
+
+    @staticmethod
+    def _drain(parser, sitemap_url: str, nested: List[str]) -> List[SitemapEntry]:
+        entries: List[SitemapEntry] = []
+        for _, element in parser.read_events():
+            if not isinstance(element.tag, str):
+                continue
+            name = _localname(element)
+            if name not in ("url", "sitemap"):
+                continue
+
+            loc = _child_text(element, "loc")
+            if loc:
+                if name == "sitemap":
+                    nested.append(loc)
+                else:
+                    entries.append(SitemapEntry(
+                        url=loc,
+                        lastmod=parse_lastmod(_child_text(element, "lastmod")),
+                        sitemap=sitemap_url,
+                    ))
+
+            # Release parsed elements so the tree does not grow with the sitemap.
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+        return entries
@@ -8,6 +8,7 @@ from dotenv import load_dotenv
 from openai import AsyncOpenAI
 
 from seo_agent.models import KeywordCandidate, EmbeddingRecord
+from seo_agent.tools.hf.embedding_cache import get_embedding_cache
 
 
 # Load environment variables
@@ -28,10 +29,20 @@ class OpenAIEmbedder:
         return self.client is not None
 
     async def embed(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for texts using OpenAI."""
+        """Generate embeddings for texts using OpenAI, requesting only uncached ones."""
         if not self.client:
             raise ValueError("OpenAI API key not configured")
 
+        cache = get_embedding_cache()
+        if cache is None:
+            return await self._request(texts)
+
+        model_key = f"openai:{self.model}"
+        keys, vectors, missing = cache.lookup(model_key, texts)
+        computed = await self._request(missing) if missing else None
+        return cache.complete(model_key, keys, vectors, missing, computed).tolist()
+
+    async def _request(self, texts: List[str]) -> List[List[float]]:
         response = await self.client.embeddings.create(
             model=self.model,
             input=texts
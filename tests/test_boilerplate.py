@@ -0,0 +1,38 @@
+"""Tests for site-level boilerplate removal."""
+
+from seo_agent.models import ParsedDocument
+from seo_agent.tools.hf.boilerplate import BoilerplateFilter
+from seo_agent.tools.hf.idf_store import IdfStore
+
+TEMPLATE = "Home\nAbout us\nWe use cookies to improve your experience.\n© 2024 Example Ltd."
+TOPICS = ["cargo", "freight", "customs", "warehouse", "pallets", "couriers"]
+
+
+def _page(i: int, body: str) -> ParsedDocument:
+    return ParsedDocument(url=f"https://example.com/{i}", main_text=f"{TEMPLATE}\n{body}", word_count=1)
+
+
+def test_blocks_repeated_across_most_pages_are_removed() -> None:
+    pages = [_page(i, f"All about {topic}.\nShared tip") for i, topic in enumerate(TOPICS)]
+    pages[5] = pages[5].model_copy(update={"main_text": pages[5].main_text.replace("2024", "2025")})
+    other_site = ParsedDocument(url="https://other.org/", main_text="Home\nAbout us")
+
+    filtered = BoilerplateFilter(min_pages=5).filter(pages + [other_site])
+
+    # Digits are masked, so the footer year still matches on the last page
+    assert [doc.main_text for doc in filtered[:6]] == [f"All about {topic}." for topic in TOPICS]
+    assert all(doc.word_count == 3 for doc in filtered[:6])
+    assert filtered[6] is other_site
+
+
+def test_small_runs_reuse_site_block_counts_from_earlier_runs(tmp_path) -> None:
+    store = IdfStore(tmp_path)
+    boilerplate = BoilerplateFilter(store=store, min_pages=5)
+    boilerplate.filter([_page(i, f"Article on {topic}") for i, topic in enumerate(TOPICS[:5])])
+
+    single = boilerplate.filter([_page(99, "Fresh article about rail")])
+
+    assert single[0].main_text == "Fresh article about rail"
+    # Unchanged pages are not recounted
+    assert boilerplate.filter([_page(0, "Article on cargo")])[0].main_text == "Article on cargo"
+    assert store.document_frequency("example.com", store.hash_terms([]))[0] == 6
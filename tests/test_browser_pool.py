@@ -0,0 +1,161 @@
+"""Tests for the shared Chromium browser pool and Playwright request policy."""
+
+import asyncio
+
+import pytest
+
+from seo_agent.tools.hf.fetcher import BrowserPool, PlayWrightFetcher, is_tracker_url
+
+
+class _FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def close(self) -> None:
+        self.browser.open_contexts -= 1
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+        self.open_contexts = 0
+        self.peak_contexts = 0
+
+    def is_connected(self) -> bool:
+        return self.connected and not self.closed
+
+    async def new_context(self, **options) -> _FakeContext:
+        self.open_contexts += 1
+        self.peak_contexts = max(self.peak_contexts, self.open_contexts)
+        return _FakeContext(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _FakeChromium:
+    def __init__(self):
+        self.launched: list[_FakeBrowser] = []
+
+    async def launch(self, **options) -> _FakeBrowser:
+        browser = _FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.chromium = _FakeChromium()
+
+    async def stop(self) -> None:
+        pass
+
+
+def _make_pool(**kwargs) -> tuple[BrowserPool, _FakeChromium]:
+    pool = BrowserPool(**kwargs)
+    pool._playwright = _FakePlaywright()
+    return pool, pool._playwright.chromium
+
+
+def test_pool_reuses_browsers_and_caps_contexts() -> None:
+    pool, chromium = _make_pool(size=2, max_contexts=2, recycle_after=100)
+
+    async def use_context():
+        async with pool.context():
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(*(use_context() for _ in range(10)))
+
+    asyncio.run(scenario())
+
+    assert len(chromium.launched) == 2
+    assert all(b.peak_contexts <= 2 for b in chromium.launched)
+    assert pool.stats()["pages_served"] == 10
+
+
+def test_pool_recycles_after_n_pages() -> None:
+    pool, chromium = _make_pool(size=1, max_contexts=1, recycle_after=2)
+
+    async def scenario():
+        for _ in range(3):
+            async with pool.context():
+                pass
+
+    asyncio.run(scenario())
+
+    assert len(chromium.launched) == 2
+    assert chromium.launched[0].closed
+    assert not chromium.launched[1].closed
+
+
+def test_pool_replaces_crashed_browser() -> None:
+    pool, chromium = _make_pool(size=1, max_contexts=1)
+
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with pool.context() as context:
+                context.browser.connected = False
+                raise RuntimeError("Target closed")
+        async with pool.context():
+            pass
+
+    asyncio.run(scenario())
+
+    assert len(chromium.launched) == 2
+    assert chromium.launched[0].closed
+
+
+class _FakeRequest:
+    def __init__(self, url: str, resource_type: str):
+        self.url = url
+        self.resource_type = resource_type
+
+
+class _FakeRoute:
+    def __init__(self, url: str, resource_type: str):
+        self.request = _FakeRequest(url, resource_type)
+        self.outcome = None
+
+    async def abort(self) -> None:
+        self.outcome = "aborted"
+
+    async def continue_(self) -> None:
+        self.outcome = "continued"
+
+
+class _RoutingContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler) -> None:
+        self.handler = handler
+
+
+def test_is_tracker_url_matches_host_suffix() -> None:
+    assert is_tracker_url("https://www.google-analytics.com/g/collect")
+    assert is_tracker_url("https://mc.yandex.ru/metrika/tag.js")
+    assert not is_tracker_url("https://example.com/google-analytics.com.js")
+
+
+def test_playwright_blocks_configured_resource_types_and_trackers() -> None:
+    fetcher = PlayWrightFetcher(block_resources=["image", "font", "document"], block_trackers=True)
+    context = _RoutingContext()
+    counters = {"blocked_requests": 0}
+    routes = [
+        _FakeRoute("https://example.com/", "document"),
+        _FakeRoute("https://example.com/logo.png", "image"),
+        _FakeRoute("https://example.com/app.js", "script"),
+        _FakeRoute("https://www.googletagmanager.com/gtm.js", "script"),
+    ]
+
+    async def scenario():
+        await fetcher._install_blocking(context, counters)
+        for route in routes:
+            await context.handler(route)
+
+    asyncio.run(scenario())
+
+    assert [r.outcome for r in routes] == ["continued", "aborted", "continued", "aborted"]
+    assert counters["blocked_requests"] == 2
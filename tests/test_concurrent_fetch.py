@@ -0,0 +1,77 @@
+"""Tests for the bounded concurrent fetch stage."""
+
+import asyncio
+
+from seo_agent.models import FetchResult
+from seo_agent.tools.hf.fetcher import (
+    HostLimiter,
+    close_http_client,
+    fetch_concurrently,
+    get_http_client,
+)
+
+
+class _FakeFetcher:
+    """Records peak parallelism overall and per host."""
+
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.active = 0
+        self.peak = 0
+        self.active_by_host: dict[str, int] = {}
+        self.peak_by_host: dict[str, int] = {}
+
+    async def fetch(self, url: str) -> FetchResult:
+        host = url.split("/")[2]
+        self.active += 1
+        self.active_by_host[host] = self.active_by_host.get(host, 0) + 1
+        self.peak = max(self.peak, self.active)
+        self.peak_by_host[host] = max(self.peak_by_host.get(host, 0), self.active_by_host[host])
+        try:
+            await asyncio.sleep(0.01)
+            if url == self.fail_on:
+                raise RuntimeError("boom")
+            return FetchResult(url=url, status_code=200, content="<html></html>")
+        finally:
+            self.active -= 1
+            self.active_by_host[host] -= 1
+
+
+async def _collect(fetcher, urls, limiter):
+    return [item async for item in fetch_concurrently(fetcher, urls, limiter)]
+
+
+def test_fetch_concurrently_respects_global_and_per_host_limits() -> None:
+    urls = [f"https://a.example/{i}" for i in range(8)] + [f"https://b.example/{i}" for i in range(8)]
+    fetcher = _FakeFetcher()
+
+    limiter = HostLimiter(max_concurrency=3, per_host_limit=2)
+    results = asyncio.run(_collect(fetcher, urls, limiter))
+
+    assert sorted(index for index, _, _ in results) == list(range(len(urls)))
+    assert fetcher.peak <= 3
+    assert max(fetcher.peak_by_host.values()) <= 2
+    # Idle hosts leave no per-host state behind
+    assert limiter._hosts == {} and limiter._host_users == {}
+
+
+def test_fetch_concurrently_yields_exceptions_per_url() -> None:
+    urls = ["https://a.example/ok", "https://a.example/bad"]
+    fetcher = _FakeFetcher(fail_on="https://a.example/bad")
+
+    results = {url: result for _, url, result in asyncio.run(_collect(fetcher, urls, HostLimiter()))}
+
+    assert isinstance(results["https://a.example/ok"], FetchResult)
+    assert isinstance(results["https://a.example/bad"], RuntimeError)
+
+
+def test_fetchers_share_pooled_http_client() -> None:
+    async def scenario():
+        first = get_http_client()
+        assert get_http_client() is first
+        await close_http_client()
+        second = get_http_client()
+        assert second is not first
+        await close_http_client()
+
+    asyncio.run(scenario())
@@ -0,0 +1,172 @@
+"""Tests for the breadth-first site crawler."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.robotparser import RobotFileParser
+
+from seo_agent.models import FetchResult
+from seo_agent.tools.hf.crawler import SiteCrawler, normalize_url
+from seo_agent.tools.hf.fetcher import Parser
+from seo_agent.tools.hf.parse_cache import ParseCache
+from seo_agent.tools.hf.parse_pool import ParsePool
+
+
+def _page(*links: str) -> str:
+    anchors = "".join(f'<a href="{link}">link</a>' for link in links)
+    return f"<html><head><title>t</title></head><body><p>Some text here.</p>{anchors}</body></html>"
+
+
+SITE = {
+    "https://example.com/": _page("/a", "/b#top", "https://other.com/x", "/logo.png"),
+    "https://example.com/a": _page("/c", "/?utm_source=x"),
+    "https://example.com/b": _page("/a"),
+    "https://example.com/c": _page("/d"),
+    "https://example.com/d": _page(),
+}
+
+
+class _SiteFetcher:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.fetched: list[str] = []
+
+    async def fetch(self, url: str) -> FetchResult:
+        self.fetched.append(url)
+        await asyncio.sleep(self.delay)
+        if url not in SITE:
+            return FetchResult(url=url, status_code=404, content="")
+        return FetchResult(url=url, status_code=200, content=SITE[url])
+
+
+def _crawl(crawler: SiteCrawler, seeds: list[str]) -> tuple[list[str], list[str]]:
+    errors: list[str] = []
+
+    async def run():
+        return [(order, doc.url) async for order, doc in crawler.crawl(seeds, errors)]
+
+    results = asyncio.run(run())
+    return [url for _, url in sorted(results)], errors
+
+
+def test_normalize_url_drops_fragment_tracking_and_default_port() -> None:
+    assert normalize_url("HTTPS://Example.com:443/page?b=2&utm_source=x&a=1#frag") == (
+        "https://example.com/page?a=1&b=2"
+    )
+    assert normalize_url("https://example.com") == "https://example.com/"
+    assert normalize_url("mailto:info@example.com") is None
+
+
+def test_crawler_follows_same_site_links_up_to_depth() -> None:
+    fetcher = _SiteFetcher()
+    crawler = SiteCrawler(fetcher, Parser(), max_depth=1, max_pages=50)
+
+    urls, errors = _crawl(crawler, ["https://example.com/"])
+
+    assert urls == ["https://example.com/", "https://example.com/a", "https://example.com/b"]
+    assert errors == []
+    assert len(fetcher.fetched) == len(set(fetcher.fetched))
+
+
+def test_crawler_skips_links_disallowed_by_robots() -> None:
+    robots = RobotFileParser()
+    robots.parse(["User-agent: *", "Disallow: /a"])
+    fetcher = _SiteFetcher()
+    crawler = SiteCrawler(fetcher, Parser(), max_depth=2, robots={"example.com": robots})
+
+    urls, _ = _crawl(crawler, ["https://example.com/"])
+
+    assert urls == ["https://example.com/", "https://example.com/b"]
+
+
+def test_crawler_respects_max_pages() -> None:
+    fetcher = _SiteFetcher()
+    crawler = SiteCrawler(fetcher, Parser(), max_depth=5, max_pages=4)
+
+    urls, _ = _crawl(crawler, ["https://example.com/"])
+
+    assert len(fetcher.fetched) == 4
+    assert len(urls) == 4
+
+
+def test_crawler_stops_at_wall_clock_timeout() -> None:
+    fetcher = _SiteFetcher(delay=0.2)
+    crawler = SiteCrawler(fetcher, Parser(), max_depth=5, max_pages=50, timeout=0.05)
+
+    urls, errors = _crawl(crawler, ["https://example.com/"])
+
+    assert urls == []
+    assert any("Crawl timeout" in error for error in errors)
+
+
+def test_crawler_with_parse_pool_matches_inline_parsing() -> None:
+    pool = ParsePool(workers=1)
+    try:
+        pooled = SiteCrawler(_SiteFetcher(), Parser(), max_depth=2, parse_pool=pool)
+        inline = SiteCrawler(_SiteFetcher(), Parser(), max_depth=2)
+
+        assert _crawl(pooled, ["https://example.com/"]) == _crawl(inline, ["https://example.com/"])
+    finally:
+        pool.close()
+
+
+class _BrokenExecutor:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("worker died")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+class _FlakyParsePool(ParsePool):
+    """Hands out the given executors in turn, standing in for process pools."""
+
+    def __init__(self, *executors):
+        super().__init__(workers=1)
+        self.executors = list(executors)
+
+    def _new_executor(self):
+        return self.executors.pop(0)
+
+
+def test_parse_pool_replaces_a_broken_pool_and_falls_back_to_a_thread() -> None:
+    page = FetchResult(url="https://example.com/", status_code=200, content=SITE["https://example.com/"])
+    broken, healthy = _BrokenExecutor(), ThreadPoolExecutor(max_workers=1)
+    pool = _FlakyParsePool(broken, healthy)
+    try:
+        assert asyncio.run(pool.parse(page)).title == "t"
+        assert broken.shut_down and pool._executor is healthy
+    finally:
+        pool.close()
+
+    pool = _FlakyParsePool(_BrokenExecutor(), _BrokenExecutor())
+    assert asyncio.run(pool.parse(page)).title == "t"
+    assert pool._executor is None
+
+
+class _CountingParser(Parser):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def parse(self, fetch_result):
+        self.calls += 1
+        return super().parse(fetch_result)
+
+
+def test_crawler_skips_parsing_unchanged_pages_via_parse_cache(tmp_path) -> None:
+    cache = ParseCache(tmp_path)
+    parser = _CountingParser()
+
+    first = SiteCrawler(_SiteFetcher(), parser, max_depth=1, parse_cache=cache)
+    first_urls, _ = _crawl(first, ["https://example.com/"])
+    second = SiteCrawler(_SiteFetcher(), parser, max_depth=1, parse_cache=cache)
+    second_urls, _ = _crawl(second, ["https://example.com/"])
+
+    assert first_urls == second_urls
+    assert parser.calls == 3
+    assert (first.parse_cache_stats.hits, first.parse_cache_stats.misses) == (0, 3)
+    assert second.parse_cache_stats.hit_rate == 1.0
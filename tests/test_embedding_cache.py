@@ -0,0 +1,81 @@
+"""Tests for the two-tier keyword embedding cache."""
+
+import numpy as np
+
+from seo_agent.tools.hf import embedding_cache, model_registry
+from seo_agent.tools.hf.clustering import Embedder
+from seo_agent.tools.hf.embedding_cache import DiskEmbeddingStore, EmbeddingCache, VectorCache
+from seo_agent.tools.hf.model_registry import ModelRegistry
+
+
+class _CountingModel:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        self.batches.append(list(texts))
+        return np.array([[len(text), text.count(" "), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_disk_store_round_trip_and_growth(tmp_path) -> None:
+    store = DiskEmbeddingStore(tmp_path)
+    first = np.random.default_rng(0).standard_normal((3, 4)).astype(np.float32)
+    store.put_many("mini", ["a", "b", "c"], first)
+    store.close()
+
+    # Reopened store reads earlier rows and appends past the initial file size
+    store = DiskEmbeddingStore(tmp_path)
+    more = np.random.default_rng(1).standard_normal((5000, 4)).astype(np.float32)
+    store.put_many("mini", [f"k{i}" for i in range(5000)], more)
+    found = store.get_many("mini", ["b", "k4999", "missing"])
+    assert set(found) == {"b", "k4999"}
+    np.testing.assert_array_equal(found["b"], first[1])
+    np.testing.assert_array_equal(found["k4999"], more[4999])
+    assert store.get_many("other", ["a"]) == {}
+    store.close()
+
+
+def test_disk_store_resets_model_on_dimension_change(tmp_path) -> None:
+    store = DiskEmbeddingStore(tmp_path)
+    store.put_many("mini", ["a", "b"], np.ones((2, 4), dtype=np.float32))
+    store.put_many("mini", ["c"], np.full((1, 8), 2.0, dtype=np.float32))
+
+    found = store.get_many("mini", ["a", "c"])
+    assert list(found) == ["c"]
+    assert found["c"].shape == (8,)
+    store.close()
+
+
+def test_embedder_encodes_only_cache_misses(tmp_path, monkeypatch) -> None:
+    model = _CountingModel()
+    monkeypatch.setattr(model_registry, "_model_registry", ModelRegistry(loader=lambda *args: model))
+    cache = EmbeddingCache(memory=VectorCache(2), disk=DiskEmbeddingStore(tmp_path))
+    monkeypatch.setattr(embedding_cache, "_embedding_cache", cache)
+
+    embedder = Embedder(model_name="mini")
+    first = embedder.embed(["Доставка  грузов", "перевозка", "доставка грузов"])
+    assert model.batches == [["доставка грузов", "перевозка"]]
+    assert first[0] == first[2]
+
+    # The memory tier holds two vectors; the rest come back from disk
+    second = embedder.embed(["перевозка", "доставка грузов", "склад"])
+    assert model.batches[1:] == [["склад"]]
+    assert second[:2] == [first[1], first[0]]
+
+    embedder.embed(["склад", "перевозка"])
+    assert len(model.batches) == 2
+    cache.close()
+
+
+def test_cached_vectors_are_kept_apart_per_precision(tmp_path, monkeypatch) -> None:
+    model = _CountingModel()
+    monkeypatch.setattr(model_registry, "_model_registry", ModelRegistry(loader=lambda *args: model))
+    cache = EmbeddingCache(memory=VectorCache(10), disk=DiskEmbeddingStore(tmp_path))
+    monkeypatch.setattr(embedding_cache, "_embedding_cache", cache)
+
+    Embedder(model_name="mini", precision="float32").embed(["склад"])
+    Embedder(model_name="mini", precision="float16").embed(["склад"])
+    Embedder(model_name="mini", precision="float16").embed(["склад"])
+
+    assert model.batches == [["склад"], ["склад"]]
+    cache.close()
@@ -0,0 +1,79 @@
+"""Tests for the on-disk fetch cache."""
+
+import asyncio
+import random
+import string
+
+from seo_agent.models import FetchResult
+from seo_agent.tools.hf.fetch_cache import CachedFetcher, FetchCache
+
+PAGE = "<html><body><p>Cached page</p></body></html>"
+
+
+class _ConditionalFetcher:
+    def __init__(self):
+        self.requests: list[dict] = []
+
+    async def fetch(self, url: str, extra_headers=None) -> FetchResult:
+        self.requests.append(extra_headers or {})
+        if (extra_headers or {}).get("If-None-Match") == '"v1"':
+            return FetchResult(url=url, status_code=304, content="")
+        return FetchResult(url=url, status_code=200, content=PAGE, headers={"ETag": '"v1"'})
+
+
+def test_fresh_hit_skips_network_and_stale_entry_is_revalidated(tmp_path) -> None:
+    cache = FetchCache(tmp_path, ttl=60)
+    inner = _ConditionalFetcher()
+    fetcher = CachedFetcher(inner, cache)
+
+    first = asyncio.run(fetcher.fetch("https://example.com/page?utm_source=x"))
+    second = asyncio.run(fetcher.fetch("https://EXAMPLE.com/page#top"))
+
+    assert first.cache_status == "miss"
+    assert second.cache_status == "hit"
+    assert second.content == PAGE
+    assert len(inner.requests) == 1
+
+    cache.ttl = 0
+    third = asyncio.run(fetcher.fetch("https://example.com/page"))
+
+    assert third.cache_status == "revalidated"
+    assert third.content == PAGE
+    assert inner.requests[-1] == {"If-None-Match": '"v1"'}
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path) -> None:
+    cache = FetchCache(tmp_path, ttl=60)
+    for i in range(3):
+        rng = random.Random(i)
+        body = "".join(rng.choice(string.ascii_letters) for _ in range(4000))
+        url = f"https://example.com/{i}"
+        cache.put(url, FetchResult(url=url, status_code=200, content=body))
+        if i == 0:
+            cache.max_bytes = int(cache.total_bytes() * 2.5)
+
+    assert cache.total_bytes() <= cache.max_bytes
+    assert cache.get("https://example.com/0") is None
+    assert cache.get("https://example.com/2") is not None
+
+
+def test_revalidated_entry_with_evicted_blob_is_fetched_again(tmp_path) -> None:
+    cache = FetchCache(tmp_path, ttl=0)
+    inner = _ConditionalFetcher()
+    fetcher = CachedFetcher(inner, cache)
+    asyncio.run(fetcher.fetch("https://example.com/page"))
+
+    class _EvictingFetcher(_ConditionalFetcher):
+        async def fetch(self, url: str, extra_headers=None) -> FetchResult:
+            # Another request evicts the blob while this one revalidates
+            for blob in (tmp_path / "blobs").rglob("*.z"):
+                blob.unlink()
+            return await super().fetch(url, extra_headers)
+
+    fetcher.fetcher = _EvictingFetcher()
+    result = asyncio.run(fetcher.fetch("https://example.com/page"))
+
+    assert result.cache_status == "miss"
+    assert result.content == PAGE
+    assert fetcher.fetcher.requests == [{"If-None-Match": '"v1"'}, {}]
+    assert cache.total_bytes() > 0
@@ -0,0 +1,78 @@
+"""Tests for the micro-batching inference executor."""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from seo_agent.tools.hf.inference import InferenceExecutor
+
+
+class _RecordingModel:
+    def __init__(self, gate: threading.Event | None = None):
+        self.calls = []
+        self.gate = gate
+        self.entered = threading.Event()
+
+    def encode(self, texts, batch_size=64, convert_to_numpy=True, normalize_embeddings=False):
+        self.entered.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls.append(list(texts))
+        if "boom" in texts:
+            raise RuntimeError("encode failed")
+        return np.array([[len(text), float(normalize_embeddings)] for text in texts], dtype=np.float32)
+
+
+def test_concurrent_requests_share_one_encode_call() -> None:
+    model = _RecordingModel()
+    executor = InferenceExecutor(max_batch=100, max_wait_ms=200)
+
+    async def scenario():
+        return await asyncio.gather(
+            executor.aencode(model, ["a", "bb"]),
+            executor.aencode(model, ["ccc"]),
+            executor.aencode(model, ["dddd", "e"]),
+        )
+
+    results = asyncio.run(scenario())
+    executor.close()
+
+    assert model.calls == [["a", "bb", "ccc", "dddd", "e"]]
+    assert [result[:, 0].tolist() for result in results] == [[1, 2], [3], [4, 1]]
+
+
+def test_batches_respect_model_normalization_and_size() -> None:
+    gate = threading.Event()
+    model, other = _RecordingModel(gate), _RecordingModel()
+    executor = InferenceExecutor(max_batch=3, max_wait_ms=0)
+
+    # The first request occupies the thread until the rest are queued
+    first = executor.submit(model, ["warm-up"])
+    assert model.entered.wait(5)
+    futures = [
+        executor.submit(model, ["a", "b"]),
+        executor.submit(other, ["x"]),
+        executor.submit(model, ["c"]),
+        executor.submit(model, ["d"], normalize=True),
+        executor.submit(model, ["e", "f"]),
+    ]
+    gate.set()
+    results = [future.result(5) for future in [first, *futures]]
+    executor.close()
+
+    assert model.calls == [["warm-up"], ["a", "b", "c"], ["d"], ["e", "f"]]
+    assert other.calls == [["x"]]
+    assert results[4][:, 1].tolist() == [1.0]
+
+
+def test_encode_errors_reach_every_caller_in_the_batch() -> None:
+    model = _RecordingModel()
+    executor = InferenceExecutor(max_batch=10, max_wait_ms=100)
+    futures = [executor.submit(model, ["ok"]), executor.submit(model, ["boom"])]
+    for future in futures:
+        with pytest.raises(RuntimeError, match="encode failed"):
+            future.result(5)
+    assert executor.encode(model, ["fine"]).shape == (1, 2)
+    executor.close()
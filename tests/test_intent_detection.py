@@ -1,8 +1,11 @@
 """Tests for keyword intent detection heuristics."""
 
+import re
+
 import pytest
 
 from seo_agent.models import IntentType
+from seo_agent.tools.hf.intent_matcher import INTENT_PRIORITY, get_intent_matcher
 from seo_agent.tools.hf.keywords import KeywordExtractor
 
 
@@ -33,3 +36,36 @@ def test_detect_intent_with_custom_extra_phrases() -> None:
     )
 
     assert extractor._detect_intent("расчет маршрута для перевозки") == IntentType.TRANSACTIONAL
+
+
+def _regex_intent(phrases: dict[str, list[str]], keyword: str) -> IntentType:
+    """Reference implementation: one re.search per phrase, by intent priority."""
+    keyword_lower = keyword.lower().strip()
+    for intent in INTENT_PRIORITY:
+        if any(
+            re.search(r"\b" + re.escape(phrase) + r"\b", keyword_lower)
+            for phrase in phrases.get(intent.value, [])
+        ):
+            return intent
+    return IntentType.INFORMATIONAL
+
+
+def test_compiled_matcher_agrees_with_per_phrase_regex() -> None:
+    extractor = KeywordExtractor(extra_phrases={"commercial": ["что выбрать", "c++ course"], "navigational": ["вход"]})
+    keywords = [
+        "доставка груза", "доставкагруза", "buy-now", "sign up free", "signupfree", "best vs worst",
+        "что выбрать", "что выбрать?", "что выбра", "c++ course online", "вход в кабинет", "входящие",
+        "как выбрать перевозчика", "price list", "prices", "", "официальный сайт dellin",
+    ]
+
+    expected = [_regex_intent(extractor._phrases, keyword) for keyword in keywords]
+
+    assert extractor.detect_intents(keywords) == expected
+    assert [extractor._detect_intent(keyword) for keyword in keywords] == expected
+
+
+def test_compiled_matcher_is_reused_until_phrases_change() -> None:
+    first = get_intent_matcher({"commercial": ["alpha"]}, website_id=-1)
+
+    assert get_intent_matcher({"commercial": ["alpha"]}, website_id=-1) is first
+    assert get_intent_matcher({"commercial": ["alpha", "beta"]}, website_id=-1) is not first
@@ -0,0 +1,43 @@
+"""Tests for the in-process intent phrase cache."""
+
+from seo_agent.api.intent_phrases import IntentPhraseCache
+from seo_agent.models import IntentType
+
+
+class _Loader:
+    def __init__(self):
+        self.scopes: dict = {None: {}, 1: {"commercial": ["зеленый слон"]}, 2: {}}
+        self.calls: list = []
+
+    def __call__(self, website_id):
+        self.calls.append(website_id)
+        return self.scopes[website_id]
+
+
+def test_extractor_is_cached_until_scope_is_invalidated() -> None:
+    loader = _Loader()
+    cache = IntentPhraseCache(loader=loader, ttl=0)
+
+    extractor = cache.extractor(1)
+    assert cache.extractor(1) is extractor
+    assert loader.calls == [None, 1]
+    assert extractor.detect_intents(["зеленый слон для логистики"]) == [IntentType.COMMERCIAL]
+
+    loader.scopes[1] = {"navigational": ["зеленый слон"]}
+    cache.invalidate(1)
+
+    assert cache.extractor(1).detect_intents(["зеленый слон для логистики"]) == [IntentType.NAVIGATIONAL]
+    assert loader.calls == [None, 1, 1]
+
+
+def test_global_invalidation_rebuilds_every_website() -> None:
+    loader = _Loader()
+    cache = IntentPhraseCache(loader=loader, ttl=0)
+
+    assert cache.extractor(2) is None
+
+    loader.scopes[None] = {"transactional": ["расчет маршрута"]}
+    cache.invalidate(None)
+
+    assert cache.extractor(2).detect_intents(["расчет маршрута"]) == [IntentType.TRANSACTIONAL]
+    assert cache.extra_phrases(1) == {"transactional": ["расчет маршрута"], "commercial": ["зеленый слон"]}
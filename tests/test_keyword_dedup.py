@@ -0,0 +1,82 @@
+"""Tests for near-duplicate keyword collapsing."""
+
+import numpy as np
+
+from seo_agent.models import KeywordCandidate
+from seo_agent.tools.hf import analyzers
+from seo_agent.tools.hf.dedup import KeywordDeduplicator, _UnionFind, similar_pairs
+
+
+def _kw(keyword: str, score: float, frequency: int = 1, urls: list[str] | None = None) -> KeywordCandidate:
+    return KeywordCandidate(
+        keyword=keyword, frequency=frequency, tf_idf_score=score, source_urls=urls or []
+    )
+
+
+class _FakeMorph:
+    LEMMAS = {"грузоперевозки": "грузоперевозка", "беларуси": "беларусь", "беларусь": "беларусь"}
+
+    def parse(self, word):
+        return [type("Parse", (), {"normal_form": self.LEMMAS.get(word, word)})()]
+
+
+def test_collapse_variants_merges_inflections_and_fragments(monkeypatch) -> None:
+    lemmatizer = analyzers.Lemmatizer()
+    lemmatizer._morph = _FakeMorph()
+    monkeypatch.setattr(analyzers, "_lemmatizer", lemmatizer)
+
+    keywords = [
+        _kw("грузоперевозки по беларуси", 0.9, 3, ["https://a.by/1", "https://a.by/2", "https://a.by/4"]),
+        _kw("грузоперевозки по", 0.95, 2, ["https://a.by/2", "https://a.by/4"]),
+        _kw("грузоперевозка по беларусь", 0.5, 2, ["https://a.by/1", "https://a.by/3"]),
+        _kw("склад", 0.4),
+    ]
+
+    collapsed = KeywordDeduplicator().collapse_variants(keywords)
+
+    assert [k.keyword for k in collapsed] == ["грузоперевозки по беларуси", "склад"]
+    head = collapsed[0]
+    # Documents of the union, not the sum of member frequencies
+    assert head.frequency == 4
+    assert head.source_urls == ["https://a.by/1", "https://a.by/2", "https://a.by/4", "https://a.by/3"]
+    assert set(head.variants) == {"грузоперевозки по", "грузоперевозка по беларусь"}
+
+
+def test_collapse_variants_keeps_word_order() -> None:
+    keywords = [
+        _kw("перевозка минск москва", 0.9, 3),
+        _kw("перевозка москва минск", 0.8, 3),
+        _kw("доставка из минска в москву", 0.7),
+        _kw("доставка из москвы в минск", 0.6),
+    ]
+
+    collapsed = KeywordDeduplicator().collapse_variants(keywords)
+
+    assert [k.keyword for k in collapsed] == [k.keyword for k in keywords]
+    assert [k.frequency for k in collapsed] == [3, 3, 1, 1]
+
+
+def test_collapse_similar_keeps_canonical_embedding_rows() -> None:
+    keywords = [_kw("cargo delivery", 0.5), _kw("freight delivery", 0.8), _kw("warehouse", 0.7)]
+    vectors = np.array([[1.0, 0.05, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+
+    collapsed, rows = KeywordDeduplicator(threshold=0.95).collapse_similar(keywords, vectors)
+
+    assert [k.keyword for k in collapsed] == ["freight delivery", "warehouse"]
+    assert collapsed[0].variants == ["cargo delivery"]
+    assert rows == [1, 2]
+
+
+def test_lsh_blocking_finds_the_same_near_duplicates_as_exact_search() -> None:
+    rng = np.random.default_rng(7)
+    base = rng.standard_normal((300, 32))
+    noisy = base + 0.02 * rng.standard_normal(base.shape)
+    vectors = np.vstack([base, noisy])
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    exact, blocked = _UnionFind(len(vectors)), _UnionFind(len(vectors))
+    similar_pairs(vectors, 0.95, exact)
+    similar_pairs(vectors, 0.95, blocked, exact_max=0)
+
+    assert len(exact.groups()) == 300
+    assert sorted(map(sorted, blocked.groups())) == sorted(map(sorted, exact.groups()))
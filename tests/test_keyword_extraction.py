@@ -0,0 +1,226 @@
+"""Tests for TF-IDF keyword extraction."""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from seo_agent.api.agent import SeoAgent
+from seo_agent.models import ParsedDocument
+from seo_agent.tools.hf import analyzers, idf_store
+from seo_agent.tools.hf.analyzers import analyzer_scheme
+from seo_agent.tools.hf.idf_store import IdfStore
+from seo_agent.tools.hf.keyword_pool import KeywordPool
+from seo_agent.tools.hf.keywords import DocumentQueue, KeywordExtractor
+from seo_agent.tools.hf.ngram_sketch import CountMinSketch, SpaceSaving
+from seo_agent.tools.hf.reranker import KeywordReranker, VectorCache, mmr
+
+
+def _doc(url: str, text: str) -> ParsedDocument:
+    return ParsedDocument(url=url, main_text=text)
+
+
+def test_frequency_and_source_urls_come_from_matching_documents() -> None:
+    documents = [
+        _doc("https://example.com/a", "cargo delivery across the country. Cargo delivery is fast."),
+        _doc("https://example.com/empty", ""),
+        _doc("https://example.com/b", "Express cargo delivery and warehouse storage."),
+        _doc("https://example.com/c", "Warehouse storage rates. Expressway cargo-free goods."),
+    ]
+
+    keywords = {k.keyword: k for k in KeywordExtractor(max_keywords=30).extract(documents)}
+
+    assert keywords["cargo delivery"].frequency == 2
+    assert keywords["cargo delivery"].source_urls == ["https://example.com/a", "https://example.com/b"]
+    assert keywords["warehouse storage"].source_urls == ["https://example.com/b", "https://example.com/c"]
+    # Whole tokens only: "expressway" does not count as "express"
+    assert keywords["express"].source_urls == ["https://example.com/b"]
+
+
+def test_sharded_counting_matches_serial_extraction_exactly() -> None:
+    topics = ["cargo delivery", "warehouse storage", "express shipping", "customs clearance", "freight rates"]
+    documents = [
+        _doc(f"https://example.com/{i}", f"{topics[i % 5]} and {topics[(i * 3) % 5]} for page {i}")
+        for i in range(12)
+    ]
+    serial = KeywordExtractor(max_keywords=10).extract(documents)
+
+    pool = KeywordPool(workers=2, min_docs=0)
+    try:
+        sharded = KeywordExtractor(max_keywords=10, keyword_pool=pool).extract(documents)
+    finally:
+        pool.close()
+
+    assert serial
+    assert [k.model_dump() for k in sharded] == [k.model_dump() for k in serial]
+
+
+def test_site_idf_store_matches_per_run_tfidf_and_counts_only_changed_pages(tmp_path) -> None:
+    documents = [
+        _doc("https://example.com/a", "cargo delivery across the country"),
+        _doc("https://example.com/b", "express cargo delivery and warehouse storage"),
+        _doc("https://example.com/c", "warehouse storage rates"),
+    ]
+    store = IdfStore(tmp_path, n_features=2 ** 18)
+    extractor = KeywordExtractor(max_keywords=100, idf_store=store)
+
+    per_run = {k.keyword: k.tf_idf_score for k in KeywordExtractor(max_keywords=100).extract(documents)}
+    with_store = {k.keyword: k.tf_idf_score for k in extractor.extract(documents, site="example.com")}
+
+    assert with_store == pytest.approx(per_run)
+    assert store.update("example.com", analyzer_scheme("en", extractor.ngram_range), []) == 0
+
+    changed = [_doc("https://example.com/c", "warehouse pricing"), documents[0]]
+    extractor.extract(changed, site="example.com")
+
+    n_documents, df = store.document_frequency("example.com", store.hash_terms(["warehouse", "storage", "pricing"]))
+    assert n_documents == 3
+    assert df.tolist() == [2, 1, 1]
+
+
+def test_idf_store_keeps_the_most_recently_used_sites_loaded(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(idf_store, "MAX_LOADED_SITES", 2)
+    store = IdfStore(tmp_path, n_features=16)
+    store.update("a.com", "scheme", [])
+    store.update("b.com", "scheme", [])
+    store.document_frequency("a.com", np.array([1]))
+    store.update("c.com", "scheme", [])
+
+    assert list(store._df) == ["a.com", "c.com"]
+
+
+def test_streaming_extraction_consumes_an_iterator_and_matches_in_memory_counts() -> None:
+    documents = [
+        _doc("https://example.com/a", "cargo delivery across the country. Cargo delivery is fast."),
+        _doc("https://example.com/empty", ""),
+        _doc("https://example.com/b", "Express cargo delivery and warehouse storage."),
+        _doc("https://example.com/c", "Warehouse storage rates. Expressway cargo-free goods."),
+    ]
+    extractor = KeywordExtractor(max_keywords=100)
+
+    in_memory = {k.keyword: k for k in extractor.extract(documents)}
+    streamed = {k.keyword: k for k in extractor.extract_stream(iter(documents))}
+
+    assert set(streamed) == set(in_memory)
+    for keyword, candidate in streamed.items():
+        assert candidate.frequency == in_memory[keyword].frequency
+        assert candidate.source_urls == in_memory[keyword].source_urls
+        assert candidate.intent == in_memory[keyword].intent
+
+
+def test_streaming_extraction_failing_after_end_of_stream_releases_the_crawl() -> None:
+    class _FailingExtractor(KeywordExtractor):
+        def _select(self, ranked, **kwargs):
+            raise RuntimeError("scoring failed")
+
+    agent = SimpleNamespace(keyword_extractor=_FailingExtractor())
+    pages = DocumentQueue(maxsize=1)
+
+    async def scenario():
+        extraction = asyncio.ensure_future(
+            asyncio.to_thread(SeoAgent._stream_keywords, agent, pages, SimpleNamespace(language="en"))
+        )
+        for i in range(3):
+            await pages.put(_doc(f"https://example.com/{i}", "cargo delivery and warehouse storage"))
+        await pages.close()
+        # The sentinel was already read, so the failure must not wait for more pages
+        with pytest.raises(RuntimeError, match="scoring failed"):
+            await asyncio.wait_for(extraction, 5)
+
+    asyncio.run(scenario())
+    assert pages.finished
+
+
+def test_sketches_stay_bounded_and_keep_heavy_hitters() -> None:
+    sketch = CountMinSketch(width=1024, depth=4)
+    heavy_hitters = SpaceSaving(capacity=10, max_sources=2)
+    for page in range(200):
+        terms = ["cargo", "delivery"] + [f"noise{page}-{i}" for i in range(2)]
+        sketch.add(terms)
+        for term in terms:
+            heavy_hitters.add(term, 1.0, f"https://example.com/{page}")
+
+    assert len(heavy_hitters) == 10
+    kept = {term: (weight, urls) for term, weight, _, urls in heavy_hitters.items()}
+    assert kept["cargo"][0] >= 200
+    assert kept["delivery"][1] == ["https://example.com/0", "https://example.com/1"]
+    estimates = sketch.estimate(["cargo", "noise5-1"])
+    assert estimates[0] >= 200 and estimates[1] >= 1
+    assert sketch.nbytes == 4 * 1024 * 4
+
+
+class _TopicEmbedder:
+    """Embeds text as the normalized sum of one axis per known topic word."""
+
+    model_name = "topics"
+    cache_namespace = "topics"
+    AXES = {"cargo": 0, "delivery": 0, "freight": 0, "cookie": 1, "policy": 1, "warehouse": 2}
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, texts, batch_size=64):
+        self.encoded.extend(texts)
+        vectors = np.full((len(texts), 3), 1e-3)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                if word in self.AXES:
+                    vectors[row, self.AXES[word]] += 1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_reranker_prefers_on_topic_candidates_and_reuses_cached_vectors() -> None:
+    documents = [
+        _doc(f"https://example.com/{i}", f"cargo delivery and freight cargo. Cookie policy. Page {i}")
+        for i in range(3)
+    ]
+    embedder = _TopicEmbedder()
+    reranker = KeywordReranker(embedder, diversity=1.0, cache=VectorCache())
+    extractor = KeywordExtractor(max_keywords=2)
+
+    keywords = extractor.extract(documents, reranker=reranker)
+    encoded_once = len(embedder.encoded)
+    extractor.extract(documents, reranker=reranker)
+
+    assert [k.keyword for k in keywords][0] in {"cargo", "cargo delivery", "delivery", "freight cargo"}
+    assert all("cookie" not in k.keyword and "policy" not in k.keyword for k in keywords)
+    assert encoded_once > 0 and len(embedder.encoded) == encoded_once
+
+
+def test_mmr_demotes_near_duplicates() -> None:
+    vectors = np.array([[1.0, 0.0], [1.0, 0.0], [0.6, 0.8]])
+    relevance = np.array([0.9, 0.89, 0.7])
+
+    assert mmr(relevance, vectors, 2, diversity=1.0) == [0, 1]
+    assert mmr(relevance, vectors, 2, diversity=0.5) == [0, 2]
+
+
+class _FakeMorph:
+    """Stands in for pymorphy3 with a tiny lemma table."""
+
+    LEMMAS = {"доставки": "доставка", "грузов": "груз", "грузы": "груз"}
+
+    def parse(self, word):
+        return [type("Parse", (), {"normal_form": self.LEMMAS.get(word, word)})()]
+
+
+def test_russian_analyzer_lemmatizes_and_drops_stopwords_inside_ngrams(monkeypatch) -> None:
+    lemmatizer = analyzers.Lemmatizer()
+    lemmatizer._morph = _FakeMorph()
+    monkeypatch.setattr(analyzers, "_lemmatizer", lemmatizer)
+
+    documents = [
+        _doc("https://example.ru/a", "Доставка грузов по России и доставки грузов в Минск"),
+        _doc("https://example.ru/b", "Доставка грузы для бизнеса"),
+    ]
+
+    keywords = {k.keyword: k for k in KeywordExtractor(max_keywords=30).extract(documents, language="ru")}
+
+    # Grouped by lemma, shown in the most frequent written form
+    assert keywords["доставка грузов"].frequency == 2
+    assert "доставка груз" not in keywords and "доставки" not in keywords
+    assert not any(word in keyword.split() for keyword in keywords for word in ("по", "и", "в", "для"))
+
+    streamed = {k.keyword for k in KeywordExtractor(max_keywords=30).extract_stream(documents, language="ru")}
+    assert "доставка грузов" in streamed and "доставка груз" not in streamed
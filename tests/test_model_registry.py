@@ -0,0 +1,88 @@
+"""Tests for the shared embedding model registry."""
+
+import asyncio
+import threading
+
+from seo_agent.tools.hf import model_registry
+from seo_agent.tools.hf.clustering import Embedder
+from seo_agent.tools.hf.model_registry import ModelRegistry
+
+
+class _Tensor:
+    def __init__(self, nbytes: int):
+        self.nbytes = nbytes
+
+    def numel(self) -> int:
+        return self.nbytes
+
+    def element_size(self) -> int:
+        return 1
+
+
+class _FakeModel:
+    def __init__(self, name: str, nbytes: int):
+        self.name = name
+        self._weights = [_Tensor(nbytes)]
+
+    def parameters(self):
+        return self._weights
+
+    def buffers(self):
+        return []
+
+
+def test_registry_loads_each_key_once_and_evicts_least_recently_used() -> None:
+    loads = []
+
+    def loader(model_name, device, precision):
+        loads.append((model_name, device, precision))
+        return _FakeModel(model_name, 600 * 1024)
+
+    registry = ModelRegistry(budget_mb=1, loader=loader)
+    mini = registry.get("mini", device="cpu", precision="float32")
+    assert registry.get("mini", device="cpu", precision="float32") is mini
+    registry.get("mini", device="cpu", precision="float16")
+
+    # Two 600 KB models exceed the 1 MB budget: the float32 one was used least recently
+    assert len(registry) == 1
+    registry.get("mini", device="cpu", precision="float32")
+    assert loads == [("mini", "cpu", "float32"), ("mini", "cpu", "float16"), ("mini", "cpu", "float32")]
+
+
+def test_concurrent_requests_share_one_load() -> None:
+    started = threading.Event()
+    release = threading.Event()
+    loads = []
+
+    def loader(model_name, device, precision):
+        loads.append(model_name)
+        started.set()
+        release.wait(5)
+        return _FakeModel(model_name, 10)
+
+    registry = ModelRegistry(loader=loader)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("mini"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert loads == ["mini"]
+    assert len(results) == 4 and all(model is results[0] for model in results)
+
+
+def test_async_embedder_loads_its_model_off_the_event_loop(monkeypatch) -> None:
+    loader_threads = []
+
+    def loader(model_name, device, precision):
+        loader_threads.append(threading.current_thread())
+        return _FakeModel(model_name, 10)
+
+    monkeypatch.setattr(model_registry, "_model_registry", ModelRegistry(loader=loader))
+    embedder = asyncio.run(Embedder.aload(model_name="mini"))
+
+    assert embedder.model.name == "mini"
+    assert loader_threads and loader_threads[0] is not threading.main_thread()
@@ -0,0 +1,41 @@
+"""Tests for single-pass HTML parsing."""
+
+from pathlib import Path
+
+from seo_agent.models import FetchResult
+from seo_agent.tools.hf.fetcher import Parser
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "html"
+
+
+def _parse(name: str, url: str):
+    content = (FIXTURES_DIR / name).read_text(encoding="utf-8")
+    return Parser().parse(FetchResult(url=url, status_code=200, content=content))
+
+
+def test_parser_extracts_structure_and_main_text_from_one_tree() -> None:
+    doc = _parse("cargo_ru.html", "https://example.ru/cargo/")
+
+    assert doc.error is None
+    assert doc.title == "Доставка грузов по России — транспортная компания"
+    assert doc.description.startswith("Доставка сборных грузов")
+    assert doc.headings == [
+        "Доставка грузов по России",
+        "Города доставки",
+        "Как рассчитать стоимость",
+        "Дополнительные услуги",
+    ]
+    assert doc.canonical == "https://example.ru/cargo/"
+    assert doc.hreflang == {"ru": "https://example.ru/cargo/", "en": "https://example.ru/en/cargo/"}
+    assert "https://example.ru/cities/kazan/" in doc.links
+    assert "онлайн-калькуляторе" in doc.main_text
+    assert doc.word_count > 50
+
+
+def test_parser_normalizes_whitespace_and_case_in_head() -> None:
+    doc = _parse("blog_en.html", "https://blog.example.com/keyword-clustering-guide")
+
+    assert doc.title == "Keyword Clustering Guide | SEO Blog"
+    assert doc.description == "A practical guide to keyword clustering and search intent."
+    assert doc.headings[0] == "Keyword Clustering Guide"
+    assert doc.hreflang == {"x-default": "https://blog.example.com/keyword-clustering-guide"}
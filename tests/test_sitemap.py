@@ -0,0 +1,104 @@
+"""Tests for sitemap and robots.txt ingestion."""
+
+import asyncio
+import gzip
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+from seo_agent.api.agent import SeoAgent
+from seo_agent.tools.hf.sitemap import SitemapReader
+
+ROBOTS = """User-agent: *
+Disallow: /private/
+Crawl-delay: 2
+Sitemap: https://example.com/sitemap_index.xml
+"""
+
+INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://example.com/pages.xml.gz</loc></sitemap>
+  <sitemap><loc>https://example.com/sitemap_index.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+PAGES = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <url><loc>https://example.com/</loc><lastmod>2026-05-01</lastmod></url>
+  <url><loc>https://example.com/old</loc><lastmod>2020-01-01T00:00:00Z</lastmod></url>
+  <url><loc>https://example.com/private/secret</loc></url>
+  <url><loc>https://example.com/no-lastmod</loc></url>
+</urlset>
+"""
+
+
+def _client() -> httpx.AsyncClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/robots.txt":
+            return httpx.Response(200, text=ROBOTS)
+        if path == "/sitemap_index.xml":
+            return httpx.Response(200, text=INDEX)
+        if path == "/pages.xml.gz":
+            return httpx.Response(200, content=gzip.compress(PAGES.encode()))
+        return httpx.Response(404)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _read(since: datetime | None = None):
+    reader = SitemapReader(client=_client())
+
+    async def run():
+        return [entry async for entry in reader.iter_urls("example.com", since=since)]
+
+    return reader, asyncio.run(run())
+
+
+def test_reader_follows_index_gzip_and_robots_rules() -> None:
+    reader, entries = _read()
+
+    assert [e.url for e in entries] == [
+        "https://example.com/",
+        "https://example.com/old",
+        "https://example.com/no-lastmod",
+    ]
+    assert entries[0].lastmod == datetime(2026, 5, 1)
+    assert entries[0].sitemap == "https://example.com/pages.xml.gz"
+    assert reader.crawl_delay == 2.0
+    assert reader.processed_sitemaps == [
+        "https://example.com/sitemap_index.xml",
+        "https://example.com/pages.xml.gz",
+    ]
+
+
+def test_reader_skips_entries_older_than_since() -> None:
+    _, entries = _read(since=datetime(2026, 1, 1))
+
+    assert [e.url for e in entries] == ["https://example.com/", "https://example.com/no-lastmod"]
+
+
+def test_sitemap_seeds_fall_back_to_the_input_scheme() -> None:
+    requested = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(str(request.url))
+        if str(request.url) == "http://example.com/sitemap.xml":
+            return httpx.Response(200, text=PAGES.replace("https://", "http://"))
+        return httpx.Response(404)
+
+    reader = SitemapReader(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    reader.robots = RobotFileParser()
+    reader.robots.parse([])
+    agent = SimpleNamespace(limiter=SimpleNamespace(set_crawl_delay=lambda host, delay: None))
+    sitemaps = []
+
+    async def run():
+        return [url async for url in SeoAgent._sitemap_seeds(agent, {"http://example.com/": reader}, sitemaps)]
+
+    urls = asyncio.run(run())
+    assert requested == ["http://example.com/sitemap.xml"]
+    assert urls[0] == "http://example.com/"
+    assert sitemaps == ["http://example.com/sitemap.xml"]
@@ -0,0 +1,94 @@
+"""Tests for pgvector columns and their binary COPY encoding."""
+
+import struct
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from db.models import EMBEDDING_DIM, IntentType, Keyword, Vector
+from db.vectors import KeywordMatch, KeywordSearch, _SiteMatrix, encode_copy_binary, exact_top_k, write_vectors
+
+
+def test_copy_binary_matches_pgcopy_layout() -> None:
+    vectors = np.array([[0.5, -1.0, 2.0], [1.5, 0.0, -0.25]], dtype=np.float32)
+    payload = encode_copy_binary([7, 42], vectors)
+
+    assert payload.startswith(b"PGCOPY\n\xff\r\n\x00")
+    assert payload.endswith(b"\xff\xff")
+    offset = 19
+    for row_id, vector in zip([7, 42], vectors):
+        n_fields, id_len, decoded_id, vector_len, dim, unused = struct.unpack_from(">hiiihh", payload, offset)
+        assert (n_fields, id_len, decoded_id, vector_len, dim, unused) == (2, 4, row_id, 16, 3, 0)
+        offset += 18
+        assert struct.unpack_from(">3f", payload, offset) == tuple(vector)
+        offset += 12
+    assert offset == len(payload) - 2
+
+
+def test_vector_type_round_trips_text_form() -> None:
+    vector = Vector(3)
+    dialect = postgresql.dialect()
+    bound = vector.bind_processor(dialect)([0.25, -1, 3.5])
+    assert bound == "[0.25,-1.0,3.5]"
+    assert vector.result_processor(dialect, None)(bound) == [0.25, -1.0, 3.5]
+    assert vector.result_processor(dialect, None)(None) is None
+
+
+def test_keyword_embedding_is_hnsw_indexed_vector() -> None:
+    dialect = postgresql.dialect()
+    assert f"embedding VECTOR({EMBEDDING_DIM})" in str(CreateTable(Keyword.__table__).compile(dialect=dialect))
+    index = next(index for index in Keyword.__table__.indexes if index.name == "ix_keywords_embedding_hnsw")
+    ddl = str(CreateIndex(index).compile(dialect=dialect))
+    assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+    assert "WITH (m = 16, ef_construction = 64)" in ddl
+
+
+def test_exact_top_k_matches_full_sort() -> None:
+    rng = np.random.default_rng(0)
+    matrix = rng.standard_normal((1000, 16)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    query = rng.standard_normal(16).astype(np.float32)
+
+    top, scores = exact_top_k(matrix, query, 10)
+    expected = np.argsort(-(matrix @ (query / np.linalg.norm(query))))[:10]
+    np.testing.assert_array_equal(top, expected)
+    assert np.all(np.diff(scores) <= 0)
+    assert len(exact_top_k(matrix[:3], query, 10)[0]) == 3
+
+
+def test_exact_search_applies_intent_and_run_filters(monkeypatch) -> None:
+    matrix = np.eye(4, EMBEDDING_DIM, dtype=np.float32)
+    intents = [IntentType.COMMERCIAL, IntentType.INFORMATIONAL, IntentType.COMMERCIAL, IntentType.COMMERCIAL]
+    runs = [1, 1, 1, 2]
+    site = _SiteMatrix(
+        signature=(),
+        matches=[KeywordMatch(i, f"kw{i}", intents[i], runs[i], None, 0.0) for i in range(4)],
+        run_ids=np.array(runs),
+        intents=np.array([intent.name for intent in intents], dtype=object),
+        matrix=matrix,
+    )
+    search = KeywordSearch()
+    monkeypatch.setattr(search, "_site_matrix", lambda session, website_id, model_name: site)
+
+    query = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    query[:4] = [0.1, 0.9, 0.5, 0.7]
+    matches = search._search_exact(None, 1, "mini", query, 10, IntentType.COMMERCIAL, 1)
+    assert [match.keyword for match in matches] == ["kw2", "kw0"]
+    assert matches[0].similarity > matches[1].similarity
+    assert [m.keyword for m in search._search_exact(None, 1, "mini", query, 2, None, None)] == ["kw1", "kw3"]
+
+
+def test_write_vectors_rejects_other_dimensions() -> None:
+    with pytest.raises(ValueError, match="dimension 768"):
+        write_vectors(None, "keywords", [1], np.zeros((1, 768), dtype=np.float32))
+
+
+def test_search_queries_are_limited_to_the_query_model() -> None:
+    from sqlalchemy.orm import Session
+
+    query = KeywordSearch._filtered(Session().query(Keyword.id), 3, "all-MiniLM-L6-v2", IntentType.COMMERCIAL)
+    sql = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "analysis_runs.embedding_model = 'all-MiniLM-L6-v2'" in sql
+    assert "analysis_runs.website_id = 3" in sql